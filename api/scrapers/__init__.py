@@ -4,8 +4,8 @@ from .health import check_health
 from .match_detail import vlr_match_detail
 from .matches import vlr_live_score, vlr_match_results, vlr_upcoming_matches, vlr_upcoming_matches_extended
 from .news import vlr_news
-from .players import vlr_player, vlr_player_matches
-from .rankings import vlr_rankings
+from .players import vlr_player, vlr_player_match_history, vlr_player_matches
+from .rankings import vlr_rankings, vlr_rankings_all
 from .search import vlr_search
-from .stats import vlr_stats
+from .stats import vlr_stats, vlr_stats_aggregate, vlr_stats_matrix
 from .teams import vlr_team, vlr_team_matches, vlr_team_transactions
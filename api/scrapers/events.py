@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from utils.cache_manager import cache_manager
@@ -14,6 +15,7 @@ from utils.html_parsers import (
     parse_html,
 )
 from utils.http_client import fetch_with_retries, get_http_client
+from utils.match_store import match_store, normalize_day, state_from_status
 
 logger = logging.getLogger(__name__)
 
@@ -220,6 +222,20 @@ async def vlr_event_matches(event_id: str):
                 "team2": teams[1],
             })
 
+        await asyncio.to_thread(match_store.upsert, [
+            {
+                "match_id": match["match_id"],
+                "event_id": event_id,
+                "match_time": normalize_day(match["date"]),
+                "state": state_from_status(match["status"]),
+                "series": match["event_series"],
+                "team1": match["team1"]["name"],
+                "team2": match["team2"]["name"],
+                "score1": match["team1"]["score"],
+                "score2": match["team2"]["score"],
+            }
+            for match in matches
+        ])
         return {"data": {"status": status, "segments": matches}}
 
     return await cache_manager.get_or_create_async(
@@ -1,30 +1,41 @@
 """
 Scraper for individual VLR.GG match detail pages.
-Fetches the base match page plus performance and economy tabs concurrently.
+Fetches the base match page plus performance and economy tabs concurrently,
+caching each response component separately so callers can request a subset.
 """
 import asyncio
 import logging
 import re
+from collections.abc import Iterable
+from typing import NamedTuple
 
 from utils.cache_manager import cache_manager
 from utils.constants import (
     CACHE_TTL_MATCH_DETAIL,
+    CACHE_TTL_MATCH_DETAIL_FINISHED_MAP,
     CACHE_TTL_MATCH_DETAIL_LIVE,
+    MATCH_DETAIL_COMPONENTS,
     MATCH_DETAIL_TAB_FETCH_CONCURRENCY,
     MATCH_DETAIL_TAB_FETCH_TIMEOUT,
     VLR_BASE_URL,
 )
-from utils.error_handling import handle_scraper_errors, upstream_error_payload
+from utils.error_handling import handle_scraper_errors, raise_for_upstream_status, upstream_error_payload
 from utils.html_parsers import (
     HTMLParser,
     build_full_url,
     extract_text_content,
     normalize_image_url,
+    normalize_utc_timestamp,
+    parse_eta_to_timedelta,
     parse_href_id_slug,
     parse_html,
 )
 from utils.http_client import fetch_with_retries, get_http_client
 from utils.id_mapper import id_mapper
+from utils.live_state import cadence_ttls, live_progress, live_state
+from utils.match_archive import is_completed_status, match_archive
+from utils.match_store import COMPLETED, LIVE, UPCOMING, match_store
+from utils.numeric import numeric_row, numeric_rows
 
 logger = logging.getLogger(__name__)
 
@@ -196,9 +207,34 @@ def _parse_streams_vods(html: HTMLParser) -> tuple[list[dict], list[dict]]:
 # Per-map game data parsers
 # ---------------------------------------------------------------------------
 
-def _parse_player_row(cells: list) -> dict:
+class PlayerStats(NamedTuple):
+    """One player's row in a map's overview table.
+
+    Maps hold hundreds of these per match, so they are cached as tuples
+    rather than dicts and only expanded when a response is assembled.
+    """
+    name: str
+    agent: str
+    rating: str
+    acs: str
+    kills: str
+    deaths: str
+    assists: str
+    kd_diff: str
+    kast: str
+    adr: str
+    hs_pct: str
+    fk: str
+    fd: str
+    fk_diff: str
+
+
+PLAYER_STAT_FIELDS = PlayerStats._fields
+
+
+def _parse_player_row(cells: list) -> PlayerStats:
     """
-    Parse a single player table row into a stat dict.
+    Parse a single player table row into a PlayerStats record.
 
     Actual VLR column layout (14 cells):
       [0]  mod-player   — player name
@@ -248,22 +284,7 @@ def _parse_player_row(cells: list) -> dict:
         if img:
             agent = img.attributes.get("title", "") or img.attributes.get("alt", "")
 
-    return {
-        "name": player_name,
-        "agent": agent,
-        "rating": safe_val(2),
-        "acs": safe_val(3),
-        "kills": safe_val(4),
-        "deaths": safe_val(5),
-        "assists": safe_val(6),
-        "kd_diff": safe_val(7),
-        "kast": safe_val(8),
-        "adr": safe_val(9),
-        "hs_pct": safe_val(10),
-        "fk": safe_val(11),
-        "fd": safe_val(12),
-        "fk_diff": safe_val(13),
-    }
+    return PlayerStats(player_name, agent, *(safe_val(idx) for idx in range(2, 14)))
 
 
 def _parse_map_players(game_elem) -> dict:
@@ -274,12 +295,12 @@ def _parse_map_players(game_elem) -> dict:
     .vm-stats-container — one per team. We treat each table
     as one team's roster.
     """
-    team1_players: list[dict] = []
-    team2_players: list[dict] = []
+    team1_players: list[PlayerStats] = []
+    team2_players: list[PlayerStats] = []
 
     tables = game_elem.css("table.wf-table-inset.mod-overview")
 
-    def parse_table_rows(table) -> list[dict]:
+    def parse_table_rows(table) -> list[PlayerStats]:
         players = []
         for row in table.css("tbody tr"):
             cells = row.css("td")
@@ -404,15 +425,23 @@ def _parse_rounds(game_elem) -> list[dict]:
     return rounds
 
 
-def _parse_maps(html: HTMLParser) -> list[dict]:
+def _iter_game_elems(html: HTMLParser):
+    """Yield per-map game blocks, skipping the aggregate 'all' block."""
+    for game_elem in html.css("div.vm-stats-game"):
+        if game_elem.attributes.get("data-game-id", "") != "all":
+            yield game_elem
+
+
+def _parse_rounds_by_map(html: HTMLParser) -> list[list[dict]]:
+    """Parse round-by-round data for every map, in map order."""
+    return [_parse_rounds(game_elem) for game_elem in _iter_game_elems(html)]
+
+
+def _parse_maps(html: HTMLParser, include_rounds: bool = True) -> list[dict]:
     """Parse all per-map game blocks from the base match page."""
     maps: list[dict] = []
 
-    for game_elem in html.css("div.vm-stats-game"):
-        game_id = game_elem.attributes.get("data-game-id", "")
-        if game_id == "all":
-            continue
-
+    for game_elem in _iter_game_elems(html):
         # Map name — the .map container has child spans for pick info and
         # duration that we need to exclude. Extract just the first text node.
         map_name = ""
@@ -442,9 +471,8 @@ def _parse_maps(html: HTMLParser) -> list[dict]:
 
         scores = _parse_map_scores(game_elem)
         players = _parse_map_players(game_elem)
-        rounds = _parse_rounds(game_elem)
 
-        maps.append({
+        map_data = {
             "map_name": map_name,
             "picked_by": picked_by,
             "duration": duration,
@@ -453,8 +481,10 @@ def _parse_maps(html: HTMLParser) -> list[dict]:
             "score_t": scores["score_t"],
             "score_ot": scores["score_ot"],
             "players": players,
-            "rounds": rounds,
-        })
+        }
+        if include_rounds:
+            map_data["rounds"] = _parse_rounds(game_elem)
+        maps.append(map_data)
 
     return maps
 
@@ -655,21 +685,564 @@ def _parse_economy(html: HTMLParser) -> list[dict]:
     return economy
 
 
+# ---------------------------------------------------------------------------
+# Components
+# ---------------------------------------------------------------------------
+
+# Components parsed from the base match page; "header" is always fetched.
+# Performance and economy are cached per (match_id, game_id, tab) instead.
+_BASE_COMPONENTS = frozenset({"header", "maps", "rounds", "h2h"})
+_TAB_COMPONENTS = ("performance", "economy")
+
+
+def _map_is_complete(score: dict) -> bool:
+    """True once one side has 13+ rounds with a two-round lead (regulation or OT)."""
+    team1, team2 = score.get("team1"), score.get("team2")
+    if not isinstance(team1, int) or not isinstance(team2, int):
+        return False
+    return max(team1, team2) >= 13 and abs(team1 - team2) >= 2
+
+
+def _completed_game_ids(html: HTMLParser, match_completed: bool) -> list[str]:
+    """Game ids whose maps are finished; every played map once the match is final.
+
+    Only a final status marks every map finished: upcoming, postponed, or
+    TBD matches (and live ones the page does not flag as live) need a
+    decided map score.
+    """
+    completed = []
+    for game_elem in _iter_game_elems(html):
+        game_id = game_elem.attributes.get("data-game-id", "")
+        if not game_id:
+            continue
+        if match_completed or _map_is_complete(_parse_map_scores(game_elem)["score"]):
+            completed.append(game_id)
+    return completed
+
+
+def _map_in_progress(html: HTMLParser, live: bool) -> bool:
+    """True while a map is being played, False between maps of a live series."""
+    if not live:
+        return False
+    if html.css_first(".vm-stats-gamesnav-item.mod-live") is not None:
+        return True
+    for game_elem in _iter_game_elems(html):
+        score = _parse_map_scores(game_elem)["score"]
+        started = any(isinstance(value, int) and value > 0 for value in score.values())
+        if started and not _map_is_complete(score):
+            return True
+    return False
+
+
+def _current_map_score(html: HTMLParser) -> dict:
+    """Round score of the map being played (0-0 when no map is in progress)."""
+    for game_elem in _iter_game_elems(html):
+        score = _parse_map_scores(game_elem)["score"]
+        started = any(isinstance(value, int) and value > 0 for value in score.values())
+        if started and not _map_is_complete(score):
+            return score
+    return {"team1": 0, "team2": 0}
+
+
+def _match_time(html: HTMLParser) -> str:
+    """UTC start time from the header's moment-tz-convert element ('' if absent)."""
+    elem = html.css_first(".match-header-date .moment-tz-convert")
+    return normalize_utc_timestamp(elem.attributes.get("data-utc-ts") or "") if elem else ""
+
+
+def _eta_text(html: HTMLParser) -> str:
+    """The countdown shown in the header of upcoming matches (e.g. "1h 5m")."""
+    for note in html.css(".match-header-vs-note"):
+        text = extract_text_content(note)
+        if parse_eta_to_timedelta(text) is not None:
+            return text
+    return ""
+
+
+def _observe_header(match_id: str, html: HTMLParser, header: dict) -> None:
+    """Classify the match and record the cache TTL its components should use."""
+    progress = live_progress(
+        [team.get("score", "") for team in header["teams"]], _current_map_score(html).values()
+    )
+    cadence = live_state.observe(
+        match_id,
+        live=header["live"],
+        completed=not header["live"] and is_completed_status(header["status"]),
+        map_in_progress=header["map_live"],
+        eta=_eta_text(html),
+        progress=progress,
+    )
+    header["cache_ttl"] = cadence.ttl
+
+
+def _parse_header(html: HTMLParser, match_id: str = "") -> dict:
+    """Parse the always-present header component (plus internal game/live state).
+
+    With ``match_id`` the match is also reported to the live-state tracker
+    and ``cache_ttl`` is set from the resulting cadence.
+    """
+    header_info = _parse_match_header(html)
+    streams, vods = _parse_streams_vods(html)
+    live = _is_live(html)
+    header = {
+        "event": _parse_event_info(html),
+        "date": header_info["date"],
+        "map_vetos": header_info["map_vetos"],
+        "status": header_info["status"],
+        "teams": _parse_teams(html),
+        "streams": streams,
+        "vods": vods,
+        "game_ids": _extract_game_ids(html),
+        "completed_game_ids": _completed_game_ids(
+            html, not live and is_completed_status(header_info["status"])
+        ),
+        "live": live,
+        "match_time": _match_time(html),
+        "map_live": _map_in_progress(html, live),
+        "cache_ttl": CACHE_TTL_MATCH_DETAIL_LIVE if live else CACHE_TTL_MATCH_DETAIL,
+    }
+    if match_id:
+        _observe_header(match_id, html, header)
+    return header
+
+
+# Every bucket a component may live in: one per live cadence plus the
+# static defaults, shortest first so the freshest copy wins.
+_COMPONENT_TTLS = tuple(sorted(cadence_ttls() | {CACHE_TTL_MATCH_DETAIL_LIVE, CACHE_TTL_MATCH_DETAIL}))
+_TAB_TTLS = tuple(sorted(set(_COMPONENT_TTLS) | {CACHE_TTL_MATCH_DETAIL_FINISHED_MAP}))
+
+
+def _get_cadence_cached(*key):
+    """Look ``key`` up across every cadence TTL bucket."""
+    return cache_manager.get_any(_COMPONENT_TTLS, *key)
+
+
+def _set_cadence_cached(ttl: int, value, *key) -> None:
+    """Cache ``value`` under ``ttl``, dropping stale copies left under another cadence."""
+    for other in _COMPONENT_TTLS:
+        if other != ttl:
+            cache_manager.invalidate(other, *key)
+    cache_manager.set(ttl, value, *key)
+
+
+def _get_cached_component(match_id: str, component: str):
+    return _get_cadence_cached("match_detail", match_id, component)
+
+
+def _store_components(match_id: str, components: dict, ttl: int) -> None:
+    for component, value in components.items():
+        _set_cadence_cached(ttl, value, "match_detail", match_id, component)
+
+
+def _index_match(match_id: str, components: dict) -> None:
+    """Write freshly parsed header (and player) data to the local match store."""
+    header = components["header"]
+    teams = header["teams"]
+    names = [team.get("name", "") for team in teams] + ["", ""]
+    scores = [team.get("score", "") for team in teams] + ["", ""]
+    if header["live"]:
+        state = LIVE
+    elif is_completed_status(header["status"]):
+        state = COMPLETED
+    else:
+        state = UPCOMING
+    match_store.upsert([{
+        "match_id": match_id,
+        "match_time": header["match_time"],
+        "state": state,
+        "event": header["event"]["name"],
+        "series": header["event"]["series"],
+        "team1": names[0],
+        "team2": names[1],
+        "score1": scores[0],
+        "score2": scores[1],
+    }])
+    if "maps" in components:
+        match_store.set_players(match_id, [
+            (player.name, names[index])
+            for map_data in components["maps"]
+            for index, side in enumerate(("team1", "team2"))
+            for player in map_data.get("players", {}).get(side, [])
+        ])
+
+
+def _get_cached_tab(match_id: str, game_id: str, tab: str):
+    """Look up one parsed game tab across the finished-map and cadence buckets."""
+    return cache_manager.get_any(_TAB_TTLS, "match_detail_tab", match_id, game_id, tab)
+
+
+def _tab_ttl(header: dict, game_id: str) -> int:
+    """Finished maps never change; the map in progress follows the match cadence."""
+    if game_id in header["completed_game_ids"]:
+        return CACHE_TTL_MATCH_DETAIL_FINISHED_MAP
+    return header["cache_ttl"]
+
+
+def _parse_tab(tab: str, html: HTMLParser):
+    if tab == "performance":
+        return {
+            "kill_matrix": _parse_kill_matrix(html),
+            "advanced_stats": _parse_advanced_stats(html),
+        }
+    return _parse_economy(html)
+
+
+def _is_archivable(components: dict, include: frozenset[str]) -> bool:
+    """Final matches assembled with every component and every tab fetched."""
+    header = components["header"]
+    if include != frozenset(MATCH_DETAIL_COMPONENTS) or header["live"]:
+        return False
+    if not header["game_ids"] or not is_completed_status(header["status"]):
+        return False
+    return all(
+        game_id in components[tab] for tab in _TAB_COMPONENTS for game_id in header["game_ids"]
+    )
+
+
+# Segment keys owned by each optional component, at the top level and per map.
+_SEGMENT_KEYS = {
+    "maps": ("maps",),
+    "h2h": ("head_to_head",),
+    "performance": ("performance",),
+    "economy": ("economy", "economy_by_map"),
+}
+_MAP_KEYS = {"rounds": "rounds", "performance": "performance", "economy": "economy"}
+
+
+def _select_components(segment: dict, include: frozenset[str]) -> dict:
+    """Trim a full (archived) segment down to the requested components."""
+    dropped = {key for component, keys in _SEGMENT_KEYS.items() if component not in include for key in keys}
+    selected = {key: value for key, value in segment.items() if key not in dropped}
+    dropped_map_keys = {key for component, key in _MAP_KEYS.items() if component not in include}
+    if "maps" in selected and dropped_map_keys:
+        selected["maps"] = [
+            {key: value for key, value in map_data.items() if key not in dropped_map_keys}
+            for map_data in selected["maps"]
+        ]
+    return selected
+
+
+def _empty_performance() -> dict:
+    return {"kill_matrix": [], "advanced_stats": []}
+
+
+def _assemble_segment(match_id: str, components: dict, include: frozenset[str]) -> dict:
+    """Build the response segment from cached components without mutating them."""
+    header = components["header"]
+    game_ids = header["game_ids"]
+    segment = {
+        "match_id": match_id,
+        "event": header["event"],
+        "date": header["date"],
+        "map_vetos": header["map_vetos"],
+        "status": header["status"],
+        "teams": header["teams"],
+        "streams": header["streams"],
+        "vods": header["vods"],
+    }
+    performance_by_game = components.get("performance", {})
+    economy_by_game = components.get("economy", {})
+
+    if "maps" in include:
+        rounds_by_map = components.get("rounds", [])
+        maps = []
+        for index, map_data in enumerate(components["maps"]):
+            game_id = game_ids[index] if index < len(game_ids) else ""
+            entry = dict(map_data)
+            entry["players"] = {
+                side: [player._asdict() for player in players] for side, players in map_data["players"].items()
+            }
+            if "rounds" in include:
+                entry["rounds"] = rounds_by_map[index] if index < len(rounds_by_map) else []
+            if "performance" in include:
+                entry["performance"] = performance_by_game.get(game_id, _empty_performance())
+            if "economy" in include:
+                entry["economy"] = economy_by_game.get(game_id, [])
+            maps.append(entry)
+        segment["maps"] = maps
+
+    if "h2h" in include:
+        segment["head_to_head"] = components["h2h"]
+
+    first_game_id = game_ids[0] if game_ids else ""
+    if "performance" in include:
+        first = performance_by_game.get(first_game_id, _empty_performance())
+        segment["performance"] = {
+            "kill_matrix": first["kill_matrix"],
+            "advanced_stats": first["advanced_stats"],
+            "by_map": [
+                {"game_id": game_id, **performance_by_game.get(game_id, _empty_performance())}
+                for game_id in game_ids
+            ],
+        }
+
+    if "economy" in include:
+        segment["economy"] = economy_by_game.get(first_game_id, [])
+        segment["economy_by_map"] = [
+            {"game_id": game_id, "rows": economy_by_game.get(game_id, [])}
+            for game_id in game_ids
+        ]
+
+    return segment
+
+
+def _resolve_include(include: Iterable[str] | None) -> frozenset[str]:
+    requested = frozenset(MATCH_DETAIL_COMPONENTS if include is None else include)
+    if "rounds" in requested:
+        requested |= {"maps"}
+    return requested
+
+
+def _collect_tabs(match_id: str, components: dict, tabs: list[str]) -> list[tuple[str, str]]:
+    """Fill per-game tab results from cache; return the (game_id, tab) pairs missing."""
+    missing_tabs = []
+    for tab in tabs:
+        components[tab] = {}
+    for game_id in components["header"]["game_ids"]:
+        for tab in tabs:
+            cached = _get_cached_tab(match_id, game_id, tab)
+            if cached is None:
+                missing_tabs.append((game_id, tab))
+            else:
+                components[tab][game_id] = cached
+    return missing_tabs
+
+
+def _lookup_components(
+    match_id: str, requested: frozenset[str]
+) -> tuple[dict, set[str], list[tuple[str, str]]]:
+    """Return cached components plus the base components and tabs still missing."""
+    needed_base = (requested & _BASE_COMPONENTS) | {"header"}
+    components = {}
+    for component in needed_base:
+        cached = _get_cached_component(match_id, component)
+        if cached is not None:
+            components[component] = cached
+    missing_base = needed_base - components.keys()
+    missing_tabs = []
+    if "header" in components:
+        tabs = [tab for tab in _TAB_COMPONENTS if tab in requested]
+        missing_tabs = _collect_tabs(match_id, components, tabs)
+    return components, missing_base, missing_tabs
+
+
+def to_columnar(payload: dict) -> dict:
+    """Rewrite each map's ``players`` as per-team column lists.
+
+    ``{"team1": [{"name": .., "acs": ..}, ..]}`` becomes
+    ``{"team1": {"name": [..], "acs": [..]}}`` with one list per field of
+    PLAYER_STAT_FIELDS, in row order. Other fields are left untouched.
+    """
+    segments = []
+    for segment in payload["data"].get("segments", []):
+        if "maps" in segment:
+            segment = {
+                **segment,
+                "maps": [
+                    {
+                        **map_data,
+                        "players": {
+                            side: {field: [row.get(field, "") for row in rows] for field in PLAYER_STAT_FIELDS}
+                            for side, rows in map_data.get("players", {}).items()
+                        },
+                    }
+                    for map_data in segment["maps"]
+                ],
+            }
+        segments.append(segment)
+    return {**payload, "data": {**payload["data"], "segments": segments}}
+
+
+_NUMERIC_PLAYER_FIELDS = PLAYER_STAT_FIELDS[2:]
+
+
+def _numeric_performance(performance: dict) -> dict:
+    advanced = [
+        numeric_row(row, [label for label in row if label != "player"]) for row in performance["advanced_stats"]
+    ]
+    return {**performance, "advanced_stats": advanced}
+
+
+def to_numeric(payload: dict) -> dict:
+    """Typed copy of a match detail payload.
+
+    Map player stats (everything but name and agent) and advanced stats
+    become ints/floats, with None for missing values. Kill matrices and
+    economy tables are left as scraped.
+    """
+    segments = []
+    for segment in payload["data"].get("segments", []):
+        segment = dict(segment)
+        if "maps" in segment:
+            maps = []
+            for map_data in segment["maps"]:
+                entry = {
+                    **map_data,
+                    "players": {
+                        side: numeric_rows(rows, _NUMERIC_PLAYER_FIELDS)
+                        for side, rows in map_data.get("players", {}).items()
+                    },
+                }
+                if "performance" in entry:
+                    entry["performance"] = _numeric_performance(entry["performance"])
+                maps.append(entry)
+            segment["maps"] = maps
+        if "performance" in segment:
+            performance = _numeric_performance(segment["performance"])
+            performance["by_map"] = [_numeric_performance(game) for game in performance["by_map"]]
+            segment["performance"] = performance
+        segments.append(segment)
+    return {**payload, "data": {**payload["data"], "segments": segments}}
+
+
+def _numeric_ttl(match_id: str) -> int:
+    cadence = live_state.cadence(match_id)
+    return cadence.ttl if cadence is not None else CACHE_TTL_MATCH_DETAIL
+
+
+def _respond(match_id: str, components: dict, requested: frozenset[str]) -> dict:
+    segment = _assemble_segment(match_id, components, requested)
+    return {"data": {"status": 200, "segments": [segment]}}
+
+
+async def peek_match_detail(match_id: str, include: Iterable[str] | None = None) -> tuple[dict, str] | None:
+    """Return ``(payload, source)`` if the match can be served without VLR.GG.
+
+    ``source`` is ``"cache"`` when every requested component is cached and
+    ``"archive"`` when the match is in the permanent archive; otherwise None.
+    """
+    requested = _resolve_include(include)
+    components, missing_base, missing_tabs = _lookup_components(match_id, requested)
+    if not missing_base and not missing_tabs:
+        return _respond(match_id, components, requested), "cache"
+
+    archived = await asyncio.to_thread(match_archive.get, match_id)
+    if archived is not None:
+        return {"data": {"status": 200, "segments": [_select_components(archived, requested)]}}, "archive"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Live snapshots
+# ---------------------------------------------------------------------------
+
+def _build_live_snapshot(header: dict, maps: list[dict], rounds_by_map: list[list[dict]]) -> dict:
+    """Compact view of the fields that move during a live match."""
+    game_ids = header["game_ids"]
+    current = None
+    if header["live"]:
+        current = next((game_id for game_id in game_ids if game_id not in header["completed_game_ids"]), None)
+    return {
+        "status": header["status"],
+        "live": header["live"],
+        "score": [team.get("score", "") for team in header["teams"]],
+        "current_game_id": current,
+        "maps": [
+            {
+                "game_id": game_ids[index] if index < len(game_ids) else "",
+                "map_name": map_data["map_name"],
+                "score": map_data["score"],
+                "rounds": rounds_by_map[index] if index < len(rounds_by_map) else [],
+            }
+            for index, map_data in enumerate(maps)
+        ],
+    }
+
+
+def diff_live_snapshots(previous: dict | None, current: dict) -> dict | None:
+    """Changes between two live snapshots, or None if nothing moved.
+
+    Keys are only present when they changed: ``status``, ``score`` (series),
+    ``map`` (the map now being played), ``maps`` (per-map score changes), and
+    ``rounds`` (rounds not in the previous snapshot, tagged with their map).
+    """
+    if previous is None:
+        return None
+    changes: dict = {}
+    if current["status"] != previous["status"] or current["live"] != previous["live"]:
+        changes["status"] = {"status": current["status"], "live": current["live"]}
+    if current["score"] != previous["score"]:
+        changes["score"] = current["score"]
+    if current["current_game_id"] != previous["current_game_id"]:
+        changes["map"] = next(
+            (
+                {"game_id": entry["game_id"], "map_name": entry["map_name"]}
+                for entry in current["maps"]
+                if entry["game_id"] == current["current_game_id"]
+            ),
+            {"game_id": current["current_game_id"], "map_name": ""},
+        )
+
+    before = {entry["game_id"]: entry for entry in previous["maps"]}
+    map_changes = []
+    new_rounds = []
+    for entry in current["maps"]:
+        old = before.get(entry["game_id"])
+        if old is None or old["score"] != entry["score"]:
+            map_changes.append({"game_id": entry["game_id"], "map_name": entry["map_name"], "score": entry["score"]})
+        known = len(old["rounds"]) if old is not None else 0
+        if len(entry["rounds"]) < known:
+            known = 0  # rounds were reset (e.g. a remake); resend the map's rounds
+        for round_data in entry["rounds"][known:]:
+            new_rounds.append({"game_id": entry["game_id"], **round_data})
+    if map_changes:
+        changes["maps"] = map_changes
+    if new_rounds:
+        changes["rounds"] = new_rounds
+    return changes or None
+
+
+@handle_scraper_errors
+async def fetch_live_snapshot(match_id: str) -> dict:
+    """Fetch the base match page once and return its live snapshot.
+
+    The parsed header, maps, and rounds are also written to the component
+    cache so concurrent /v2/match/details requests reuse this fetch.
+    """
+    resp = await fetch_with_retries(f"{VLR_BASE_URL}/{match_id}", client=get_http_client())
+    raise_for_upstream_status(resp.status_code, f"match detail {match_id}")
+    html = parse_html(resp.text)
+    components = {
+        "header": _parse_header(html, match_id),
+        "maps": _parse_maps(html, include_rounds=False),
+        "rounds": _parse_rounds_by_map(html),
+    }
+    _store_components(match_id, components, components["header"]["cache_ttl"])
+    await asyncio.to_thread(_index_match, match_id, components)
+    return _build_live_snapshot(components["header"], components["maps"], components["rounds"])
+
+
 # ---------------------------------------------------------------------------
 # Main scraper
 # ---------------------------------------------------------------------------
 
 @handle_scraper_errors
-async def vlr_match_detail(match_id: str) -> dict:
+async def vlr_match_detail(
+    match_id: str, include: Iterable[str] | None = None, numeric: bool = False
+) -> dict:
     """
     Scrape a single VLR.GG match page and return structured match data.
 
-    Fetches the base page, then concurrently fetches the performance and
-    economy tabs for the first game. Cache TTL is 30 s for live matches
-    and 300 s for completed matches.
+    The response is assembled from independently cached components: the
+    header (event, teams, streams, status) is always present, and
+    ``include`` selects any of ``maps``, ``rounds``, ``performance``,
+    ``economy``, and ``h2h`` (all of them when omitted). Only components
+    missing from the cache are fetched and parsed: the base page for
+    header/maps/rounds/h2h, and one performance or economy tab per game.
+    ``rounds`` implies ``maps``. Base-page components are cached for the
+    TTL of the match's live cadence (see ``utils.live_state``): seconds while
+    rounds are being played, longer between maps or before the start, and a
+    day once final. Tabs are cached per game: finished maps for a day, so a
+    live poll only refetches the base page and the live map.
+    Final matches assembled in full are written to the match archive and
+    served from it from then on. ``numeric`` payloads (see ``to_numeric``)
+    are converted once per cadence bucket, with concurrent callers sharing one
+    conversion.
 
     Args:
         match_id: Numeric VLR.GG match ID (e.g. "123456").
+        include: Optional subset of MATCH_DETAIL_COMPONENTS.
+        numeric: Return player and advanced stats as numbers.
 
     Returns:
         Standard response dict with shape::
@@ -681,46 +1254,62 @@ async def vlr_match_detail(match_id: str) -> dict:
                 }
             }
     """
-    base_url = f"{VLR_BASE_URL}/{match_id}"
+    requested = _resolve_include(include)
+    if not numeric:
+        return await _match_detail(match_id, requested)
 
-    # Determine cache TTL after we know if the match is live.
-    # We first check the live-TTL cache, then the completed-TTL cache.
-    cached = cache_manager.get(CACHE_TTL_MATCH_DETAIL_LIVE, "match_detail", match_id)
-    if cached is not None:
-        return cached
-    cached = cache_manager.get(CACHE_TTL_MATCH_DETAIL, "match_detail", match_id)
+    numeric_key = ("match_detail_numeric", match_id, ",".join(sorted(requested)))
+    cached = _get_cadence_cached(*numeric_key)
     if cached is not None:
         return cached
 
     async def build():
-        cached_live = cache_manager.get(
-            CACHE_TTL_MATCH_DETAIL_LIVE, "match_detail", match_id
-        )
-        if cached_live is not None:
-            return cached_live
+        typed = to_numeric(await _match_detail(match_id, requested))
+        if cache_manager.is_cacheable(typed):
+            # One TTL, read after the fetch has updated the match's cadence.
+            _set_cadence_cached(_numeric_ttl(match_id), typed, *numeric_key)
+        return typed
 
-        cached_complete = cache_manager.get(
-            CACHE_TTL_MATCH_DETAIL, "match_detail", match_id
-        )
-        if cached_complete is not None:
-            return cached_complete
+    return await cache_manager.coalesce_async(":".join(numeric_key), build, label="match_detail_numeric")
 
-        client = get_http_client()
 
-        base_resp = await fetch_with_retries(base_url, client=client)
-        http_status = base_resp.status_code
-        if http_status >= 400:
-            return upstream_error_payload(http_status, f"match detail {match_id}")
+async def _match_detail(match_id: str, requested: frozenset[str]) -> dict:
+    base_url = f"{VLR_BASE_URL}/{match_id}"
+    tabs = [tab for tab in _TAB_COMPONENTS if tab in requested]
 
-        base_html = parse_html(base_resp.text)
+    ready = await peek_match_detail(match_id, requested)
+    if ready is not None:
+        return ready[0]
 
-        game_ids = _extract_game_ids(base_html)
-        first_game_id = game_ids[0] if game_ids else None
+    async def build():
+        components, missing_base, missing_tabs = _lookup_components(match_id, requested)
+        if not missing_base and not missing_tabs:
+            return _respond(match_id, components, requested)
 
-        performance_by_game: dict[str, dict] = {}
-        economy_by_game: dict[str, list[dict]] = {}
+        client = get_http_client()
 
-        if game_ids:
+        if missing_base:
+            base_resp = await fetch_with_retries(base_url, client=client)
+            http_status = base_resp.status_code
+            if http_status >= 400:
+                return upstream_error_payload(http_status, f"match detail {match_id}")
+
+            base_html = parse_html(base_resp.text)
+            fresh = {"header": _parse_header(base_html, match_id)}
+            if "maps" in missing_base:
+                fresh["maps"] = _parse_maps(base_html, include_rounds=False)
+            if "rounds" in missing_base:
+                fresh["rounds"] = _parse_rounds_by_map(base_html)
+            if "h2h" in missing_base:
+                fresh["h2h"] = _parse_head_to_head(base_html)
+
+            _store_components(match_id, fresh, fresh["header"]["cache_ttl"])
+            await asyncio.to_thread(_index_match, match_id, fresh)
+            components.update(fresh)
+            missing_tabs = _collect_tabs(match_id, components, tabs)
+
+        if missing_tabs:
+            header = components["header"]
             tab_fetch_semaphore = asyncio.Semaphore(MATCH_DETAIL_TAB_FETCH_CONCURRENCY)
 
             async def fetch_tab(game_id: str, tab: str):
@@ -734,75 +1323,24 @@ async def vlr_match_detail(match_id: str) -> dict:
                     )
 
             tab_results = await asyncio.gather(
-                *[
-                    fetch_tab(game_id, tab)
-                    for game_id in game_ids
-                    for tab in ("performance", "economy")
-                ]
+                *[fetch_tab(game_id, tab) for game_id, tab in missing_tabs]
             )
 
             for game_id, tab, tab_html in tab_results:
                 if tab_html is None:
                     continue
-                if tab == "performance":
-                    performance_by_game[game_id] = {
-                        "kill_matrix": _parse_kill_matrix(tab_html),
-                        "advanced_stats": _parse_advanced_stats(tab_html),
-                    }
-                elif tab == "economy":
-                    economy_by_game[game_id] = _parse_economy(tab_html)
-
-        event_info = _parse_event_info(base_html)
-        header_info = _parse_match_header(base_html)
-        teams = _parse_teams(base_html)
-        streams, vods = _parse_streams_vods(base_html)
-        maps = _parse_maps(base_html)
-        h2h = _parse_head_to_head(base_html)
-
-        for index, map_data in enumerate(maps):
-            game_id = game_ids[index] if index < len(game_ids) else ""
-            map_data["performance"] = performance_by_game.get(
-                game_id, {"kill_matrix": [], "advanced_stats": []}
-            )
-            map_data["economy"] = economy_by_game.get(game_id, [])
-
-        first_game_performance = performance_by_game.get(
-            first_game_id or "", {"kill_matrix": [], "advanced_stats": []}
-        )
-        first_game_economy = economy_by_game.get(first_game_id or "", [])
-
-        segment = {
-            "match_id": match_id,
-            "event": event_info,
-            "date": header_info["date"],
-            "map_vetos": header_info["map_vetos"],
-            "status": header_info["status"],
-            "teams": teams,
-            "streams": streams,
-            "vods": vods,
-            "maps": maps,
-            "head_to_head": h2h,
-            "performance": {
-                "kill_matrix": first_game_performance["kill_matrix"],
-                "advanced_stats": first_game_performance["advanced_stats"],
-                "by_map": [
-                    {"game_id": game_id, **performance_by_game.get(game_id, {"kill_matrix": [], "advanced_stats": []})}
-                    for game_id in game_ids
-                ],
-            },
-            "economy": first_game_economy,
-            "economy_by_map": [
-                {"game_id": game_id, "rows": economy_by_game.get(game_id, [])}
-                for game_id in game_ids
-            ],
-        }
-
-        data = {"data": {"status": http_status, "segments": [segment]}}
-
-        live = _is_live(base_html)
-        ttl = CACHE_TTL_MATCH_DETAIL_LIVE if live else CACHE_TTL_MATCH_DETAIL
-        cache_manager.set_if_cacheable(ttl, data, "match_detail", match_id)
-
+                parsed = _parse_tab(tab, tab_html)
+                components[tab][game_id] = parsed
+                cache_manager.set(
+                    _tab_ttl(header, game_id), parsed, "match_detail_tab", match_id, game_id, tab
+                )
+
+        data = _respond(match_id, components, requested)
+        if _is_archivable(components, requested):
+            await asyncio.to_thread(match_archive.put, data["data"]["segments"][0])
         return data
 
-    return await cache_manager.coalesce_async(f"match_detail:{match_id}", build)
+    # Callers asking for the same component set share one build.
+    return await cache_manager.coalesce_async(
+        f"match_detail:{match_id}:{','.join(sorted(requested))}", build, label="match_detail"
+    )
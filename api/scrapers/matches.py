@@ -5,6 +5,7 @@ import re
 from utils.cache_manager import cache_manager
 from utils.constants import (
     CACHE_TTL_LIVE,
+    CACHE_TTL_LIVE_ENRICHMENT,
     CACHE_TTL_RESULTS,
     CACHE_TTL_UPCOMING,
     LIVE_DETAIL_FETCH_CONCURRENCY,
@@ -14,16 +15,20 @@ from utils.constants import (
 )
 from utils.error_handling import handle_scraper_errors, raise_for_upstream_status
 from utils.html_parsers import (
+    TIMESTAMP_ETA,
     HTMLParser,
     build_full_url,
     extract_match_teams,
     extract_text_content,
+    match_timestamp_with_source,
     normalize_image_url,
     parse_href_id_slug,
     parse_html,
     parse_match_timestamp,
 )
 from utils.http_client import fetch_with_retries, get_http_client
+from utils.live_state import live_progress, live_state
+from utils.match_store import COMPLETED, LIVE, UPCOMING, match_store, time_from_ago
 from utils.pagination import PaginationConfig, scrape_multiple_pages
 
 logger = logging.getLogger(__name__)
@@ -38,6 +43,92 @@ def _safe_flag(team_node) -> str:
     return flag_class.replace(" mod-", "").replace("16", "_")
 
 
+# Per-match data only available on the detail page. Logos never change during
+# a match; the current map only changes when the series score moves or the
+# round scores reset, so the detail page is refetched only then.
+_UNKNOWN_MAP = {"current_map": "Unknown", "map_number": "Unknown", "map_live": False}
+_EMPTY_ENRICHMENT = {"team_logos": ["", ""], **_UNKNOWN_MAP, "series_score": (), "round_total": 0}
+
+
+def _round_total(round_texts: list[dict]) -> int:
+    """Rounds played on the current map, summed from the homepage CT/T splits."""
+    total = 0
+    for rounds in round_texts:
+        for side in ("ct", "t"):
+            value = rounds.get(side, "")
+            if value.isdigit():
+                total += int(value)
+    return total
+
+
+def _get_live_enrichment(match_id: str) -> dict | None:
+    if not match_id:
+        return None
+    return cache_manager.get(CACHE_TTL_LIVE_ENRICHMENT, "live_enrichment", match_id)
+
+
+def _needs_detail_refresh(enrichment: dict | None, match_data: dict) -> bool:
+    """Refetch on first sight, on a series score change, on a new map, or while the map is unknown."""
+    if enrichment is None or not enrichment["map_live"]:
+        return True
+    if enrichment["series_score"] != tuple(match_data["scores"]):
+        return True
+    return _round_total(match_data["round_texts"]) < enrichment["round_total"]
+
+
+def _parse_live_enrichment(match_html: HTMLParser, match_data: dict, previous: dict | None) -> dict:
+    """Logos and the map in progress from a match detail page."""
+    logos = [
+        "https:" + img.attributes.get("src", "")
+        for img in match_html.css(".match-header-vs img")
+    ]
+    if len(logos) >= 2:
+        team_logos = logos[:2]
+    else:
+        team_logos = previous["team_logos"] if previous is not None else ["", ""]
+
+    current_map = "Unknown"
+    map_number = "Unknown"
+    current_map_element = match_html.css_first(
+        ".vm-stats-gamesnav-item.js-map-switch.mod-active.mod-live"
+    )
+    if current_map_element:
+        map_text = (
+            current_map_element.css_first("div", default="Unknown")
+            .text().strip().replace("\n", "").replace("\t", "")
+        )
+        current_map = re.sub(r"^\d+", "", map_text)
+        map_number_match = re.search(r"^\d+", map_text)
+        map_number = map_number_match.group(0) if map_number_match else "Unknown"
+
+    return {
+        "team_logos": team_logos,
+        "current_map": current_map,
+        "map_number": map_number,
+        "map_live": current_map_element is not None,
+        "series_score": tuple(match_data["scores"]),
+        "round_total": _round_total(match_data["round_texts"]),
+    }
+
+
+def _store_matches(segments: list[dict], state: str) -> None:
+    """Upsert listing rows into the local match store."""
+    match_store.upsert([
+        {
+            "match_id": segment.get("match_id") or parse_href_id_slug(segment.get("match_page", ""))[0],
+            "state": LIVE if segment.get("time_until_match") == "LIVE" else state,
+            "match_time": segment.get("unix_timestamp", ""),
+            "match_time_approximate": segment.get("timestamp_approximate", False),
+            "completed_at": time_from_ago(segment.get("time_completed", "")),
+            "event": segment.get("match_event") or segment.get("tournament_name", ""),
+            "series": segment.get("match_series") or segment.get("round_info", ""),
+            "team1": segment.get("team1", ""),
+            "team2": segment.get("team2", ""),
+            "score1": segment.get("score1", ""),
+            "score2": segment.get("score2", ""),
+        }
+        for segment in segments
+    ])
 
 
 @handle_scraper_errors
@@ -82,6 +173,7 @@ async def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None):
                 }
             )
 
+        await asyncio.to_thread(_store_matches, result, UPCOMING)
         data = {"data": {"status": status, "segments": result}}
 
         return data
@@ -91,7 +183,13 @@ async def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None):
 
 @handle_scraper_errors
 async def vlr_live_score(num_pages=1, from_page=None, to_page=None):
-    """Get live match scores from VLR.GG. Fetches match detail pages concurrently."""
+    """Get live match scores from VLR.GG.
+
+    Logos and the current map come from each match's detail page. They are
+    kept per match and the detail page is only refetched when the homepage
+    shows a series score change or a new map, so most refreshes cost a
+    single homepage request.
+    """
     async def build():
         client = get_http_client()
         resp = await fetch_with_retries(VLR_BASE_URL, client=client)
@@ -164,37 +262,44 @@ async def vlr_live_score(num_pages=1, from_page=None, to_page=None):
                 logger.warning("Failed to fetch match detail %s: %s", url, e)
                 return None
 
+        enrichments = [_get_live_enrichment(m["match_id"]) for m in live_matches]
+        stale = [
+            index for index, match_data in enumerate(live_matches)
+            if _needs_detail_refresh(enrichments[index], match_data)
+        ]
         detail_responses = await asyncio.gather(
-            *[fetch_match_detail(m["url_path"]) for m in live_matches]
+            *[fetch_match_detail(live_matches[index]["url_path"]) for index in stale]
         )
+        for index, detail_resp in zip(stale, detail_responses):
+            match_data, previous = live_matches[index], enrichments[index]
+            if detail_resp is None:
+                # Keep the logos, but the cached map may no longer be current.
+                if previous is not None:
+                    enrichments[index] = {**previous, **_UNKNOWN_MAP}
+                continue
+            enrichment = _parse_live_enrichment(parse_html(detail_resp.text), match_data, previous)
+            enrichments[index] = enrichment
+            if match_data["match_id"]:
+                cache_manager.set(
+                    CACHE_TTL_LIVE_ENRICHMENT, enrichment, "live_enrichment", match_data["match_id"]
+                )
 
         result = []
-        for match_data, detail_resp in zip(live_matches, detail_responses):
-            team_logos = ["", ""]
-            current_map = "Unknown"
-            map_number = "Unknown"
-
-            if detail_resp is not None:
-                match_html = parse_html(detail_resp.text)
-
-                logos = []
-                for img in match_html.css(".match-header-vs img"):
-                    logo_url = "https:" + img.attributes.get("src", "")
-                    logos.append(logo_url)
-                if len(logos) >= 2:
-                    team_logos = logos[:2]
-
-                current_map_element = match_html.css_first(
-                    ".vm-stats-gamesnav-item.js-map-switch.mod-active.mod-live"
+        for match_data, enrichment in zip(live_matches, enrichments):
+            enrichment = enrichment or _EMPTY_ENRICHMENT
+            team_logos = enrichment["team_logos"]
+            current_map = enrichment["current_map"]
+            map_number = enrichment["map_number"]
+
+            if match_data["match_id"] and enrichment is not _EMPTY_ENRICHMENT:
+                live_state.observe(
+                    match_data["match_id"],
+                    live=True,
+                    map_in_progress=enrichment["map_live"],
+                    progress=live_progress(
+                        match_data["scores"], [_round_total([rounds]) for rounds in match_data["round_texts"]]
+                    ),
                 )
-                if current_map_element:
-                    map_text = (
-                        current_map_element.css_first("div", default="Unknown")
-                        .text().strip().replace("\n", "").replace("\t", "")
-                    )
-                    current_map = re.sub(r"^\d+", "", map_text)
-                    map_number_match = re.search(r"^\d+", map_text)
-                    map_number = map_number_match.group(0) if map_number_match else "Unknown"
 
             rt = match_data["round_texts"]
             result.append(
@@ -222,6 +327,7 @@ async def vlr_live_score(num_pages=1, from_page=None, to_page=None):
                 }
             )
 
+        await asyncio.to_thread(_store_matches, result, LIVE)
         data = {"data": {"status": status, "segments": result}}
 
         return data
@@ -291,7 +397,7 @@ def _parse_single_match(item, date_str, page):
         if icon_src:
             tourney_icon_url = normalize_image_url(icon_src)
 
-    timestamp = parse_match_timestamp(item, date_str)
+    timestamp, timestamp_source = match_timestamp_with_source(item, date_str)
 
     return {
         "team1": teams[0],
@@ -304,6 +410,7 @@ def _parse_single_match(item, date_str, page):
         "match_series": match_series,
         "match_event": tourney,
         "unix_timestamp": timestamp,
+        "timestamp_approximate": timestamp_source == TIMESTAMP_ETA,
         "match_page": url_path,
         "tournament_icon": tourney_icon_url,
         "page_number": page,
@@ -410,6 +517,7 @@ def _parse_results_page(html: HTMLParser, page: int) -> list[dict]:
                     "round_info": rounds,
                     "tournament_name": tourney,
                     "match_page": url_path,
+                    "match_id": parse_href_id_slug(url_path)[0],
                     "tournament_icon": tourney_icon_url,
                     "page_number": page,
                 }
@@ -434,11 +542,13 @@ async def vlr_upcoming_matches_extended(
     cache_key = ("upcoming_ext", num_pages, from_page, to_page)
 
     async def build():
-        return await scrape_multiple_pages(
+        result = await scrape_multiple_pages(
             base_url=VLR_MATCHES_URL,
             parse_func=_parse_upcoming_page,
             config=config,
         )
+        await asyncio.to_thread(_store_matches, result["data"]["segments"], UPCOMING)
+        return result
 
     return await cache_manager.get_or_create_async(CACHE_TTL_UPCOMING, build, *cache_key)
 
@@ -446,20 +556,31 @@ async def vlr_upcoming_matches_extended(
 @handle_scraper_errors
 async def vlr_match_results(
     num_pages=1, from_page=None, to_page=None,
-    max_retries=3, request_delay=1.0, timeout=30,
+    max_retries=3, request_delay=1.0, timeout=30, since_match_id=None,
 ):
-    """Scrape match results with pagination."""
+    """Scrape match results with pagination.
+
+    With ``since_match_id`` only results newer than that match are returned:
+    pages are walked newest first and pagination stops at the page where the
+    known match appears (``meta.stopped_early``). If it is not found within
+    the page window, every scraped result is returned.
+    """
     config = PaginationConfig(
         num_pages=num_pages, from_page=from_page, to_page=to_page,
         max_retries=max_retries, request_delay=request_delay, timeout=timeout,
     )
     cache_key = ("results", num_pages, from_page, to_page)
+    if since_match_id:
+        cache_key += (since_match_id,)
 
     async def build():
-        return await scrape_multiple_pages(
+        result = await scrape_multiple_pages(
             base_url=f"{VLR_MATCHES_URL}/results",
             parse_func=_parse_results_page,
             config=config,
+            stop_at=(lambda item: item["match_id"] == since_match_id) if since_match_id else None,
         )
+        await asyncio.to_thread(_store_matches, result["data"]["segments"], COMPLETED)
+        return result
 
     return await cache_manager.get_or_create_async(CACHE_TTL_RESULTS, build, *cache_key)
@@ -4,8 +4,14 @@ Scraper for VLR.GG player profile and match history pages.
 import logging
 import re
 
+from utils.batch import bounded_as_completed
 from utils.cache_manager import cache_manager
-from utils.constants import CACHE_TTL_PLAYER, CACHE_TTL_PLAYER_MATCHES, VLR_BASE_URL
+from utils.constants import (
+    CACHE_TTL_PLAYER,
+    CACHE_TTL_PLAYER_MATCHES,
+    PLAYER_MATCHES_PAGE_CONCURRENCY,
+    VLR_BASE_URL,
+)
 from utils.error_handling import handle_scraper_errors, upstream_error_payload
 from utils.html_parsers import (
     HTMLParser,
@@ -17,6 +23,7 @@ from utils.html_parsers import (
     parse_html,
 )
 from utils.http_client import fetch_with_retries, get_http_client
+from utils.numeric import numeric_rows
 
 logger = logging.getLogger(__name__)
 
@@ -236,6 +243,12 @@ def _parse_agent_stats(html: HTMLParser) -> list[dict]:
     return agent_stats
 
 
+NUMERIC_AGENT_STATS_FIELDS = (
+    "usage_count", "usage_pct", "rounds", "rating", "acs", "kd", "adr", "kast",
+    "kpr", "apr", "fkpr", "fdpr", "kills", "deaths", "assists", "fk", "fd",
+)
+
+
 def _parse_event_placements(html: HTMLParser) -> list[dict]:
     """
     Extract tournament placement records.
@@ -458,18 +471,7 @@ def _parse_player_match_item(item) -> dict | None:
 # ---------------------------------------------------------------------------
 
 
-@handle_scraper_errors
-async def vlr_player(player_id: str, timespan: str = "90d") -> dict:
-    """
-    Scrape a VLR.GG player profile page.
-
-    Args:
-        player_id: Numeric player ID (e.g. "2").
-        timespan: Agent stats window — one of "30d", "60d", "90d", "all".
-
-    Returns:
-        Standard API envelope with a single-element segments list.
-    """
+async def _player_profile(player_id: str, timespan: str) -> dict:
     cache_key = ("player", player_id, timespan)
 
     async def build():
@@ -509,18 +511,47 @@ async def vlr_player(player_id: str, timespan: str = "90d") -> dict:
     return await cache_manager.get_or_create_async(CACHE_TTL_PLAYER, build, *cache_key)
 
 
+def peek_player(player_id: str, timespan: str, numeric: bool = False) -> dict | None:
+    """Return the cached profile payload, or None if it would have to be scraped."""
+    if numeric:
+        return cache_manager.get(CACHE_TTL_PLAYER, "player", player_id, timespan, "numeric")
+    return cache_manager.get(CACHE_TTL_PLAYER, "player", player_id, timespan)
+
+
 @handle_scraper_errors
-async def vlr_player_matches(player_id: str, page: int = 1) -> dict:
+async def vlr_player(player_id: str, timespan: str = "90d", numeric: bool = False) -> dict:
     """
-    Scrape the match history page for a VLR.GG player.
+    Scrape a VLR.GG player profile page.
 
     Args:
         player_id: Numeric player ID (e.g. "2").
-        page: Pagination index, 1-based.
+        timespan: Agent stats window — one of "30d", "60d", "90d", "all".
+        numeric: Return agent stats as ints/floats (None when missing),
+            converted once from the cached profile and cached separately.
 
     Returns:
-        Standard API envelope with match segments and a meta block.
+        Standard API envelope with a single-element segments list.
     """
+    if not numeric:
+        return await _player_profile(player_id, timespan)
+
+    async def build_numeric():
+        profile = await _player_profile(player_id, timespan)
+        inner = profile["data"]
+        if inner["status"] >= 400:
+            return profile
+        segments = [
+            {**segment, "agent_stats": numeric_rows(segment["agent_stats"], NUMERIC_AGENT_STATS_FIELDS)}
+            for segment in inner["segments"]
+        ]
+        return {"data": {**inner, "segments": segments}}
+
+    return await cache_manager.get_or_create_async(
+        CACHE_TTL_PLAYER, build_numeric, "player", player_id, timespan, "numeric"
+    )
+
+
+async def _player_matches_page(player_id: str, page: int) -> dict:
     cache_key = ("player_matches", player_id, page)
 
     async def build():
@@ -571,3 +602,93 @@ async def vlr_player_matches(player_id: str, page: int = 1) -> dict:
     return await cache_manager.get_or_create_async(
         CACHE_TTL_PLAYER_MATCHES, build, *cache_key
     )
+
+
+@handle_scraper_errors
+async def vlr_player_matches(player_id: str, page: int = 1) -> dict:
+    """
+    Scrape the match history page for a VLR.GG player.
+
+    Args:
+        player_id: Numeric player ID (e.g. "2").
+        page: Pagination index, 1-based.
+
+    Returns:
+        Standard API envelope with match segments and a meta block.
+    """
+    return await _player_matches_page(player_id, page)
+
+
+@handle_scraper_errors
+async def vlr_player_match_history(
+    player_id: str, first_page: int, last_page: int, limit: int | None = None
+) -> dict:
+    """
+    Merge several match history pages for a player, newest first.
+
+    Pages are fetched in waves of ``PLAYER_MATCHES_PAGE_CONCURRENCY`` and
+    each page is cached on its own (shared with ``vlr_player_matches``).
+    Merging stops at the first empty page, once ``limit`` matches are
+    collected, or at a failed page; ``meta.stopped`` says which. A failure
+    on ``first_page`` fails the request. Matches that shift onto the next
+    page while it is fetched are only listed once.
+
+    Args:
+        player_id: Numeric player ID (e.g. "2").
+        first_page: First page to fetch, 1-based.
+        last_page: Last page to fetch (inclusive).
+        limit: Optional maximum number of matches to return.
+    """
+    matches: list[dict] = []
+    seen: set[str] = set()
+    pages: list[int] = []
+    stopped = None
+    failed_page = None
+
+    async def fetch(page: int) -> dict:
+        return await _player_matches_page(player_id, page)
+
+    for wave_start in range(first_page, last_page + 1, PLAYER_MATCHES_PAGE_CONCURRENCY):
+        wave = list(range(wave_start, min(wave_start + PLAYER_MATCHES_PAGE_CONCURRENCY, last_page + 1)))
+        results = {
+            page: (result, error)
+            async for page, result, error in bounded_as_completed(wave, fetch, PLAYER_MATCHES_PAGE_CONCURRENCY)
+        }
+        for page in wave:
+            result, error = results[page]
+            if error is None and result["data"]["status"] >= 400:
+                if page == first_page:
+                    return result
+                error = result["data"].get("error", "Upstream request failed")
+            elif error is not None and page == first_page:
+                raise error
+            if error is not None:
+                stopped, failed_page = "error", {"page": page, "error": str(error)}
+                break
+            if not result["data"]["segments"]:
+                stopped = "empty_page"
+                break
+            pages.append(page)
+            for match in result["data"]["segments"]:
+                if match["match_id"] and match["match_id"] in seen:
+                    continue
+                seen.add(match["match_id"])
+                matches.append(match)
+            if limit is not None and len(matches) >= limit:
+                matches = matches[:limit]
+                stopped = "limit"
+                break
+        if stopped is not None:
+            break
+
+    meta = {
+        "pages": pages,
+        "first_page": first_page,
+        "last_page": last_page,
+        "count": len(matches),
+        "limit": limit,
+        "stopped": stopped,
+    }
+    if failed_page is not None:
+        meta["failed_page"] = failed_page
+    return {"data": {"status": 200, "segments": matches, "meta": meta}}
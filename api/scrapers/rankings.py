@@ -1,11 +1,17 @@
+import asyncio
 import logging
 import re
 
+from fastapi import HTTPException
+
+from utils.batch import bounded_as_completed
 from utils.cache_manager import cache_manager
-from utils.constants import CACHE_TTL_RANKINGS, VLR_RANKINGS_URL
+from utils.constants import CACHE_TTL_RANKINGS, RANKINGS_FETCH_CONCURRENCY, VLR_RANKINGS_URL
 from utils.error_handling import handle_scraper_errors, raise_for_upstream_status, validate_region
 from utils.html_parsers import parse_html
 from utils.http_client import fetch_with_retries, get_http_client
+from utils.rankings_history import rankings_history
+from utils.utils import region as REGIONS
 
 logger = logging.getLogger(__name__)
 
@@ -97,8 +103,7 @@ def _extract_last_played_summary(item) -> tuple[str, str, str]:
     return last_played, last_played_team, opponent_logo
 
 
-@handle_scraper_errors
-async def vlr_rankings(region_key):
+async def _region_rankings(region_key: str) -> dict:
     async def build():
         region_name = validate_region(region_key)
         url = f"{VLR_RANKINGS_URL}/{region_name}"
@@ -137,6 +142,9 @@ async def vlr_rankings(region_key):
                 }
             )
 
+        if result:
+            await asyncio.to_thread(rankings_history.record, region_key, result)
+
         data = {"data": {"status": status, "segments": result}}
 
         return data
@@ -144,3 +152,73 @@ async def vlr_rankings(region_key):
     return await cache_manager.get_or_create_async(
         CACHE_TTL_RANKINGS, build, "rankings", region_key
     )
+
+
+@handle_scraper_errors
+async def vlr_rankings(region_key):
+    return await _region_rankings(region_key)
+
+
+def _region_error(region_key: str, exc: Exception) -> dict:
+    if isinstance(exc, HTTPException):
+        code, message = exc.status_code, str(exc.detail)
+    else:
+        logger.warning("Rankings for %s failed: %s", region_key, exc)
+        code, message = 502, "Failed to fetch data from VLR.GG"
+    return {"region": region_key, "status": "error", "code": code, "message": message}
+
+
+@handle_scraper_errors
+async def vlr_rankings_all() -> dict:
+    """Rankings for every region in one region-tagged table.
+
+    The merged result is cached together with the region pages it was built
+    from and is only served while every one of them is still the cached page,
+    so it expires with its oldest source. The pages are checked with
+    ``cache_manager.peek``, so a warm request counts as one cache lookup. On a
+    miss, regions missing from the per-region cache are scraped concurrently
+    (``RANKINGS_FETCH_CONCURRENCY`` at a time, through the shared upstream
+    limiter). Rows keep each region's order and gain
+    ``region`` / ``region_name``; ``meta.regions`` reports each region. A
+    merge with failed regions is returned but not cached.
+    """
+    cached = cache_manager.get(CACHE_TTL_RANKINGS, "rankings", "all")
+    if cached is not None:
+        sources, data = cached
+        if all(
+            cache_manager.peek(CACHE_TTL_RANKINGS, "rankings", region_key) is page
+            for region_key, page in sources.items()
+        ):
+            return data
+
+    async def build():
+        pages: dict[str, dict] = {}
+        errors: dict[str, dict] = {}
+        async for region_key, result, error in bounded_as_completed(
+            REGIONS, _region_rankings, RANKINGS_FETCH_CONCURRENCY
+        ):
+            if error is not None:
+                errors[region_key] = _region_error(region_key, error)
+            else:
+                pages[region_key] = result
+
+        if not pages:
+            first = errors[next(iter(REGIONS))]
+            return {"data": {"status": first["code"], "error": first["message"], "segments": []}}
+
+        rows = []
+        summary = []
+        for region_key, region_name in REGIONS.items():
+            if region_key in errors:
+                summary.append(errors[region_key])
+                continue
+            table = pages[region_key]["data"]["segments"]
+            rows.extend({**row, "region": region_key, "region_name": region_name} for row in table)
+            summary.append({"region": region_key, "status": "success", "teams": len(table)})
+
+        data = {"data": {"status": 200, "segments": rows, "meta": {"count": len(rows), "regions": summary}}}
+        if not errors:
+            cache_manager.set(CACHE_TTL_RANKINGS, (pages, data), "rankings", "all")
+        return data
+
+    return await cache_manager.coalesce_async("rankings:all", build, label="rankings")
@@ -1,7 +1,10 @@
 import logging
 
+from fastapi import HTTPException
+
+from utils.batch import bounded_as_completed
 from utils.cache_manager import cache_manager
-from utils.constants import CACHE_TTL_STATS, VLR_STATS_URL
+from utils.constants import CACHE_TTL_STATS, STATS_MATRIX_CONCURRENCY, VLR_STATS_URL
 from utils.error_handling import (
     handle_scraper_errors,
     raise_for_upstream_status,
@@ -10,9 +13,27 @@ from utils.error_handling import (
 )
 from utils.html_parsers import extract_text_content, parse_html
 from utils.http_client import fetch_with_retries, get_http_client
+from utils.numeric import parse_number
+from utils.stats_table import AGGREGATE_SECTIONS, StatsAggregate, StatsTable
 
 logger = logging.getLogger(__name__)
 
+# Converted by numeric=true; clutch_attempts ("won/played") stays a string.
+NUMERIC_STATS_FIELDS = (
+    "rounds_played",
+    "rating",
+    "average_combat_score",
+    "kill_deaths",
+    "kill_assists_survived_traded",
+    "average_damage_per_round",
+    "kills_per_round",
+    "assists_per_round",
+    "first_kills_per_round",
+    "first_deaths_per_round",
+    "headshot_percentage",
+    "clutch_success_percentage",
+)
+
 
 def _cell_text(cells: list, index: int) -> str:
     """Read a table cell by index without raising on sparse rows."""
@@ -58,8 +79,13 @@ def _parse_stats_row(item) -> dict:
     }
 
 
-@handle_scraper_errors
-async def vlr_stats(region_key: str, timespan: str):
+async def stats_table(region_key: str, timespan: str) -> StatsTable:
+    """The stats page for a region/timespan with its sort indexes, built once per cache fill.
+
+    The table is the only cache entry for the page: the plain payload and the
+    aggregate are derived from it and expire with it.
+    """
+
     async def build():
         validate_region(region_key)
         validate_timespan(timespan)
@@ -88,10 +114,153 @@ async def vlr_stats(region_key: str, timespan: str):
             if parsed["player"]:
                 result.append(parsed)
 
-        data = {"data": {"status": status, "segments": result}}
-
-        return data
+        return StatsTable(result, NUMERIC_STATS_FIELDS, status)
 
     return await cache_manager.get_or_create_async(
         CACHE_TTL_STATS, build, "stats", region_key, timespan
     )
+
+
+async def _stats_page(region_key: str, timespan: str) -> dict:
+    table = await stats_table(region_key, timespan)
+    return {"data": {"status": table.status, "segments": table.rows}}
+
+
+async def stats_aggregate(region_key: str, timespan: str) -> StatsAggregate:
+    """Aggregates of the cached stats table, computed once per cache fill."""
+    return (await stats_table(region_key, timespan)).aggregate()
+
+
+@handle_scraper_errors
+async def vlr_stats(
+    region_key: str,
+    timespan: str,
+    numeric: bool = False,
+    *,
+    sort: str | None = None,
+    order: str = "desc",
+    limit: int | None = None,
+    min_rounds: int | None = None,
+    agent: str | None = None,
+    org: str | None = None,
+):
+    """Player stats table for a region and timespan.
+
+    With ``numeric`` the stat fields are ints/floats (None when missing).
+    ``sort`` (one of NUMERIC_STATS_FIELDS), ``limit`` and the filters run
+    against the cached ``StatsTable``: rows are taken from the pre-sorted
+    index until ``limit`` matches are found, and ``meta`` reports how many
+    were returned out of the full table.
+    """
+    filtered = any(value is not None for value in (sort, limit, min_rounds, agent, org))
+    if not numeric and not filtered:
+        return await _stats_page(region_key, timespan)
+
+    table = await stats_table(region_key, timespan)
+    if not filtered:
+        return {"data": {"status": table.status, "segments": table.typed}}
+
+    rows = table.select(
+        sort=sort, order=order, limit=limit, min_rounds=min_rounds, agent=agent, org=org, numeric=numeric
+    )
+    return {
+        "data": {
+            "status": table.status,
+            "segments": rows,
+            "meta": {"count": len(rows), "total": len(table), "sort": sort, "order": order, "limit": limit},
+        }
+    }
+
+
+def _dedupe_players(rows: list[dict]) -> list[dict]:
+    """One row per (player, org, timespan): the region with the most rounds,
+    tagged with every region the player appeared in."""
+    best: dict[tuple, tuple[int, dict]] = {}
+    regions: dict[tuple, list[str]] = {}
+    for row in rows:
+        key = (row["player"], row["org"], row["timespan"])
+        regions.setdefault(key, []).append(row["region"])
+        rounds = parse_number(row["rounds_played"]) or 0
+        if key not in best or rounds > best[key][0]:
+            best[key] = (rounds, row)
+    return [{**row, "regions": regions[key]} for key, (_, row) in best.items()]
+
+
+def _cell_error(region_key: str, timespan: str, exc: Exception) -> dict:
+    if isinstance(exc, HTTPException):
+        code, message = exc.status_code, str(exc.detail)
+    else:
+        logger.warning("Stats matrix cell %s/%s failed: %s", region_key, timespan, exc)
+        code, message = 502, "Failed to fetch data from VLR.GG"
+    return {"region": region_key, "timespan": timespan, "status": "error", "code": code, "message": message}
+
+
+@handle_scraper_errors
+async def vlr_stats_matrix(
+    regions: list[str], timespans: list[str], numeric: bool = False, dedupe: bool = False
+) -> dict:
+    """Stats tables for every region x timespan combination, merged into one list.
+
+    Each cell is the cached ``StatsTable`` for that region and timespan; cells
+    not in the cache are scraped concurrently (``STATS_MATRIX_CONCURRENCY`` at
+    a time, all through the shared upstream limiter). Rows are tagged with
+    ``region`` and ``timespan`` and ordered by cell in request order. A failed
+    cell is reported in ``meta.cells`` and does not fail the response. With
+    ``dedupe`` each player keeps one row per timespan (see ``_dedupe_players``).
+    """
+    cells = [(region_key, timespan) for region_key in regions for timespan in timespans]
+
+    async def worker(cell: tuple[str, str]) -> StatsTable:
+        return await stats_table(*cell)
+
+    tables: dict[tuple[str, str], StatsTable] = {}
+    errors: dict[tuple[str, str], dict] = {}
+    async for cell, table, error in bounded_as_completed(cells, worker, STATS_MATRIX_CONCURRENCY):
+        if error is not None:
+            errors[cell] = _cell_error(*cell, error)
+        else:
+            tables[cell] = table
+
+    rows = []
+    summary = []
+    for region_key, timespan in cells:
+        table = tables.get((region_key, timespan))
+        if table is None:
+            summary.append(errors[region_key, timespan])
+            continue
+        source = table.typed if numeric else table.rows
+        rows.extend({**row, "region": region_key, "timespan": timespan} for row in source)
+        summary.append({"region": region_key, "timespan": timespan, "status": "success", "rows": len(table)})
+    if dedupe:
+        rows = _dedupe_players(rows)
+
+    if errors and not tables:
+        first = errors[cells[0]]
+        return {"data": {"status": first["code"], "error": first["message"], "segments": []}}
+    return {
+        "data": {
+            "status": 200,
+            "segments": rows,
+            "meta": {"count": len(rows), "cells": summary},
+        }
+    }
+
+
+@handle_scraper_errors
+async def vlr_stats_aggregate(
+    region_key: str,
+    timespan: str,
+    columns: list[str] | None = None,
+    sections: list[str] = AGGREGATE_SECTIONS,
+    players: list[str] | None = None,
+) -> dict:
+    """Column distributions, per-player percentile ranks / z-scores and
+    correlations for one stats table (see ``StatsAggregate``)."""
+    aggregate = await stats_aggregate(region_key, timespan)
+    return {
+        "data": {
+            "status": 200,
+            "segments": [aggregate.select(columns, sections, players)],
+            "meta": {"rows": len(aggregate.players), "region": region_key, "timespan": timespan},
+        }
+    }
@@ -6,6 +6,7 @@ Provides three async scraper functions:
   - vlr_team_matches: paginated match history for a team
   - vlr_team_transactions: roster transaction log for a team
 """
+import asyncio
 import logging
 import re
 
@@ -29,6 +30,7 @@ from utils.html_parsers import (
     parse_html,
 )
 from utils.http_client import fetch_with_retries, get_http_client
+from utils.match_store import COMPLETED, match_store, normalize_day
 
 logger = logging.getLogger(__name__)
 
@@ -461,6 +463,21 @@ def _parse_team_match_item(item) -> dict | None:
     }
 
 
+def _match_store_record(match: dict) -> dict:
+    """Map a team match history row onto the local match store columns."""
+    scores = [part.strip() for part in match["score"].split(":")]
+    return {
+        "match_id": match["match_id"],
+        "match_time": normalize_day(match["date"]),
+        "state": COMPLETED if match["result"] else "",
+        "event": match["event"],
+        "team1": match["team1"]["name"],
+        "team2": match["team2"]["name"],
+        "score1": scores[0] if len(scores) == 2 else "",
+        "score2": scores[1] if len(scores) == 2 else "",
+    }
+
+
 # ---------------------------------------------------------------------------
 # Transaction helpers (used by vlr_team_transactions)
 # ---------------------------------------------------------------------------
@@ -691,6 +708,7 @@ async def vlr_team_matches(team_id: str, page: int = 1) -> dict:
                     "Failed to parse match item for team %s: %s", team_id, exc
                 )
 
+        await asyncio.to_thread(match_store.upsert, [_match_store_record(match) for match in matches])
         return {
             "data": {
                 "status": status,
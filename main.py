@@ -3,14 +3,20 @@ from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
+from routers.admin_router import router as admin_router
+from routers.live_streams import live_score_feed, match_feeds
+from routers.notifications import match_event_feed, webhook_notifier
 from routers.v2_router import router as v2_router
 from routers.vlr_router import router as vlr_router
 from utils.constants import API_DESCRIPTION, API_PORT, API_TITLE
 from utils.http_client import close_http_client
+from utils.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from utils.request_timing import ServerTimingMiddleware
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,8 +25,13 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting vlrggapi")
+    await webhook_notifier.ensure_running()
     yield
-    logger.info("Shutting down — closing HTTP client")
+    logger.info("Shutting down — stopping live pollers and closing HTTP client")
+    await webhook_notifier.stop()
+    await match_event_feed.stop()
+    await live_score_feed.stop()
+    await match_feeds.stop()
     await close_http_client()
 
 
@@ -35,9 +46,11 @@ app = FastAPI(
 limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_middleware(ServerTimingMiddleware)
 
 app.include_router(vlr_router)
 app.include_router(v2_router)
+app.include_router(admin_router)
 
 
 @app.get("/version", tags=["Meta"])
@@ -45,5 +58,11 @@ def version():
     return {"version": "2.0.0", "default_api": "v2"}
 
 
+@app.get("/metrics", tags=["Meta"], response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text-format metrics: upstream, parse, scraper, and serialization timings."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=API_PORT)
@@ -1 +1,2 @@
+from .request_models import WebhookSubscriptionRequest
 from .response_models import V2Response
@@ -0,0 +1,11 @@
+"""
+Pydantic request bodies used by active API routes.
+"""
+from pydantic import BaseModel, Field
+
+
+class WebhookSubscriptionRequest(BaseModel):
+    """Body of POST /v2/admin/webhooks."""
+    url: str = Field(..., description="http(s) URL that receives POSTed event batches")
+    events: list[str] | None = Field(None, description="Event types to receive; all when omitted")
+    secret: str = Field("", description="Optional HMAC-SHA256 signing secret")
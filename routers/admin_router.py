@@ -0,0 +1,172 @@
+"""
+Operator-only diagnostics under /v2/admin.
+
+Every route requires the ``X-Admin-Token`` header to match the
+``VLRGGAPI_ADMIN_TOKEN`` environment variable. When the variable is unset the
+routes respond 404 so they are invisible on public deployments.
+"""
+import asyncio
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from models import WebhookSubscriptionRequest
+from routers.instrumentation import InstrumentedRoute
+from routers.notifications import webhook_notifier
+from utils.constants import (
+    ADMIN_TOKEN_ENV,
+    ADMIN_TOKEN_HEADER,
+    HEAP_TRACE_MAX_FRAMES,
+    PROFILER_DEFAULT_INTERVAL_MS,
+    PROFILER_MAX_SECONDS,
+    PROFILER_MIN_INTERVAL_MS,
+    RATE_LIMIT,
+    WEBHOOK_MAX_SUBSCRIPTIONS,
+)
+from utils.heap import heap_tracker
+from utils.profiler import ProfilerBusyError, profiler, to_collapsed
+from utils.webhooks import WEBHOOK_EVENTS, public_subscription, webhook_store
+
+
+def require_admin(x_admin_token: str | None = Header(None, alias=ADMIN_TOKEN_HEADER)) -> None:
+    """Reject requests without a valid admin token."""
+    expected = os.environ.get(ADMIN_TOKEN_ENV)
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/v2/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+    route_class=InstrumentedRoute,
+    include_in_schema=False,
+)
+limiter = Limiter(key_func=get_remote_address)
+
+
+@router.get("/profile")
+@limiter.limit(RATE_LIMIT)
+async def admin_profile(
+    request: Request,
+    seconds: float = Query(5.0, gt=0, le=PROFILER_MAX_SECONDS, description="Sampling duration"),
+    interval_ms: float = Query(
+        PROFILER_DEFAULT_INTERVAL_MS, ge=PROFILER_MIN_INTERVAL_MS, le=1000,
+        description="Delay between samples in milliseconds",
+    ),
+    format: str = Query("json", pattern="^(json|collapsed)$", description="json or collapsed"),
+):
+    """
+    Sample every thread's stack for `seconds` and aggregate by scraper function.
+
+    `format=collapsed` returns one `group;frame;...;frame count` line per
+    distinct stack, ready for flamegraph.pl or speedscope.
+    """
+    try:
+        report = await profiler.run(seconds, interval_ms / 1000)
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+    if format == "collapsed":
+        return PlainTextResponse(to_collapsed(report))
+    return {"status": "success", "data": report}
+
+
+@router.post("/heap/start")
+@limiter.limit(RATE_LIMIT)
+async def admin_heap_start(
+    request: Request,
+    frames: int = Query(HEAP_TRACE_MAX_FRAMES, ge=1, le=100, description="Frames stored per allocation"),
+):
+    """Start tracemalloc (restarting it if `frames` differs) and record a baseline snapshot."""
+    await heap_tracker.start(frames)
+    return {"status": "success", "data": await heap_tracker.report(top=0)}
+
+
+@router.get("/heap")
+@limiter.limit(RATE_LIMIT)
+async def admin_heap(
+    request: Request,
+    top: int = Query(10, ge=0, le=100, description="Number of growth sites to list"),
+    rebase: bool = Query(False, description="Use this snapshot as the next baseline"),
+):
+    """
+    Snapshot the heap and diff it against the baseline.
+
+    Live traced bytes are grouped by module (scrapers, cache_manager,
+    http_client, html_parsers, httpx, selectolax, other) alongside the
+    current cache byte estimate and process RSS. Without an active trace only
+    the cache and RSS figures are returned.
+    """
+    return {"status": "success", "data": await heap_tracker.report(top=top, rebase=rebase)}
+
+
+@router.post("/heap/stop")
+@limiter.limit(RATE_LIMIT)
+async def admin_heap_stop(request: Request):
+    """Stop tracemalloc and discard the baseline."""
+    await heap_tracker.stop()
+    return {"status": "success", "data": await heap_tracker.report(top=0)}
+
+
+@router.get("/webhooks")
+@limiter.limit(RATE_LIMIT)
+async def admin_webhooks(request: Request):
+    """List webhook subscriptions with the outcome of their last delivery."""
+    last_delivery = webhook_notifier.delivery.last_delivery
+    return {
+        "status": "success",
+        "data": {
+            "running": webhook_notifier.running,
+            "subscriptions": [
+                {**public_subscription(subscription), "last_delivery": last_delivery.get(subscription["id"])}
+                for subscription in await asyncio.to_thread(webhook_store.list)
+            ],
+        },
+    }
+
+
+@router.post("/webhooks", status_code=201)
+@limiter.limit(RATE_LIMIT)
+async def admin_add_webhook(request: Request, body: WebhookSubscriptionRequest):
+    """
+    Register a webhook target.
+
+    Event batches are POSTed as `{"events": [...]}`. Event types are
+    `match_started`, `map_ended`, and `match_completed`. With a `secret`,
+    each request carries an `X-Vlrggapi-Signature: sha256=<hmac>` header.
+    """
+    if not body.url.startswith(("http://", "https://")):
+        raise HTTPException(status_code=400, detail="Webhook url must start with http:// or https://")
+    events = body.events if body.events is not None else list(WEBHOOK_EVENTS)
+    invalid = sorted(set(events) - set(WEBHOOK_EVENTS))
+    if invalid or not events:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid webhook events {invalid}. Valid events: {', '.join(WEBHOOK_EVENTS)}",
+        )
+    if await asyncio.to_thread(webhook_store.count) >= WEBHOOK_MAX_SUBSCRIPTIONS:
+        raise HTTPException(status_code=409, detail=f"At most {WEBHOOK_MAX_SUBSCRIPTIONS} webhooks may be registered")
+
+    subscription = await asyncio.to_thread(webhook_store.add, body.url, events, body.secret)
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Webhook storage is unavailable")
+    await webhook_notifier.ensure_running()
+    return {"status": "success", "data": public_subscription(subscription)}
+
+
+@router.delete("/webhooks/{subscription_id}")
+@limiter.limit(RATE_LIMIT)
+async def admin_delete_webhook(request: Request, subscription_id: str):
+    """Remove a webhook target; the event engine stops with the last one."""
+    if not await asyncio.to_thread(webhook_store.remove, subscription_id):
+        raise HTTPException(status_code=404, detail=f"Webhook '{subscription_id}' not found")
+    if await asyncio.to_thread(webhook_store.count) == 0:
+        await webhook_notifier.stop()
+    return {"status": "success", "data": {"id": subscription_id, "deleted": True}}
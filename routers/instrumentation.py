@@ -0,0 +1,92 @@
+"""
+Route class that reports request latency and response serialization time.
+"""
+import asyncio
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from utils import request_timing
+from utils.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS, SERIALIZATION_SECONDS
+
+
+class _EndpointMarker:
+    """Mutable holder the endpoint wrapper stamps when the endpoint returns."""
+
+    __slots__ = ("returned_at",)
+
+    def __init__(self) -> None:
+        self.returned_at: float | None = None
+
+
+_endpoint_marker: ContextVar[_EndpointMarker | None] = ContextVar("endpoint_marker", default=None)
+
+
+def _with_debug_timing(result):
+    """Attach the timing breakdown to a V2 envelope when the client asked for it."""
+    timings = request_timing.current()
+    if timings is None or not timings.debug:
+        return result
+    if not isinstance(result, dict) or result.get("status") != "success":
+        return result
+    meta = dict(result.get("meta") or {})
+    meta["timing"] = timings.as_dict()
+    return {**result, "meta": meta}
+
+
+def _mark_return(endpoint):
+    """Wrap an async endpoint so the route knows when serialization starts."""
+    if getattr(endpoint, "__instrumented__", False) or not asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = _with_debug_timing(await endpoint(*args, **kwargs))
+        marker = _endpoint_marker.get()
+        if marker is not None:
+            marker.returned_at = time.perf_counter()
+        return result
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    """APIRoute that records per-route request counts, latency, and serialization time.
+
+    Serialization time covers response-model validation, JSON encoding, and
+    building the Response object, i.e. everything after the endpoint returns.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_return(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def instrumented_handler(request: Request) -> Response:
+            marker = _EndpointMarker()
+            token = _endpoint_marker.set(marker)
+            started = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as exc:
+                status = exc.status_code
+                raise
+            finally:
+                finished = time.perf_counter()
+                _endpoint_marker.reset(token)
+                HTTP_REQUESTS.inc(method=request.method, route=route, status=status)
+                HTTP_REQUEST_SECONDS.observe(finished - started, method=request.method, route=route)
+                if marker.returned_at is not None:
+                    SERIALIZATION_SECONDS.observe(finished - marker.returned_at, route=route)
+                    request_timing.add("serialize", finished - marker.returned_at)
+
+        return instrumented_handler
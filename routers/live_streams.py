@@ -0,0 +1,224 @@
+"""
+Live push feeds built on shared pollers (Server-Sent Events and WebSocket).
+"""
+import asyncio
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from api.scrapers import vlr_live_score
+from api.scrapers.match_detail import diff_live_snapshots, fetch_live_snapshot
+from utils.cache_manager import cache_manager
+from utils.constants import (
+    CACHE_TTL_LIVE,
+    LIVE_MATCH_POLL_INTERVAL,
+    LIVE_STREAM_IDLE_INTERVAL,
+    LIVE_STREAM_KEEPALIVE,
+    LIVE_STREAM_POLL_INTERVAL,
+    LIVE_WS_MAX_MATCH_FEEDS,
+    LIVE_WS_MAX_SUBSCRIPTIONS,
+)
+from utils.live_feed import SharedPoller, diff_by_key
+from utils.live_state import live_state
+
+
+async def _fetch_live_scores() -> dict[str, dict]:
+    """Refresh the live-score cache entry and key the matches by id.
+
+    Going through vlr_live_score keeps one parser and lets REST callers
+    share the poller's fetch (and vice versa) via request coalescing.
+    """
+    cache_manager.invalidate(CACHE_TTL_LIVE, "live_score")
+    result = await vlr_live_score()
+    return {
+        match.get("match_id") or match.get("match_page", ""): match
+        for match in result["data"]["segments"]
+    }
+
+
+def _live_scores_interval(state: dict[str, dict] | None) -> float:
+    """Poll as fast as the liveliest match needs; slowly when nothing is live."""
+    if not state:
+        return LIVE_STREAM_IDLE_INTERVAL
+    return min(live_state.interval_for(match_id, LIVE_STREAM_POLL_INTERVAL) for match_id in state)
+
+
+live_score_feed = SharedPoller("live_score", _fetch_live_scores, diff_by_key, _live_scores_interval)
+
+
+def format_sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def live_score_events(
+    is_disconnected: Callable[[], Awaitable[bool]],
+    keepalive: float = LIVE_STREAM_KEEPALIVE,
+) -> AsyncIterator[str]:
+    """Yield SSE frames: a ``snapshot`` of all live matches, then ``update``
+    frames carrying only changed matches (and ids of matches no longer live),
+    and an ``error`` frame whenever a poll fails."""
+    queue = live_score_feed.subscribe()
+    try:
+        while not await is_disconnected():
+            try:
+                kind, payload = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if kind == "snapshot":
+                yield format_sse("snapshot", {"segments": list(payload.values())})
+            elif kind == "error":
+                yield format_sse("error", {"message": payload})
+            else:
+                yield format_sse("update", payload)
+    finally:
+        live_score_feed.unsubscribe(queue)
+
+
+class MatchFeedLimitError(Exception):
+    """Raised when subscribing would start more than ``max_feeds`` pollers."""
+
+
+class MatchFeeds:
+    """One SharedPoller per live match, created on first subscription and
+    discarded when its last subscriber leaves.
+
+    Without a fixed ``interval`` each match is polled at the cadence the
+    live-state tracker assigned it on the previous fetch. At most
+    ``max_feeds`` matches are polled at once, across all connections.
+    """
+
+    def __init__(self, interval: float | None = None, max_feeds: int = LIVE_WS_MAX_MATCH_FEEDS) -> None:
+        self.interval = interval
+        self.max_feeds = max_feeds
+        self._feeds: dict[str, SharedPoller] = {}
+
+    def _interval_for(self, match_id: str) -> float | Callable[[dict | None], float]:
+        if self.interval is not None:
+            return self.interval
+        return lambda _state: live_state.interval_for(match_id, LIVE_MATCH_POLL_INTERVAL)
+
+    def subscribe(self, match_id: str) -> asyncio.Queue:
+        feed = self._feeds.get(match_id)
+        if feed is None:
+            if len(self._feeds) >= self.max_feeds:
+                raise MatchFeedLimitError(f"At most {self.max_feeds} matches can be followed at once")
+            feed = self._feeds[match_id] = SharedPoller(
+                f"match:{match_id}",
+                partial(fetch_live_snapshot, match_id),
+                diff_live_snapshots,
+                self._interval_for(match_id),
+            )
+        return feed.subscribe()
+
+    def unsubscribe(self, match_id: str, queue: asyncio.Queue) -> None:
+        feed = self._feeds.get(match_id)
+        if feed is None:
+            return
+        feed.unsubscribe(queue)
+        if feed.subscriber_count == 0:
+            del self._feeds[match_id]
+
+    def active(self) -> list[str]:
+        return list(self._feeds)
+
+    async def stop(self) -> None:
+        feeds, self._feeds = self._feeds, {}
+        for feed in feeds.values():
+            await feed.stop()
+
+
+match_feeds = MatchFeeds()
+
+_WS_USAGE = 'Expected {"action": "subscribe" | "unsubscribe", "match_id": "<numeric id>"}'
+
+
+async def live_match_socket(websocket: WebSocket) -> None:
+    """Serve match subscriptions over one WebSocket.
+
+    Client messages: ``{"action": "subscribe" | "unsubscribe", "match_id": "..."}``.
+    Server messages: ``snapshot`` (full state on subscribe), ``delta`` (only
+    changed fields), ``subscribed`` / ``unsubscribed`` acknowledgements, and
+    ``error``. A subscription is only acknowledged once the match's first
+    snapshot arrives; if that first fetch fails (e.g. an unknown match id)
+    the subscription is dropped with an ``error``. Later poll failures are
+    sent as ``error`` messages while the subscription stays open.
+    """
+    await websocket.accept()
+    send_lock = asyncio.Lock()
+    forwarders: dict[str, tuple[asyncio.Queue, asyncio.Task]] = {}
+    acknowledged: set[str] = set()
+
+    async def send(message: dict) -> None:
+        async with send_lock:
+            await websocket.send_json(message)
+
+    async def forward(match_id: str, queue: asyncio.Queue) -> None:
+        kind, payload = await queue.get()
+        if kind == "error":
+            forwarders.pop(match_id, None)
+            match_feeds.unsubscribe(match_id, queue)
+            await send({"type": "error", "match_id": match_id, "message": payload})
+            return
+        acknowledged.add(match_id)
+        await send({"type": "subscribed", "match_id": match_id})
+        while True:
+            if kind == "snapshot":
+                await send({"type": "snapshot", "match_id": match_id, "data": payload})
+            elif kind == "error":
+                await send({"type": "error", "match_id": match_id, "message": payload})
+            else:
+                await send({"type": "delta", "match_id": match_id, "changes": payload})
+            kind, payload = await queue.get()
+
+    def drop(match_id: str) -> None:
+        acknowledged.discard(match_id)
+        queue, task = forwarders.pop(match_id)
+        task.cancel()
+        match_feeds.unsubscribe(match_id, queue)
+
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                message = {}
+            action = message.get("action")
+            match_id = str(message.get("match_id", ""))
+            if action not in ("subscribe", "unsubscribe") or not match_id.isdigit():
+                await send({"type": "error", "message": _WS_USAGE})
+                continue
+
+            if action == "unsubscribe":
+                if match_id in forwarders:
+                    drop(match_id)
+                await send({"type": "unsubscribed", "match_id": match_id})
+                continue
+
+            if match_id in forwarders:
+                # A subscription still waiting for its first snapshot is acknowledged by its forwarder.
+                if match_id in acknowledged:
+                    await send({"type": "subscribed", "match_id": match_id})
+                continue
+            if len(forwarders) >= LIVE_WS_MAX_SUBSCRIPTIONS:
+                await send({
+                    "type": "error",
+                    "match_id": match_id,
+                    "message": f"At most {LIVE_WS_MAX_SUBSCRIPTIONS} subscriptions per connection",
+                })
+                continue
+            try:
+                queue = match_feeds.subscribe(match_id)
+            except MatchFeedLimitError as exc:
+                await send({"type": "error", "match_id": match_id, "message": str(exc)})
+                continue
+            forwarders[match_id] = (queue, asyncio.create_task(forward(match_id, queue)))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for match_id in list(forwarders):
+            drop(match_id)
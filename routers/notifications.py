@@ -0,0 +1,112 @@
+"""
+Background match event engine feeding webhook subscriptions.
+
+One SharedPoller compares successive live-score and results snapshots; a
+notifier task consumes its updates and delivers them while at least one
+webhook subscription is registered. When the notifier falls behind, the
+feed replaces its backlog with a fresh snapshot, which the notifier diffs
+against the last state it processed so the skipped events still go out.
+"""
+import asyncio
+import contextvars
+import logging
+
+from api.scrapers import vlr_live_score, vlr_match_results
+from utils.constants import WEBHOOK_POLL_INTERVAL
+from utils.live_feed import SharedPoller
+from utils.webhooks import WebhookDelivery, WebhookStore, diff_match_events, diff_match_state, webhook_store
+
+logger = logging.getLogger(__name__)
+
+
+async def _fetch_match_state() -> dict:
+    """Snapshot of live and recently completed matches, keyed by match id."""
+    live = await vlr_live_score()
+    results = await vlr_match_results(num_pages=1)
+    return {
+        "live": {
+            match["match_id"]: {
+                "teams": [match["team1"], match["team2"]],
+                "event": match["match_event"],
+                "score": [match["score1"], match["score2"]],
+            }
+            for match in live["data"]["segments"]
+            if match.get("match_id")
+        },
+        "results": {
+            match["match_id"]: {
+                "teams": [match["team1"], match["team2"]],
+                "event": match["tournament_name"],
+                "score": [match["score1"], match["score2"]],
+            }
+            for match in results["data"]["segments"]
+            if match.get("match_id")
+        },
+    }
+
+
+match_event_feed = SharedPoller("match_events", _fetch_match_state, diff_match_state, WEBHOOK_POLL_INTERVAL)
+
+
+class WebhookNotifier:
+    """Subscribes to the event feed while webhooks exist and delivers each batch."""
+
+    def __init__(self, feed: SharedPoller, store: WebhookStore, delivery: WebhookDelivery) -> None:
+        self.feed = feed
+        self.store = store
+        self.delivery = delivery
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def ensure_running(self) -> None:
+        """Start consuming the feed if there is anyone to notify."""
+        if self.running:
+            return
+        if await asyncio.to_thread(self.store.count) == 0 or self.running:
+            return
+        queue = self.feed.subscribe()
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(queue), name="webhook-notifier", context=contextvars.Context()
+        )
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        seen = None
+        try:
+            while True:
+                kind, payload = await queue.get()
+                if kind == "snapshot":
+                    # The first snapshot is the baseline; later ones replace dropped updates.
+                    events = diff_match_events(seen, payload)
+                    seen = payload
+                elif kind == "update":
+                    events, seen = payload
+                else:
+                    continue
+                if not events:
+                    continue
+                subscriptions = await asyncio.to_thread(self.store.list)
+                if not subscriptions:
+                    return
+                await self.delivery.deliver(subscriptions, events)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Webhook notifier stopped unexpectedly")
+        finally:
+            self.feed.unsubscribe(queue)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+        await self.delivery.close()
+
+
+webhook_notifier = WebhookNotifier(match_event_feed, webhook_store, WebhookDelivery())
@@ -1,6 +1,10 @@
 """
 Shared endpoint handler logic used by both legacy and V2 routers.
 """
+import asyncio
+from collections.abc import AsyncIterator
+from functools import partial
+
 from fastapi import HTTPException
 
 from api.scrapers import (
@@ -13,16 +17,29 @@ from api.scrapers import (
     vlr_match_results,
     vlr_news,
     vlr_player,
+    vlr_player_match_history,
     vlr_player_matches,
     vlr_rankings,
+    vlr_rankings_all,
     vlr_search,
     vlr_stats,
+    vlr_stats_aggregate,
+    vlr_stats_matrix,
     vlr_team,
     vlr_team_matches,
     vlr_team_transactions,
     vlr_upcoming_matches,
     vlr_upcoming_matches_extended,
 )
+from api.scrapers.match_detail import peek_match_detail, to_columnar
+from api.scrapers.players import peek_player
+from api.scrapers.stats import NUMERIC_STATS_FIELDS
+from utils.batch import bounded_as_completed
+from utils.constants import MATCH_BATCH_CONCURRENCY, PLAYER_BATCH_CONCURRENCY
+from utils.error_handling import validate_id_param
+from utils.match_archive import match_archive
+from utils.match_store import match_store
+from utils.rankings_history import rank_deltas, rankings_history
 
 
 def _validate_non_paginated_match_query(
@@ -49,14 +66,83 @@ async def get_news_data() -> dict:
     return await vlr_news()
 
 
-async def get_stats_data(region: str, timespan: str) -> dict:
-    return await vlr_stats(region, timespan)
+async def get_stats_data(
+    region: str,
+    timespan: str,
+    numeric: bool = False,
+    sort: str | None = None,
+    order: str = "desc",
+    limit: int | None = None,
+    min_rounds: int | None = None,
+    agent: str | None = None,
+    org: str | None = None,
+) -> dict:
+    if sort is not None and sort not in NUMERIC_STATS_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort '{sort}'. Valid options: {', '.join(NUMERIC_STATS_FIELDS)}",
+        )
+    return await vlr_stats(
+        region, timespan, numeric=numeric,
+        sort=sort, order=order, limit=limit, min_rounds=min_rounds, agent=agent, org=org,
+    )
+
+
+async def get_stats_matrix_data(
+    regions: list[str], timespans: list[str], numeric: bool = False, dedupe: bool = False
+) -> dict:
+    return await vlr_stats_matrix(regions, timespans, numeric=numeric, dedupe=dedupe)
+
+
+async def get_stats_aggregate_data(
+    region: str, timespan: str, columns: list[str], sections: list[str], players: list[str] | None = None
+) -> dict:
+    return await vlr_stats_aggregate(region, timespan, columns, sections, players)
 
 
 async def get_rankings_data(region: str) -> dict:
     return await vlr_rankings(region)
 
 
+async def get_all_rankings_data() -> dict:
+    return await vlr_rankings_all()
+
+
+async def get_rankings_history_data(region: str, days: int) -> dict:
+    """Rank movement over ``days`` from stored snapshots (no upstream requests).
+
+    An unchanged table only extends its snapshot's ``last_seen``, so the
+    current snapshot is the baseline whenever it already covers the window
+    start. Only when no snapshot is that old and the current one is the oldest
+    is there no baseline: ``baseline_at`` is None and every movement is
+    ``unknown``.
+    """
+    current = await asyncio.to_thread(rankings_history.latest, region)
+    if current is None:
+        raise HTTPException(status_code=404, detail=f"No rankings snapshots stored for region '{region}' yet")
+    start = current["last_seen"] - days * 86400
+    baseline = await asyncio.to_thread(rankings_history.as_of, region, start)
+    if baseline["taken_at"] == current["taken_at"] and baseline["taken_at"] > start:
+        baseline = None
+    rows, dropped = rank_deltas(current["rows"], baseline["rows"] if baseline else None)
+    snapshots = await asyncio.to_thread(rankings_history.count, region)
+    return {
+        "data": {
+            "status": 200,
+            "segments": rows,
+            "meta": {
+                "region": region,
+                "days": days,
+                "current_at": current["taken_at"],
+                "last_seen": current["last_seen"],
+                "baseline_at": baseline["taken_at"] if baseline else None,
+                "snapshots": snapshots,
+                "dropped": dropped,
+            },
+        }
+    }
+
+
 def to_legacy_rankings_shape(data: dict) -> dict:
     """Return the historical rankings response shape used by the legacy route."""
     if "data" in data and "segments" in data["data"]:
@@ -75,8 +161,16 @@ async def get_match_data(
     max_retries: int,
     request_delay: float,
     timeout: int,
+    since_match_id: str | None = None,
 ) -> dict:
     _validate_non_paginated_match_query(q, num_pages, from_page, to_page)
+    if since_match_id is not None:
+        if q != "results":
+            raise HTTPException(
+                status_code=400,
+                detail="since_match_id is only supported for match query 'results'.",
+            )
+        validate_id_param(since_match_id, "since_match_id")
 
     if q == "upcoming":
         return await vlr_upcoming_matches(num_pages, from_page, to_page)
@@ -88,7 +182,7 @@ async def get_match_data(
         return await vlr_live_score(num_pages, from_page, to_page)
     if q == "results":
         return await vlr_match_results(
-            num_pages, from_page, to_page, max_retries, request_delay, timeout
+            num_pages, from_page, to_page, max_retries, request_delay, timeout, since_match_id
         )
     raise ValueError("Invalid query parameter")
 
@@ -103,18 +197,142 @@ async def get_events_data(q: str | None, page: int) -> dict:
     return await vlr_events(upcoming=True, completed=True, page=page)
 
 
-async def get_match_detail_data(match_id: str) -> dict:
-    return await vlr_match_detail(match_id)
+async def get_match_detail_data(
+    match_id: str, include: frozenset[str] | None = None, columnar: bool = False, numeric: bool = False
+) -> dict:
+    result = await vlr_match_detail(match_id, include, numeric=numeric)
+    if columnar and "segments" in result.get("data", {}):
+        return to_columnar(result)
+    return result
+
+
+def _batch_error(id_field: str, item_id: str, code: int, message: str) -> dict:
+    """Per-ID error entry of a batch response, keyed by ``id_field``."""
+    return {id_field: item_id, "status": "error", "code": code, "message": message}
+
+
+def _batch_entry(id_field: str, item_id: str, result: dict, source: str) -> dict:
+    """Per-ID entry of a batch response holding the first segment of ``result``."""
+    inner = result.get("data", {})
+    status = inner.get("status")
+    if isinstance(status, int) and status >= 400:
+        return _batch_error(id_field, item_id, status, inner.get("error", "Upstream request failed"))
+    segments = inner.get("segments") or [{}]
+    return {id_field: item_id, "status": "success", "source": source, "data": segments[0]}
+
+
+async def iter_match_details(
+    match_ids: list[str], include: frozenset[str] | None = None
+) -> AsyncIterator[dict]:
+    """Yield one entry per match ID: cached/archived matches first, then the rest
+    as their scrapes finish. Failures become per-ID error entries."""
+    pending = []
+    for match_id in match_ids:
+        if not match_id.isdigit():
+            yield _batch_error("match_id", match_id, 400, f"Invalid match_id '{match_id}'. Must be a numeric ID.")
+            continue
+        ready = await peek_match_detail(match_id, include)
+        if ready is None:
+            pending.append(match_id)
+        else:
+            yield _batch_entry("match_id", match_id, *ready)
+
+    async def fetch(match_id: str) -> dict:
+        return await vlr_match_detail(match_id, include)
+
+    async for match_id, result, error in bounded_as_completed(pending, fetch, MATCH_BATCH_CONCURRENCY):
+        if error is None:
+            yield _batch_entry("match_id", match_id, result, "upstream")
+        elif isinstance(error, HTTPException):
+            yield _batch_error("match_id", match_id, error.status_code, str(error.detail))
+        else:
+            yield _batch_error("match_id", match_id, 500, "Unexpected error while scraping")
+
+
+async def get_archived_match_data(match_id: str) -> dict:
+    segment = await asyncio.to_thread(match_archive.get, match_id)
+    if segment is None:
+        raise HTTPException(status_code=404, detail=f"Match {match_id} is not archived")
+    return {"data": {"status": 200, "segments": [segment]}}
+
+
+async def get_archived_matches_data(limit: int, offset: int) -> dict:
+    segments = await asyncio.to_thread(match_archive.list, limit, offset)
+    total = await asyncio.to_thread(match_archive.count)
+    return {
+        "data": {
+            "status": 200,
+            "segments": segments,
+            "meta": {"total": total, "limit": limit, "offset": offset},
+        }
+    }
+
+
+async def query_matches_data(filters: dict, sort: str, order: str, limit: int, cursor: str | None) -> dict:
+    try:
+        matches, next_cursor = await asyncio.to_thread(
+            partial(match_store.query, **filters, sort=sort, order=order, limit=limit, cursor=cursor)
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {exc}") from exc
+    return {
+        "data": {
+            "status": 200,
+            "segments": matches,
+            "meta": {"count": len(matches), "limit": limit, "next_cursor": next_cursor},
+        }
+    }
+
+
+async def get_player_data(player_id: str, timespan: str, numeric: bool = False) -> dict:
+    return await vlr_player(player_id, timespan, numeric=numeric)
 
 
-async def get_player_data(player_id: str, timespan: str) -> dict:
-    return await vlr_player(player_id, timespan)
+async def get_players_data(player_ids: list[str], timespan: str, numeric: bool = False) -> dict:
+    """Profiles for several players in request order, one entry per ID.
+
+    Cached profiles are used as they are; the rest are scraped concurrently
+    (``PLAYER_BATCH_CONCURRENCY`` at a time). Failures become per-ID error
+    entries instead of failing the whole response.
+    """
+    entries: dict[str, dict] = {}
+    pending = []
+    for player_id in player_ids:
+        if not player_id.isdigit():
+            entries[player_id] = _batch_error("player_id", player_id, 400, f"Invalid id '{player_id}'. Must be a numeric ID.")
+            continue
+        cached = peek_player(player_id, timespan, numeric)
+        if cached is None:
+            pending.append(player_id)
+        else:
+            entries[player_id] = _batch_entry("player_id", player_id, cached, "cache")
+
+    async def fetch(player_id: str) -> dict:
+        return await vlr_player(player_id, timespan, numeric=numeric)
+
+    async for player_id, result, error in bounded_as_completed(pending, fetch, PLAYER_BATCH_CONCURRENCY):
+        if error is None:
+            entries[player_id] = _batch_entry("player_id", player_id, result, "upstream")
+        elif isinstance(error, HTTPException):
+            entries[player_id] = _batch_error("player_id", player_id, error.status_code, str(error.detail))
+        else:
+            entries[player_id] = _batch_error("player_id", player_id, 500, "Unexpected error while scraping")
+
+    segments = [entries[player_id] for player_id in player_ids]
+    failed = sum(entry["status"] == "error" for entry in segments)
+    return {"data": {"status": 200, "segments": segments, "meta": {"count": len(segments), "failed": failed}}}
 
 
 async def get_player_matches_data(player_id: str, page: int) -> dict:
     return await vlr_player_matches(player_id, page)
 
 
+async def get_player_match_history_data(
+    player_id: str, first_page: int, last_page: int, limit: int | None = None
+) -> dict:
+    return await vlr_player_match_history(player_id, first_page, last_page, limit)
+
+
 async def get_team_data(team_id: str) -> dict:
     return await vlr_team(team_id)
 
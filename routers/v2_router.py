@@ -1,12 +1,21 @@
 """
 V2 API router — standardized responses, validation, Pydantic models.
 """
-from fastapi import APIRouter, HTTPException, Query, Request
+import json
+
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from api.scrapers.stats import NUMERIC_STATS_FIELDS
 from models import V2Response
+from routers.instrumentation import InstrumentedRoute
+from routers.live_streams import live_match_socket, live_score_events
 from routers.shared_handlers import (
+    get_all_rankings_data,
+    get_archived_match_data,
+    get_archived_matches_data,
     get_event_detail_data,
     get_event_matches_data,
     get_events_data,
@@ -15,24 +24,51 @@ from routers.shared_handlers import (
     get_match_detail_data,
     get_news_data,
     get_player_data,
+    get_player_match_history_data,
     get_player_matches_data,
+    get_players_data,
     get_rankings_data,
+    get_rankings_history_data,
     get_search_data,
+    get_stats_aggregate_data,
     get_stats_data,
+    get_stats_matrix_data,
     get_team_data,
     get_team_matches_data,
     get_team_transactions_data,
+    iter_match_details,
+    query_matches_data,
+)
+from utils.cache_manager import cache_manager
+from utils.constants import (
+    MAX_BATCH_MATCH_IDS,
+    MAX_BATCH_PLAYER_IDS,
+    MAX_MATCH_PAGE_WINDOW,
+    MAX_MATCH_QUERY_BOUND,
+    MAX_PAGE_LIMIT,
+    MAX_PLAYER_MATCHES_LIMIT,
+    MIN_PAGE_LIMIT,
+    RATE_LIMIT,
 )
-from utils.constants import MAX_MATCH_QUERY_BOUND, RATE_LIMIT
 from utils.error_handling import (
+    VALID_TIMESPANS,
+    parse_choice_list,
+    parse_match_detail_include,
+    parse_page_range,
+    validate_date_param,
     validate_event_query,
     validate_id_param,
     validate_match_query,
     validate_match_workload,
     validate_player_timespan,
+    validate_region,
+    validate_timespan,
 )
+from utils.match_store import MATCH_STATES, SORT_COLUMNS
+from utils.stats_table import AGGREGATE_SECTIONS
+from utils.utils import region as REGIONS
 
-router = APIRouter(prefix="/v2", tags=["v2"])
+router = APIRouter(prefix="/v2", tags=["v2"], route_class=InstrumentedRoute)
 limiter = Limiter(key_func=get_remote_address)
 
 
@@ -65,13 +101,74 @@ async def v2_stats(
     request: Request,
     region: str = Query(..., description="Region shortname (na, eu, ap, la, etc.)"),
     timespan: str = Query(..., description="Timespan: 30, 60, 90, or all"),
+    numeric: bool = Query(False, description="Return stat values as numbers (null when missing) instead of strings"),
+    sort: str = Query(None, description="Stat column to sort by, e.g. rating, average_combat_score, rounds_played"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="asc or desc"),
+    limit: int = Query(None, ge=MIN_PAGE_LIMIT, le=MAX_PAGE_LIMIT, description="Return at most this many rows"),
+    min_rounds: int = Query(None, ge=0, description="Only players with at least this many rounds played"),
+    agent: str = Query(None, description="Only players who played this agent (e.g. jett)"),
+    org: str = Query(None, description="Only players of this organisation, as shown in the table (case-insensitive)"),
 ):
     """
     Get player statistics for a region and timespan.
 
     Region shortnames: na, eu, ap, la, la-s, la-n, oce, kr, mn, gc, br, cn, jp, col
+
+    `sort`, `limit` and the filters run on the cached table: each stat column
+    is pre-sorted once per cache fill, so a top-N request reads N rows from
+    the index instead of re-sorting the table.
+    """
+    result = await get_stats_data(
+        region, timespan, numeric=numeric,
+        sort=sort, order=order, limit=limit, min_rounds=min_rounds, agent=agent, org=org,
+    )
+    return _wrap_v2(result)
+
+
+@router.get("/stats/matrix", response_model=V2Response)
+@limiter.limit(RATE_LIMIT)
+async def v2_stats_matrix(
+    request: Request,
+    regions: str = Query(None, description="Comma-separated region shortnames (default: all)"),
+    timespans: str = Query(None, description="Comma-separated timespans: 30, 60, 90, all (default: all four)"),
+    numeric: bool = Query(False, description="Return stat values as numbers (null when missing) instead of strings"),
+    dedupe: bool = Query(False, description="Keep one row per player and timespan across regions"),
+):
+    """
+    Get player statistics for several regions and timespans in one request.
+
+    Rows are tagged with `region` and `timespan`. Each region/timespan cell
+    is served from its own cache entry, and missing cells are scraped
+    concurrently; `meta.cells` reports the outcome of each one.
+    """
+    region_keys = parse_choice_list(regions, list(REGIONS), "regions")
+    timespan_keys = parse_choice_list(timespans, sorted(VALID_TIMESPANS), "timespans")
+    result = await get_stats_matrix_data(region_keys, timespan_keys, numeric=numeric, dedupe=dedupe)
+    return _wrap_v2(result)
+
+
+@router.get("/stats/aggregate", response_model=V2Response)
+@limiter.limit(RATE_LIMIT)
+async def v2_stats_aggregate(
+    request: Request,
+    region: str = Query(..., description="Region shortname (na, eu, ap, la, etc.)"),
+    timespan: str = Query(..., description="Timespan: 30, 60, 90, or all"),
+    columns: str = Query(None, description="Comma-separated stat columns (default: every numeric column)"),
+    include: str = Query(None, description="Comma-separated sections: distributions, percentiles, correlations"),
+    players: str = Query(None, description="Comma-separated player names for the percentiles section"),
+):
+    """
+    Get distributions, percentile ranks, z-scores and correlations for a stats table.
+
+    Aggregates are computed once per cached stats table; requests only pick
+    the columns, sections and players they need.
     """
-    result = await get_stats_data(region, timespan)
+    validate_region(region)
+    validate_timespan(timespan)
+    column_keys = parse_choice_list(columns, list(NUMERIC_STATS_FIELDS), "columns")
+    sections = parse_choice_list(include, list(AGGREGATE_SECTIONS), "include")
+    names = [name.strip() for name in players.split(",") if name.strip()] if players else None
+    result = await get_stats_aggregate_data(region, timespan, column_keys, sections, names)
     return _wrap_v2(result)
 
 
@@ -90,6 +187,39 @@ async def v2_rankings(
     return _wrap_v2(result)
 
 
+@router.get("/rankings/all", response_model=V2Response)
+@limiter.limit(RATE_LIMIT)
+async def v2_rankings_all(request: Request):
+    """
+    Get team rankings for every region in one region-tagged table.
+
+    Missing regions are scraped concurrently and the merged table is cached
+    as a whole; `meta.regions` reports the team count or error per region.
+    """
+    result = await get_all_rankings_data()
+    return _wrap_v2(result)
+
+
+@router.get("/rankings/history", response_model=V2Response)
+@limiter.limit(RATE_LIMIT)
+async def v2_rankings_history(
+    request: Request,
+    region: str = Query(..., description="Region shortname (na, eu, ap, la, etc.)"),
+    days: int = Query(7, ge=1, le=365, description="Compare against the rankings in effect this many days ago"),
+):
+    """
+    Get rank movement for a region from locally stored rankings snapshots.
+
+    Snapshots are recorded whenever `/v2/rankings` (or `/v2/rankings/all`)
+    scrapes a region; identical tables are stored once. No upstream request
+    is made. When no snapshot is `days` old, the oldest one is used and
+    `meta.baseline_at` says which.
+    """
+    validate_region(region)
+    result = await get_rankings_history_data(region, days)
+    return _wrap_v2(result)
+
+
 @router.get("/match", response_model=V2Response)
 @limiter.limit(RATE_LIMIT)
 async def v2_match(
@@ -101,6 +231,9 @@ async def v2_match(
     max_retries: int = Query(3, description="Max retry attempts per page", ge=1, le=5),
     request_delay: float = Query(1.0, description="Delay between requests (seconds)", ge=0.5, le=5.0),
     timeout: int = Query(30, description="Request timeout (seconds)", ge=10, le=120),
+    since_match_id: str = Query(
+        None, description="Results only: return matches newer than this match ID and stop paginating there"
+    ),
 ):
     """
     Get match data by type.
@@ -108,7 +241,7 @@ async def v2_match(
     - **upcoming**: Upcoming matches from homepage
     - **upcoming_extended**: Upcoming matches from paginated /matches page
     - **live_score**: Live match scores with detail
-    - **results**: Completed match results
+    - **results**: Completed match results (`since_match_id` for incremental syncs)
     """
     validate_match_query(q)
 
@@ -116,7 +249,7 @@ async def v2_match(
         validate_match_workload(num_pages, from_page, to_page, max_retries, timeout)
 
     result = await get_match_data(
-        q, num_pages, from_page, to_page, max_retries, request_delay, timeout
+        q, num_pages, from_page, to_page, max_retries, request_delay, timeout, since_match_id
     )
 
     return _wrap_v2(result)
@@ -156,16 +289,166 @@ async def v2_events(
 async def v2_match_detail(
     request: Request,
     match_id: str = Query(..., description="VLR.GG match ID"),
+    include: str | None = Query(
+        None,
+        description="Comma-separated components: maps, rounds, performance, economy, h2h (default: all)",
+    ),
+    format: str = Query(
+        "json", pattern="^(json|columnar)$", description="Player stats as rows (json) or per-field columns (columnar)"
+    ),
+    numeric: bool = Query(False, description="Return stat values as numbers (null when missing) instead of strings"),
 ):
     """
     Get detailed match data.
 
     Includes per-map stats (player K/D/A, ACS, rating), round-by-round data,
     head-to-head history, performance tab (kill matrix, advanced stats),
-    and economy tab data.
+    and economy tab data. Use `include` to fetch only some of them; the
+    match header (event, teams, streams, status) is always returned.
+    `format=columnar` returns each team's player stats as one list per field.
+    `numeric=true` returns player and advanced stats as numbers.
+    """
+    validate_id_param(match_id, "match_id")
+    components = parse_match_detail_include(include)
+    result = await get_match_detail_data(
+        match_id, include=components, columnar=format == "columnar", numeric=numeric
+    )
+    return _wrap_v2(result)
+
+
+@router.get("/match/live/stream", response_class=StreamingResponse)
+@limiter.limit(RATE_LIMIT)
+async def v2_live_score_stream(request: Request):
+    """
+    Stream live scores as Server-Sent Events.
+
+    Sends a `snapshot` event with every live match on connect, then `update`
+    events (`{"changed": [...], "removed": [match_id, ...]}`) only when
+    something changes. One shared poller serves all connected clients.
+    """
+    return StreamingResponse(
+        live_score_events(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/match/live/ws")
+async def v2_live_match_ws(websocket: WebSocket):
+    """
+    Round-level live match feed over WebSocket.
+
+    Send `{"action": "subscribe", "match_id": "123"}` (or `unsubscribe`).
+    Each subscription receives a `snapshot` and then `delta` messages with
+    only what changed: new rounds, map and series score changes, and map
+    switches. All subscribers to a match share one upstream poller.
+    """
+    await live_match_socket(websocket)
+
+
+@router.get("/matches/details", response_class=StreamingResponse)
+@limiter.limit(RATE_LIMIT)
+async def v2_match_details_batch(
+    request: Request,
+    ids: str = Query(..., description=f"Comma-separated VLR.GG match IDs (max {MAX_BATCH_MATCH_IDS})"),
+    include: str | None = Query(
+        None,
+        description="Comma-separated components: maps, rounds, performance, economy, h2h (default: all)",
+    ),
+):
+    """
+    Get details for several matches in one request, streamed as NDJSON.
+
+    Each line is `{"match_id", "status": "success", "source", "data"}` or
+    `{"match_id", "status": "error", "code", "message"}`. Matches already in
+    the cache or archive are written first; the rest follow as their scrapes
+    finish, with upstream requests bounded by the shared fetch limiter.
+    """
+    match_ids = list(dict.fromkeys(part.strip() for part in ids.split(",") if part.strip()))
+    if not match_ids:
+        raise HTTPException(status_code=400, detail="ids must list at least one match ID")
+    if len(match_ids) > MAX_BATCH_MATCH_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many match IDs ({len(match_ids)}). Maximum is {MAX_BATCH_MATCH_IDS}.",
+        )
+    components = parse_match_detail_include(include)
+
+    async def lines():
+        async for entry in iter_match_details(match_ids, components):
+            yield json.dumps(entry, separators=(",", ":")) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/archive/match", response_model=V2Response)
+@limiter.limit(RATE_LIMIT)
+async def v2_archive_match(
+    request: Request,
+    match_id: str = Query(..., description="VLR.GG match ID"),
+):
+    """
+    Get an archived completed match without contacting VLR.GG.
+
+    Matches are archived the first time `/v2/match/details` scrapes them in
+    full after they finish. Returns 404 for matches not in the archive.
     """
     validate_id_param(match_id, "match_id")
-    result = await get_match_detail_data(match_id)
+    result = await get_archived_match_data(match_id)
+    return _wrap_v2(result)
+
+
+@router.get("/archive/matches", response_model=V2Response)
+@limiter.limit(RATE_LIMIT)
+async def v2_archive_matches(
+    request: Request,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_LIMIT, description="Entries per page"),
+    offset: int = Query(0, ge=0, description="Entries to skip"),
+):
+    """List archived matches, most recently archived first."""
+    result = await get_archived_matches_data(limit, offset)
+    return _wrap_v2(result)
+
+
+@router.get("/query/matches", response_model=V2Response)
+@limiter.limit(RATE_LIMIT)
+async def v2_query_matches(
+    request: Request,
+    team: str = Query(None, description="Team name (either side, case-insensitive)"),
+    event: str = Query(None, description="Event name (case-insensitive)"),
+    event_id: str = Query(None, description="VLR.GG event ID"),
+    player: str = Query(None, description="Player name seen in the match stat tables"),
+    state: str = Query(None, description="upcoming, live, or completed"),
+    date_from: str = Query(None, description="Earliest match time (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS, UTC)"),
+    date_to: str = Query(None, description="Latest match time, inclusive (same formats)"),
+    sort: str = Query("date", description="Sort key: date or match_id"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="asc or desc"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_LIMIT, description="Matches per page"),
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+):
+    """
+    Query matches from the local match store without contacting VLR.GG.
+
+    The store is filled by the match listing, event match, team match, and
+    match detail endpoints as they scrape, so it only contains matches this
+    instance has seen. Results are keyset-paginated: pass `meta.next_cursor`
+    back as `cursor` for the next page.
+    """
+    if sort not in SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort '{sort}'. Valid options: {', '.join(SORT_COLUMNS)}")
+    if state is not None and state not in MATCH_STATES:
+        raise HTTPException(status_code=400, detail=f"Invalid state '{state}'. Valid options: {', '.join(MATCH_STATES)}")
+    if event_id is not None:
+        validate_id_param(event_id, "event_id")
+    for name, value in (("date_from", date_from), ("date_to", date_to)):
+        if value is not None:
+            validate_date_param(value, name)
+
+    filters = {
+        "team": team, "event": event, "event_id": event_id, "player": player,
+        "state": state, "date_from": date_from, "date_to": date_to,
+    }
+    result = await query_matches_data(filters, sort, order, limit, cursor)
     return _wrap_v2(result)
 
 
@@ -175,6 +458,7 @@ async def v2_player(
     request: Request,
     id: str = Query(..., description="VLR.GG player ID"),
     timespan: str = Query("90d", description="Stats timespan: 30d, 60d, 90d, or all"),
+    numeric: bool = Query(False, description="Return stat values as numbers (null when missing) instead of strings"),
 ):
     """
     Get player profile.
@@ -183,7 +467,36 @@ async def v2_player(
     """
     validate_id_param(id)
     validate_player_timespan(timespan)
-    result = await get_player_data(id, timespan)
+    result = await get_player_data(id, timespan, numeric=numeric)
+    return _wrap_v2(result)
+
+
+@router.get("/players", response_model=V2Response)
+@limiter.limit(RATE_LIMIT)
+async def v2_players(
+    request: Request,
+    ids: str = Query(..., description=f"Comma-separated VLR.GG player IDs (max {MAX_BATCH_PLAYER_IDS})"),
+    timespan: str = Query("90d", description="Stats timespan: 30d, 60d, 90d, or all"),
+    numeric: bool = Query(False, description="Return agent stats as numbers (null when missing) instead of strings"),
+):
+    """
+    Get several player profiles in one request.
+
+    Each entry is `{"player_id", "status": "success", "source", "data"}` or
+    `{"player_id", "status": "error", "code", "message"}`, in request order.
+    Cached profiles are served directly and the rest are scraped concurrently;
+    one failing ID does not fail the others.
+    """
+    player_ids = list(dict.fromkeys(part.strip() for part in ids.split(",") if part.strip()))
+    if not player_ids:
+        raise HTTPException(status_code=400, detail="ids must list at least one player ID")
+    if len(player_ids) > MAX_BATCH_PLAYER_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many player IDs ({len(player_ids)}). Maximum is {MAX_BATCH_PLAYER_IDS}.",
+        )
+    validate_player_timespan(timespan)
+    result = await get_players_data(player_ids, timespan, numeric=numeric)
     return _wrap_v2(result)
 
 
@@ -193,10 +506,28 @@ async def v2_player_matches(
     request: Request,
     id: str = Query(..., description="VLR.GG player ID"),
     page: int = Query(1, description="Page number (1-based)", ge=1, le=100),
+    pages: str = Query(None, description="Page range to merge, e.g. 1-10 (max 20 pages)"),
+    limit: int = Query(None, ge=1, le=MAX_PLAYER_MATCHES_LIMIT, description="Merge pages until this many matches"),
 ):
-    """Get paginated match history for a player."""
+    """
+    Get paginated match history for a player.
+
+    With `pages` or `limit`, several pages are fetched concurrently (each one
+    cached on its own) and merged in order, stopping at the first empty page;
+    `limit` alone reads up to 20 pages starting at `page`.
+    """
     validate_id_param(id)
-    result = await get_player_matches_data(id, page)
+    if pages is None and limit is None:
+        result = await get_player_matches_data(id, page)
+        return _wrap_v2(result)
+
+    if pages is not None:
+        if page != 1:
+            raise HTTPException(status_code=400, detail="Use either page or pages, not both")
+        first_page, last_page = parse_page_range(pages)
+    else:
+        first_page, last_page = page, page + MAX_MATCH_PAGE_WINDOW - 1
+    result = await get_player_match_history_data(id, first_page, last_page, limit)
     return _wrap_v2(result)
 
 
@@ -304,3 +635,19 @@ async def v2_health():
     """Check API health and runtime readiness."""
     result = await get_health_data()
     return {"status": "success", "data": result}
+
+
+@router.get("/meta/cache", response_model=V2Response)
+@limiter.limit(RATE_LIMIT)
+async def v2_meta_cache(
+    request: Request,
+    sizes: bool = Query(False, description="Include approximate byte sizes (walks every cached entry)"),
+):
+    """
+    Inspect the in-memory response cache.
+
+    Returns hit/miss/fill counters and entry counts per TTL bucket, coalesced
+    waiter counts and producer latencies per scraper, and, with `sizes=true`,
+    approximate byte sizes.
+    """
+    return {"status": "success", "data": cache_manager.stats(include_sizes=sizes)}
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Query, Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from routers.instrumentation import InstrumentedRoute
 from routers.shared_handlers import (
     get_event_matches_data,
     get_events_data,
@@ -28,7 +29,7 @@ from utils.error_handling import (
     validate_player_timespan,
 )
 
-router = APIRouter(tags=["Default"])
+router = APIRouter(tags=["Default"], route_class=InstrumentedRoute)
 limiter = Limiter(key_func=get_remote_address)
 
 
@@ -2,6 +2,11 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 
 from main import app
+from utils.live_state import live_state
+from utils.match_archive import match_archive
+from utils.match_store import match_store
+from utils.rankings_history import rankings_history
+from utils.webhooks import webhook_store
 
 
 @pytest.fixture
@@ -9,6 +14,23 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path, monkeypatch):
+    """Point the SQLite stores at a per-test directory and forget live state."""
+    monkeypatch.setenv("VLRGGAPI_DATA_DIR", str(tmp_path))
+    match_archive.reset()
+    match_store.reset()
+    webhook_store.reset()
+    rankings_history.reset()
+    live_state.clear()
+    yield
+    match_archive.reset()
+    match_store.reset()
+    webhook_store.reset()
+    rankings_history.reset()
+    live_state.clear()
+
+
 @pytest.fixture
 async def async_client():
     transport = ASGITransport(app=app)
@@ -3,6 +3,9 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 
 from main import app
+from utils.cache_manager import cache_manager
+from utils.constants import CACHE_TTL_NEWS
+from utils.match_archive import match_archive
 
 
 @pytest.fixture
@@ -48,6 +51,13 @@ async def test_v2_invalid_timespan_returns_400(client):
     assert resp.status_code == 400
 
 
+@pytest.mark.anyio
+@pytest.mark.parametrize("query", ["pages=5-2", "pages=1-50", "pages=abc", "pages=1-3&page=2"])
+async def test_v2_player_matches_rejects_invalid_page_ranges(client, query):
+    resp = await client.get(f"/v2/player/matches?id=9&{query}")
+    assert resp.status_code == 400
+
+
 @pytest.mark.anyio
 async def test_v2_invalid_event_query_returns_400(client):
     resp = await client.get("/v2/events?q=bad_query")
@@ -91,7 +101,7 @@ async def test_original_match_detail_rejects_invalid_id(client):
 
 @pytest.mark.anyio
 async def test_v2_match_detail_exposes_team_ids(client, monkeypatch):
-    async def fake_match_detail(match_id):
+    async def fake_match_detail(match_id, include=None, columnar=False, numeric=False):
         return {
             "data": {
                 "status": 200,
@@ -171,7 +181,7 @@ async def test_v2_events_propagates_scraper_error_status(client, monkeypatch):
 
 @pytest.mark.anyio
 async def test_v2_player_propagates_scraper_error_status(client, monkeypatch):
-    async def fake_player(player_id, timespan):
+    async def fake_player(player_id, timespan, numeric=False):
         return {
             "data": {
                 "status": 404,
@@ -188,12 +198,92 @@ async def test_v2_player_propagates_scraper_error_status(client, monkeypatch):
     assert resp.json()["detail"] == "player 9 not found"
 
 
+@pytest.mark.anyio
+async def test_v2_stats_rejects_unknown_sort_column(client):
+    resp = await client.get("/v2/stats?region=na&timespan=30&sort=vibes")
+    assert resp.status_code == 400
+    assert "rating" in resp.json()["detail"]
+
+
+@pytest.mark.anyio
+async def test_v2_stats_matrix_validates_and_expands_lists(client, monkeypatch):
+    seen = {}
+
+    async def fake_matrix(regions, timespans, numeric=False, dedupe=False):
+        seen.update(regions=regions, timespans=timespans, dedupe=dedupe)
+        return {"data": {"status": 200, "segments": [], "meta": {"count": 0, "cells": []}}}
+
+    monkeypatch.setattr("routers.v2_router.get_stats_matrix_data", fake_matrix)
+
+    resp = await client.get("/v2/stats/matrix?regions=EU,na,eu&dedupe=true")
+    assert resp.status_code == 200
+    assert seen == {"regions": ["eu", "na"], "timespans": ["30", "60", "90", "all"], "dedupe": True}
+
+    resp = await client.get("/v2/stats/matrix?regions=na,mars")
+    assert resp.status_code == 400
+    assert "mars" in resp.json()["detail"]
+
+
+@pytest.mark.anyio
+async def test_v2_stats_aggregate_rejects_unknown_column_and_section(client):
+    resp = await client.get("/v2/stats/aggregate?region=na&timespan=30&columns=rating,vibes")
+    assert resp.status_code == 400
+    assert "vibes" in resp.json()["detail"]
+
+    resp = await client.get("/v2/stats/aggregate?region=na&timespan=30&include=histograms")
+    assert resp.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_v2_rankings_all_propagates_total_failure(client, monkeypatch):
+    async def fake_all():
+        return {"data": {"status": 503, "error": "rankings unavailable", "segments": []}}
+
+    monkeypatch.setattr("routers.v2_router.get_all_rankings_data", fake_all)
+
+    resp = await client.get("/v2/rankings/all")
+    assert resp.status_code == 503
+    assert resp.json()["detail"] == "rankings unavailable"
+
+
+@pytest.mark.anyio
+async def test_v2_players_validates_ids_and_timespan(client):
+    resp = await client.get("/v2/players?ids=" + ",".join(str(n) for n in range(1, 27)))
+    assert resp.status_code == 400
+    assert "Maximum is 25" in resp.json()["detail"]
+
+    resp = await client.get("/v2/players?ids=,")
+    assert resp.status_code == 400
+
+    resp = await client.get("/v2/players?ids=1,2&timespan=7d")
+    assert resp.status_code == 400
+
+
 @pytest.mark.anyio
 async def test_v2_match_rejects_oversized_workload(client):
     resp = await client.get("/v2/match?q=results&num_pages=21")
     assert resp.status_code == 400
 
 
+@pytest.mark.anyio
+async def test_v2_match_since_match_id_is_validated_and_passed_through(client, monkeypatch):
+    captured = {}
+
+    async def fake_results(num_pages, from_page, to_page, max_retries, request_delay, timeout, since_match_id):
+        captured["since_match_id"] = since_match_id
+        return {"data": {"status": 200, "segments": []}}
+
+    monkeypatch.setattr("routers.shared_handlers.vlr_match_results", fake_results)
+
+    resp = await client.get("/v2/match?q=results&num_pages=5&since_match_id=12345")
+    assert resp.status_code == 200
+    assert captured["since_match_id"] == "12345"
+
+    assert (await client.get("/v2/match?q=results&since_match_id=abc")).status_code == 400
+    assert (await client.get("/v2/match?q=upcoming&since_match_id=1")).status_code == 400
+
+
+
 @pytest.mark.anyio
 async def test_v2_match_rejects_pagination_for_upcoming_query(client):
     resp = await client.get("/v2/match?q=upcoming&num_pages=2")
@@ -204,3 +294,326 @@ async def test_v2_match_rejects_pagination_for_upcoming_query(client):
 async def test_original_match_rejects_pagination_for_live_score_query(client):
     resp = await client.get("/match?q=live_score&from_page=2")
     assert resp.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_v2_meta_cache_reports_buckets(client):
+    cache_manager.clear_all()
+    cache_manager.set(60, {"data": {"status": 200, "segments": []}}, "news")
+
+    resp = await client.get("/v2/meta/cache")
+
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data["totals"]["entries"] == 1
+    assert data["buckets"][0]["ttl"] == 60
+    assert "bytes" not in data["buckets"][0]
+
+    sized = (await client.get("/v2/meta/cache?sizes=true")).json()["data"]
+    assert sized["buckets"][0]["bytes"] > 0
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint_serves_prometheus_text(client):
+    await client.get("/v2/meta/cache")
+
+    resp = await client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'vlrgg_http_requests_total{method="GET",route="/v2/meta/cache",status="200"}' in resp.text
+    assert 'vlrgg_response_serialization_seconds_count{route="/v2/meta/cache"}' in resp.text
+
+
+@pytest.mark.anyio
+async def test_server_timing_header_reports_cache_and_scraper_phases(client):
+    cache_manager.clear_all()
+    cache_manager.set(CACHE_TTL_NEWS, {"data": {"status": 200, "segments": []}}, "news")
+
+    resp = await client.get("/v2/news")
+
+    assert resp.status_code == 200
+    timing = resp.headers["server-timing"]
+    assert 'cache;desc="hit=1 miss=0"' in timing
+    assert "scraper;dur=" in timing
+    assert "total;dur=" in timing
+    assert resp.json()["meta"] is None
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_debug_timing_header_adds_meta_timing(client):
+    cache_manager.clear_all()
+    cache_manager.set(CACHE_TTL_NEWS, {"data": {"status": 200, "segments": []}}, "news")
+
+    resp = await client.get("/v2/news", headers={"X-Debug-Timing": "1"})
+
+    timing = resp.json()["meta"]["timing"]
+    assert timing["phases"]["cache"] == {"hits": 1, "misses": 0}
+    assert timing["phases"]["scraper"]["count"] == 1
+    assert timing["total_ms"] >= 0
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_admin_routes_hidden_without_configured_token(client, monkeypatch):
+    monkeypatch.delenv("VLRGGAPI_ADMIN_TOKEN", raising=False)
+
+    resp = await client.get("/v2/admin/profile?seconds=0.01")
+
+    assert resp.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_admin_routes_reject_wrong_token(client, monkeypatch):
+    monkeypatch.setenv("VLRGGAPI_ADMIN_TOKEN", "secret")
+
+    resp = await client.get("/v2/admin/profile?seconds=0.01", headers={"X-Admin-Token": "nope"})
+
+    assert resp.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_admin_profile_returns_grouped_stacks(client, monkeypatch):
+    monkeypatch.setenv("VLRGGAPI_ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+
+    resp = await client.get("/v2/admin/profile?seconds=0.05&interval_ms=5", headers=headers)
+
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data["samples"] >= 1
+    assert data["groups"]
+
+    resp = await client.get("/v2/admin/profile?seconds=0.02&format=collapsed", headers=headers)
+
+    assert resp.status_code == 200
+    line = resp.text.splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+@pytest.mark.anyio
+async def test_admin_heap_snapshot_groups_by_module(client, monkeypatch):
+    monkeypatch.setenv("VLRGGAPI_ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+    cache_manager.clear_all()
+    try:
+        resp = await client.post("/v2/admin/heap/start?frames=5", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["data"]["tracing"] is True
+
+        cache_manager.set(CACHE_TTL_NEWS, {"data": {"status": 200, "segments": ["x" * 1000]}}, "news")
+        resp = await client.get("/v2/admin/heap?top=5", headers=headers)
+
+        data = resp.json()["data"]
+        assert data["cache_bytes"] > 1000
+        assert data["groups"]
+        assert all("delta_bytes" in entry for entry in data["groups"].values())
+        assert len(data["top_growth"]) <= 5
+        assert data["frames"] == 5
+
+        # Restarting with another depth applies it instead of keeping the old one.
+        resp = await client.post("/v2/admin/heap/start?frames=7", headers=headers)
+        assert resp.json()["data"]["frames"] == 7
+    finally:
+        resp = await client.post("/v2/admin/heap/stop", headers=headers)
+        cache_manager.clear_all()
+
+    assert resp.json()["data"]["tracing"] is False
+    assert "groups" not in resp.json()["data"]
+
+
+@pytest.mark.anyio
+async def test_admin_webhooks_register_list_and_delete(client, monkeypatch):
+    from routers.notifications import webhook_notifier
+
+    monkeypatch.setenv("VLRGGAPI_ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+    started = []
+
+    async def ensure_running():
+        started.append(True)
+
+    monkeypatch.setattr(webhook_notifier, "ensure_running", ensure_running)
+
+    resp = await client.post(
+        "/v2/admin/webhooks",
+        json={"url": "http://sink.test/hook", "events": ["match_completed"], "secret": "s3"},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    subscription = resp.json()["data"]
+    assert subscription["events"] == ["match_completed"]
+    assert subscription["signed"] is True
+    assert "secret" not in subscription
+    assert started == [True]
+
+    bad = await client.post("/v2/admin/webhooks", json={"url": "http://x", "events": ["nope"]}, headers=headers)
+    assert bad.status_code == 400
+
+    listed = (await client.get("/v2/admin/webhooks", headers=headers)).json()["data"]
+    assert [entry["id"] for entry in listed["subscriptions"]] == [subscription["id"]]
+
+    resp = await client.delete(f"/v2/admin/webhooks/{subscription['id']}", headers=headers)
+    assert resp.status_code == 200
+    assert (await client.delete(f"/v2/admin/webhooks/{subscription['id']}", headers=headers)).status_code == 404
+
+
+@pytest.mark.anyio
+async def test_v2_match_detail_rejects_unknown_include(client):
+    resp = await client.get("/v2/match/details?match_id=123&include=maps,bogus")
+
+    assert resp.status_code == 400
+    assert "bogus" in resp.json()["detail"]
+
+
+@pytest.mark.anyio
+async def test_v2_archive_endpoints(client):
+    resp = await client.get("/v2/archive/match?match_id=42")
+    assert resp.status_code == 404
+
+    match_archive.put({"match_id": "42", "event": {"name": "Masters"}, "date": "today", "teams": []})
+
+    resp = await client.get("/v2/archive/match?match_id=42")
+    assert resp.status_code == 200
+    assert resp.json()["data"]["segments"][0]["event"] == {"name": "Masters"}
+
+    resp = await client.get("/v2/archive/matches?limit=10")
+    data = resp.json()["data"]
+    assert data["meta"]["total"] == 1
+    assert data["segments"][0]["match_id"] == "42"
+
+
+@pytest.mark.anyio
+async def test_v2_match_details_batch_streams_per_id_results(client, monkeypatch):
+    import json
+
+    from fastapi import HTTPException
+
+    cache_manager.clear_all()
+    match_archive.put({"match_id": "1", "status": "final", "teams": []})
+
+    async def fake_match_detail(match_id, include=None):
+        if match_id == "3":
+            raise HTTPException(status_code=502, detail="upstream down")
+        return {"data": {"status": 200, "segments": [{"match_id": match_id}]}}
+
+    monkeypatch.setattr("routers.shared_handlers.vlr_match_detail", fake_match_detail)
+
+    resp = await client.get("/v2/matches/details?ids=1,2,3,abc,2")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    entries = [json.loads(line) for line in resp.text.splitlines()]
+    by_id = {entry["match_id"]: entry for entry in entries}
+    assert entries[0]["match_id"] == "1"
+    assert by_id["1"]["source"] == "archive"
+    assert by_id["2"] == {"match_id": "2", "status": "success", "source": "upstream", "data": {"match_id": "2"}}
+    assert by_id["3"] == {"match_id": "3", "status": "error", "code": 502, "message": "upstream down"}
+    assert by_id["abc"]["code"] == 400
+    assert len(entries) == 4
+
+
+@pytest.mark.anyio
+async def test_v2_match_details_batch_rejects_oversized_batches(client):
+    ids = ",".join(str(i) for i in range(1, 27))
+
+    resp = await client.get(f"/v2/matches/details?ids={ids}")
+
+    assert resp.status_code == 400
+
+
+def test_v2_live_match_websocket_sends_snapshot_then_deltas(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from routers import live_streams
+
+    snapshots = iter([
+        {"status": "LIVE", "score": ["0", "0"], "maps": []},
+        {"status": "LIVE", "score": ["1", "0"], "maps": []},
+    ])
+    last = {"status": "LIVE", "score": ["1", "0"], "maps": []}
+
+    async def fake_snapshot(match_id):
+        return next(snapshots, last)
+
+    def fake_diff(previous, current):
+        return {"score": current["score"]} if previous["score"] != current["score"] else None
+
+    monkeypatch.setattr(live_streams, "fetch_live_snapshot", fake_snapshot)
+    monkeypatch.setattr(live_streams, "diff_live_snapshots", fake_diff)
+    monkeypatch.setattr(live_streams, "match_feeds", live_streams.MatchFeeds(interval=0.01))
+
+    with TestClient(app) as test_client, test_client.websocket_connect("/v2/match/live/ws") as ws:
+        ws.send_json({"action": "nope"})
+        assert ws.receive_json()["type"] == "error"
+
+        ws.send_json({"action": "subscribe", "match_id": "42"})
+        messages = [ws.receive_json() for _ in range(3)]
+        by_type = {message["type"]: message for message in messages}
+        assert by_type["subscribed"] == {"type": "subscribed", "match_id": "42"}
+        assert by_type["snapshot"]["data"]["score"] == ["0", "0"]
+        assert by_type["delta"] == {"type": "delta", "match_id": "42", "changes": {"score": ["1", "0"]}}
+        assert live_streams.match_feeds.active() == ["42"]
+
+        ws.send_json({"action": "unsubscribe", "match_id": "42"})
+        assert ws.receive_json() == {"type": "unsubscribed", "match_id": "42"}
+        assert live_streams.match_feeds.active() == []
+
+
+def test_v2_live_match_websocket_rejects_unknown_matches_and_reports_poll_failures(monkeypatch):
+    from fastapi import HTTPException
+    from fastapi.testclient import TestClient
+
+    from routers import live_streams
+
+    polls = {"7": 0}
+
+    async def fake_snapshot(match_id):
+        if match_id == "404":
+            raise HTTPException(status_code=404, detail="VLR.GG returned status 404 for match detail 404")
+        polls[match_id] += 1
+        if polls[match_id] == 2:
+            raise HTTPException(status_code=503, detail="VLR.GG returned status 503 for match detail 7")
+        return {"status": "LIVE", "score": ["0", "0"], "maps": []}
+
+    monkeypatch.setattr(live_streams, "fetch_live_snapshot", fake_snapshot)
+    monkeypatch.setattr(live_streams, "match_feeds", live_streams.MatchFeeds(interval=0.01, max_feeds=1))
+
+    with TestClient(app) as test_client, test_client.websocket_connect("/v2/match/live/ws") as ws:
+        ws.send_json({"action": "subscribe", "match_id": "404"})
+        assert ws.receive_json() == {
+            "type": "error", "match_id": "404", "message": "VLR.GG returned status 404 for match detail 404"
+        }
+        assert live_streams.match_feeds.active() == []
+
+        ws.send_json({"action": "subscribe", "match_id": "7"})
+        assert [ws.receive_json()["type"] for _ in range(3)] == ["subscribed", "snapshot", "error"]
+
+        ws.send_json({"action": "subscribe", "match_id": "8"})
+        rejected = ws.receive_json()
+        assert (rejected["type"], rejected["match_id"]) == ("error", "8")
+        assert "At most 1 matches" in rejected["message"]
+        assert live_streams.match_feeds.active() == ["7"]
+
+
+@pytest.mark.anyio
+async def test_v2_query_matches_reads_local_store(client):
+    from utils.match_store import match_store
+
+    match_store.upsert([
+        {"match_id": "1", "match_time": "2026-01-01 10:00:00", "team1": "Alpha", "team2": "Beta", "state": "completed"},
+        {"match_id": "2", "match_time": "2026-01-02 10:00:00", "team1": "Beta", "team2": "Gamma", "state": "upcoming"},
+    ])
+
+    resp = await client.get("/v2/query/matches?team=beta&limit=1")
+    assert resp.status_code == 200
+    body = resp.json()["data"]
+    assert [match["match_id"] for match in body["segments"]] == ["2"]
+    next_page = await client.get(f"/v2/query/matches?team=beta&limit=1&cursor={body['meta']['next_cursor']}")
+    assert [match["match_id"] for match in next_page.json()["data"]["segments"]] == ["1"]
+
+    assert (await client.get("/v2/query/matches?state=finished")).status_code == 400
+    assert (await client.get("/v2/query/matches?date_from=yesterday")).status_code == 400
+    assert (await client.get("/v2/query/matches?cursor=%%%")).status_code == 400
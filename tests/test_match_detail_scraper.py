@@ -2,8 +2,10 @@ import asyncio
 
 import pytest
 
-from api.scrapers.match_detail import vlr_match_detail
+from api.scrapers.match_detail import to_numeric, vlr_match_detail
 from utils.cache_manager import cache_manager
+from utils.live_state import live_state
+from utils.match_archive import match_archive
 
 PLAYER_ROW = """
 <tr>
@@ -264,3 +266,340 @@ async def test_vlr_match_detail_uses_empty_team_id_when_header_link_is_missing(m
     assert teams[0]["id"] == "100"
     assert teams[1]["id"] == ""
     cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_match_detail_include_fetches_only_missing_components(monkeypatch):
+    cache_manager.clear_all()
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg/555": [FakeResponse(200, BASE_MATCH_HTML)],
+            "https://www.vlr.gg/555/?game=game-1&tab=performance": [FakeResponse(200, performance_html("Opponent A"))],
+            "https://www.vlr.gg/555/?game=game-2&tab=performance": [FakeResponse(200, performance_html("Opponent B"))],
+        }
+    )
+
+    monkeypatch.setattr("api.scrapers.match_detail.get_http_client", lambda: client)
+
+    data = await vlr_match_detail("555", {"maps"})
+    segment = data["data"]["segments"][0]
+
+    assert [call[0] for call in client.calls] == ["https://www.vlr.gg/555"]
+    assert segment["teams"][0]["name"] == "Team One"
+    assert [map_data["map_name"] for map_data in segment["maps"]] == ["Ascent", "Bind"]
+    assert "rounds" not in segment["maps"][0]
+    assert "performance" not in segment
+    assert "economy" not in segment
+    assert "head_to_head" not in segment
+
+    data = await vlr_match_detail("555", {"maps", "performance"})
+    segment = data["data"]["segments"][0]
+
+    assert [call[0] for call in client.calls[1:]] == [
+        "https://www.vlr.gg/555/?game=game-1&tab=performance",
+        "https://www.vlr.gg/555/?game=game-2&tab=performance",
+    ]
+    assert segment["maps"][1]["performance"]["kill_matrix"] == [{"player": "TenZ", "kills_vs": {"Opponent B": "5"}}]
+    assert "economy" not in segment["maps"][1]
+
+    await vlr_match_detail("555", {"performance"})
+    assert len(client.calls) == 3
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_match_detail_rounds_implies_maps(monkeypatch):
+    cache_manager.clear_all()
+    client = FakeAsyncClient({"https://www.vlr.gg/555": [FakeResponse(200, BASE_MATCH_HTML)]})
+
+    monkeypatch.setattr("api.scrapers.match_detail.get_http_client", lambda: client)
+
+    data = await vlr_match_detail("555", {"rounds"})
+    segment = data["data"]["segments"][0]
+
+    assert [map_data["rounds"] for map_data in segment["maps"]] == [[], []]
+    assert len(client.calls) == 1
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_match_detail_live_poll_refetches_only_base_page_and_live_map(monkeypatch):
+    cache_manager.clear_all()
+    live_html = BASE_MATCH_HTML.replace(
+        "<html>", '<html><div class="match-header-vs-note">LIVE</div>', 1
+    ).replace(
+        '<div class="score">10</div>', '<div class="score">12</div>', 1
+    )
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg/555": [FakeResponse(200, live_html), FakeResponse(200, live_html)],
+            "https://www.vlr.gg/555/?game=game-1&tab=performance": [FakeResponse(200, performance_html("A"))],
+            "https://www.vlr.gg/555/?game=game-1&tab=economy": [FakeResponse(200, economy_html("One"))],
+            "https://www.vlr.gg/555/?game=game-2&tab=performance": [
+                FakeResponse(200, performance_html("B")),
+                FakeResponse(200, performance_html("B2")),
+            ],
+            "https://www.vlr.gg/555/?game=game-2&tab=economy": [
+                FakeResponse(200, economy_html("Two")),
+                FakeResponse(200, economy_html("Two2")),
+            ],
+        }
+    )
+
+    monkeypatch.setattr("api.scrapers.match_detail.get_http_client", lambda: client)
+
+    await vlr_match_detail("555")
+    assert len(client.calls) == 5
+
+    # Simulate the live cadence TTL expiring.
+    assert live_state.cadence("555").state == "active"
+    cache_manager._get_cache(live_state.cadence("555").ttl).clear()
+    data = await vlr_match_detail("555")
+    segment = data["data"]["segments"][0]
+
+    assert [call[0] for call in client.calls[5:]] == [
+        "https://www.vlr.gg/555",
+        "https://www.vlr.gg/555/?game=game-2&tab=performance",
+        "https://www.vlr.gg/555/?game=game-2&tab=economy",
+    ]
+    assert segment["economy_by_map"] == [
+        {"game_id": "game-1", "rows": [{"Team": "One", "Pistol": "50%"}]},
+        {"game_id": "game-2", "rows": [{"Team": "Two2", "Pistol": "50%"}]},
+    ]
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_match_detail_archives_final_matches_and_serves_them_offline(monkeypatch):
+    cache_manager.clear_all()
+    final_html = BASE_MATCH_HTML.replace("<html>", '<html><div class="match-header-vs-note">final</div>', 1)
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg/555": [FakeResponse(200, final_html)],
+            "https://www.vlr.gg/555/?game=game-1&tab=performance": [FakeResponse(200, performance_html("A"))],
+            "https://www.vlr.gg/555/?game=game-1&tab=economy": [FakeResponse(200, economy_html("One"))],
+            "https://www.vlr.gg/555/?game=game-2&tab=performance": [FakeResponse(200, performance_html("B"))],
+            "https://www.vlr.gg/555/?game=game-2&tab=economy": [FakeResponse(200, economy_html("Two"))],
+        }
+    )
+    monkeypatch.setattr("api.scrapers.match_detail.get_http_client", lambda: client)
+
+    full = await vlr_match_detail("555")
+    assert match_archive.get("555") == full["data"]["segments"][0]
+
+    cache_manager.clear_all()
+    offline = FakeAsyncClient({})
+    monkeypatch.setattr("api.scrapers.match_detail.get_http_client", lambda: offline)
+
+    data = await vlr_match_detail("555", {"maps"})
+    segment = data["data"]["segments"][0]
+
+    assert offline.calls == []
+    assert segment["teams"] == full["data"]["segments"][0]["teams"]
+    assert set(segment["maps"][0]) == {
+        "map_name", "picked_by", "duration", "score", "score_ct", "score_t", "score_ot", "players",
+    }
+    assert "economy_by_map" not in segment
+    assert (await vlr_match_detail("555")) == full
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_match_detail_does_not_archive_when_a_tab_fetch_failed(monkeypatch):
+    cache_manager.clear_all()
+    final_html = BASE_MATCH_HTML.replace("<html>", '<html><div class="match-header-vs-note">final</div>', 1)
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg/555": [FakeResponse(200, final_html)],
+            "https://www.vlr.gg/555/?game=game-1&tab=performance": [FakeResponse(200, performance_html("A"))],
+            "https://www.vlr.gg/555/?game=game-1&tab=economy": [FakeResponse(200, economy_html("One"))],
+            "https://www.vlr.gg/555/?game=game-2&tab=performance": [FakeResponse(200, performance_html("B"))],
+            "https://www.vlr.gg/555/?game=game-2&tab=economy": [],
+        }
+    )
+    monkeypatch.setattr("api.scrapers.match_detail.get_http_client", lambda: client)
+
+    await vlr_match_detail("555")
+
+    assert match_archive.get("555") is None
+    cache_manager.clear_all()
+
+
+def _live_snapshot(score, rounds, current="game-1", status="LIVE"):
+    return {
+        "status": status,
+        "live": status == "LIVE",
+        "score": score,
+        "current_game_id": current,
+        "maps": [
+            {"game_id": "game-1", "map_name": "Ascent", "score": {"team1": len(rounds), "team2": 0}, "rounds": rounds},
+        ],
+    }
+
+
+def test_diff_live_snapshots_reports_only_changed_fields():
+    from api.scrapers.match_detail import diff_live_snapshots
+
+    first_round = {"round_num": 1, "winner": "team1", "side": "ct"}
+    second_round = {"round_num": 2, "winner": "team1", "side": "ct"}
+    before = _live_snapshot(["0", "0"], [first_round])
+
+    assert diff_live_snapshots(before, _live_snapshot(["0", "0"], [first_round])) is None
+    assert diff_live_snapshots(before, _live_snapshot(["0", "0"], [first_round, second_round])) == {
+        "maps": [{"game_id": "game-1", "map_name": "Ascent", "score": {"team1": 2, "team2": 0}}],
+        "rounds": [{"game_id": "game-1", **second_round}],
+    }
+
+    finished = _live_snapshot(["1", "0"], [first_round], current=None, status="final")
+    changes = diff_live_snapshots(before, finished)
+    assert changes["status"] == {"status": "final", "live": False}
+    assert changes["score"] == ["1", "0"]
+    assert changes["map"] == {"game_id": None, "map_name": ""}
+    assert "rounds" not in changes
+
+
+def test_player_rows_are_cached_as_records_and_expand_to_rows_or_columns():
+    from api.scrapers.match_detail import PlayerStats, _assemble_segment, _parse_map_players, to_columnar
+    from utils.html_parsers import parse_html
+
+    values = ["1.20", "250", "20", "15", "5", "+5", "75%", "160", "30%", "3", "2", "+1"]
+    cells = "".join(f"<td>{value}</td>" for value in values)
+    game = parse_html(
+        '<div class="vm-stats-game"><table class="wf-table-inset mod-overview"><tbody><tr>'
+        '<td><div class="text-of">aspas</div></td><td><img title="Jett"></td>'
+        f"{cells}</tr></tbody></table></div>"
+    ).css_first(".vm-stats-game")
+
+    players = _parse_map_players(game)
+    assert players["team1"] == [
+        PlayerStats("aspas", "Jett", "1.20", "250", "20", "15", "5", "+5", "75%", "160", "30%", "3", "2", "+1")
+    ]
+
+    header = {
+        "game_ids": ["g1"], "event": {}, "date": "", "map_vetos": "", "status": "",
+        "teams": [], "streams": [], "vods": [],
+    }
+    maps = [{"map_name": "Bind", "players": players}]
+    segment = _assemble_segment("1", {"header": header, "maps": maps}, frozenset({"maps"}))
+    assert segment["maps"][0]["players"]["team1"][0]["acs"] == "250"
+    assert segment["maps"][0]["players"]["team2"] == []
+
+    columnar = to_columnar({"data": {"status": 200, "segments": [segment]}})
+    columns = columnar["data"]["segments"][0]["maps"][0]["players"]["team1"]
+    assert columns["name"] == ["aspas"] and columns["rating"] == ["1.20"]
+    assert segment["maps"][0]["players"]["team1"][0]["name"] == "aspas"
+
+
+@pytest.mark.anyio
+async def test_vlr_match_detail_numeric_types_player_and_advanced_stats(monkeypatch):
+    cache_manager.clear_all()
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg/555": [FakeResponse(200, BASE_MATCH_HTML)],
+            "https://www.vlr.gg/555/?game=game-1&tab=performance": [FakeResponse(200, performance_html("Opponent A"))],
+            "https://www.vlr.gg/555/?game=game-2&tab=performance": [FakeResponse(200, performance_html("Opponent B"))],
+        }
+    )
+
+    monkeypatch.setattr("api.scrapers.match_detail.get_http_client", lambda: client)
+
+    data = await vlr_match_detail("555", {"maps", "performance"}, numeric=True)
+    segment = data["data"]["segments"][0]
+    player = segment["maps"][0]["players"]["team1"][0]
+
+    assert player["name"] == "TenZ" and player["agent"] == "Jett"
+    assert (player["rating"], player["acs"], player["kd_diff"], player["kast"]) == (1.2, 250, 5, 75)
+    assert segment["performance"]["advanced_stats"] == [{"player": "TenZ", "2K": 3}]
+    assert segment["performance"]["by_map"][1]["advanced_stats"] == [{"player": "TenZ", "2K": 3}]
+    assert segment["maps"][1]["performance"]["kill_matrix"] == [{"player": "TenZ", "kills_vs": {"Opponent B": "5"}}]
+
+    assert await vlr_match_detail("555", {"maps", "performance"}, numeric=True) is data
+    strings = await vlr_match_detail("555", {"maps", "performance"})
+    assert strings["data"]["segments"][0]["maps"][0]["players"]["team1"][0]["rating"] == "1.20"
+    assert len(client.calls) == 3
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_match_detail_numeric_survives_cadence_change_and_is_coalesced(monkeypatch):
+    from utils.live_state import cadence_for
+
+    cache_manager.clear_all()
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg/555": [FakeResponse(200, BASE_MATCH_HTML)],
+            "https://www.vlr.gg/555/?game=game-1&tab=performance": [FakeResponse(200, performance_html("A"))],
+            "https://www.vlr.gg/555/?game=game-2&tab=performance": [FakeResponse(200, performance_html("B"))],
+        }
+    )
+    conversions = []
+
+    def counting_to_numeric(payload):
+        conversions.append(payload)
+        return to_numeric(payload)
+
+    monkeypatch.setattr("api.scrapers.match_detail.get_http_client", lambda: client)
+    monkeypatch.setattr("api.scrapers.match_detail.to_numeric", counting_to_numeric)
+
+    first, second = await asyncio.gather(
+        vlr_match_detail("555", {"maps", "performance"}, numeric=True),
+        vlr_match_detail("555", {"maps", "performance"}, numeric=True),
+    )
+    assert first is second
+    assert len(conversions) == 1
+
+    monkeypatch.setattr(live_state, "cadence", lambda match_id: cadence_for("active"))
+    assert await vlr_match_detail("555", {"maps", "performance"}, numeric=True) is first
+    assert len(conversions) == 1
+    assert len(client.calls) == 3
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_match_detail_counts_one_cache_lookup_per_component(monkeypatch):
+    cache_manager.clear_all()
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg/555": [FakeResponse(200, BASE_MATCH_HTML)],
+            "https://www.vlr.gg/555/?game=game-1&tab=performance": [FakeResponse(200, performance_html("A"))],
+            "https://www.vlr.gg/555/?game=game-2&tab=performance": [FakeResponse(200, performance_html("B"))],
+        }
+    )
+    monkeypatch.setattr("api.scrapers.match_detail.get_http_client", lambda: client)
+
+    await vlr_match_detail("555", {"maps"})
+    cold = cache_manager.stats(include_sizes=False)["totals"]
+    assert (cold["hits"], cold["misses"], cold["fills"]) == (0, 4, 2)
+
+    cache_manager.reset_stats()
+    await vlr_match_detail("555", {"maps"})
+    warm = cache_manager.stats(include_sizes=False)["totals"]
+    assert (warm["hits"], warm["misses"], warm["fills"]) == (2, 0, 0)
+    assert len(client.calls) == 1
+
+    # Game tabs are probed across the finished-map bucket too, still once each.
+    await vlr_match_detail("555", {"maps", "performance"})
+    cache_manager.reset_stats()
+    await vlr_match_detail("555", {"maps", "performance"})
+    warm = cache_manager.stats(include_sizes=False)["totals"]
+    assert (warm["hits"], warm["misses"], warm["fills"]) == (4, 0, 0)
+    cache_manager.clear_all()
+
+
+def test_only_final_matches_mark_every_map_finished():
+    from api.scrapers.match_detail import _parse_header, _tab_ttl
+    from utils.constants import CACHE_TTL_MATCH_DETAIL_FINISHED_MAP
+    from utils.html_parsers import parse_html
+
+    partial_html = BASE_MATCH_HTML.replace('<div class="score">13</div>', '<div class="score">9</div>', 1)
+    upcoming = _parse_header(parse_html(
+        partial_html.replace("<html>", '<html><div class="match-header-vs-note">1h 5m</div>', 1)
+    ))
+    final = _parse_header(parse_html(
+        partial_html.replace("<html>", '<html><div class="match-header-vs-note">final</div>', 1)
+    ))
+
+    # game-1 (9-11) is undecided until the match is final; game-2 (10-13) is decided either way.
+    assert upcoming["completed_game_ids"] == ["game-2"]
+    assert _tab_ttl(upcoming, "game-1") == upcoming["cache_ttl"] != CACHE_TTL_MATCH_DETAIL_FINISHED_MAP
+    assert final["completed_game_ids"] == ["game-1", "game-2"]
@@ -207,3 +207,129 @@ async def test_vlr_live_score_limits_concurrent_detail_fetches_and_falls_back_on
     assert timed_out_segment["current_map"] == "Unknown"
     assert timed_out_segment["map_number"] == "Unknown"
     cache_manager.clear_all()
+
+
+def _live_homepage(series_score: str, ct_rounds: str) -> str:
+    return LIVE_HTML.replace(
+        '<div class="h-match-team-score">12</div>', f'<div class="h-match-team-score">{series_score}</div>'
+    ).replace('<span class="mod-ct">6</span>', f'<span class="mod-ct">{ct_rounds}</span>')
+
+
+LIVE_DETAIL_HTML = """
+<html>
+  <div class="match-header-vs"><img src="//owcdn.net/a.png"><img src="//owcdn.net/b.png"></div>
+  <div class="vm-stats-gamesnav-item js-map-switch mod-active mod-live"><div>{map}</div></div>
+</html>
+"""
+
+
+@pytest.mark.anyio
+async def test_vlr_live_score_refetches_detail_page_only_when_series_moves(monkeypatch):
+    from utils.constants import CACHE_TTL_LIVE
+
+    cache_manager.clear_all()
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg": [
+                FakeResponse(200, _live_homepage("0", "6")),
+                FakeResponse(200, _live_homepage("0", "8")),
+                FakeResponse(200, _live_homepage("1", "0")),
+            ],
+            "https://www.vlr.gg/123": [
+                FakeResponse(200, LIVE_DETAIL_HTML.format(map="1Ascent")),
+                FakeResponse(200, LIVE_DETAIL_HTML.format(map="2Bind")),
+            ],
+        }
+    )
+    monkeypatch.setattr("api.scrapers.matches.get_http_client", lambda: client)
+
+    maps = []
+    for _ in range(3):
+        cache_manager.invalidate(CACHE_TTL_LIVE, "live_score")
+        segment = (await vlr_live_score())["data"]["segments"][0]
+        maps.append((segment["map_number"], segment["current_map"]))
+
+    assert [call[0] for call in client.calls] == [
+        "https://www.vlr.gg",
+        "https://www.vlr.gg/123",
+        "https://www.vlr.gg",
+        "https://www.vlr.gg",
+        "https://www.vlr.gg/123",
+    ]
+    assert maps == [("1", "Ascent"), ("1", "Ascent"), ("2", "Bind")]
+    assert segment["team1_logo"] == "https://owcdn.net/a.png"
+    cache_manager.clear_all()
+
+
+ALTERNATING_HOMEPAGE_HTML = """
+<html>
+  <div class="js-home-matches-upcoming">
+    <a class="wf-module-item" href="/123">
+      <div class="h-match-eta mod-live">LIVE</div>
+      <div class="h-match-team">
+        <div class="h-match-team-name">Team One</div>
+        <div class="h-match-team-score">1</div>
+        <div class="h-match-team-rounds"><span class="mod-ct">5</span><span class="mod-t">2</span></div>
+      </div>
+      <div class="h-match-team">
+        <div class="h-match-team-name">Team Two</div>
+        <div class="h-match-team-score">0</div>
+        <div class="h-match-team-rounds"><span class="mod-ct">3</span><span class="mod-t">1</span></div>
+      </div>
+    </a>
+  </div>
+</html>
+"""
+
+ALTERNATING_DETAIL_HTML = """
+<html>
+  <div class="match-header-vs">
+    <img src="//owcdn.net/a.png"><img src="//owcdn.net/b.png">
+    <div class="match-header-vs-score"><span class="match-header-vs-score-winner">1</span><span>0</span></div>
+    <div class="match-header-vs-note">LIVE</div>
+  </div>
+  <div class="vm-stats-gamesnav-item js-map-switch mod-active mod-live"><div>2Bind</div></div>
+  <div class="vm-stats-game" data-game-id="game-1">
+    <div class="vm-stats-game-header">
+      <div class="team"><div class="score">13</div></div><div class="team"><div class="score">11</div></div>
+    </div>
+  </div>
+  <div class="vm-stats-game" data-game-id="game-2">
+    <div class="vm-stats-game-header">
+      <div class="team"><div class="score">7</div></div><div class="team"><div class="score">4</div></div>
+    </div>
+  </div>
+</html>
+"""
+
+
+@pytest.mark.anyio
+async def test_live_score_and_match_detail_share_progress_so_a_stalled_match_pauses(monkeypatch):
+    from api.scrapers.match_detail import _parse_header
+    from utils import live_state as live_state_module
+    from utils.constants import CACHE_TTL_LIVE
+    from utils.html_parsers import parse_html
+
+    cache_manager.clear_all()
+    now = [1000.0]
+    monkeypatch.setattr(live_state_module.time, "monotonic", lambda: now[0])
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg": [FakeResponse(200, ALTERNATING_HOMEPAGE_HTML) for _ in range(3)],
+            "https://www.vlr.gg/123": [FakeResponse(200, ALTERNATING_DETAIL_HTML)],
+        }
+    )
+    monkeypatch.setattr("api.scrapers.matches.get_http_client", lambda: client)
+
+    states = []
+    for step in range(6):
+        if step % 2 == 0:
+            cache_manager.invalidate(CACHE_TTL_LIVE, "live_score")
+            await vlr_live_score()
+        else:
+            _parse_header(parse_html(ALTERNATING_DETAIL_HTML), "123")
+        states.append(live_state_module.live_state.cadence("123").state)
+        now[0] += 50
+
+    assert states == ["active", "active", "active", "active", "paused", "paused"]
+    cache_manager.clear_all()
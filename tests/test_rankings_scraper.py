@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from selectolax.parser import HTMLParser
 
@@ -5,8 +7,12 @@ from api.scrapers.rankings import (
     _extract_last_played_summary,
     _extract_ranked_team_name,
     vlr_rankings,
+    vlr_rankings_all,
 )
 from utils.cache_manager import cache_manager
+from utils.constants import CACHE_TTL_RANKINGS
+from utils.http_client import circuit_breaker
+from utils.utils import region
 
 RANKINGS_HTML = """
 <html>
@@ -115,3 +121,128 @@ def test_rankings_helpers_fall_back_to_structured_text_nodes():
         "vs. Evil Geniuses",
         "",
     )
+
+
+class RegionClient:
+    def __init__(self, failing: set[str]):
+        self.failing = failing
+        self.calls = []
+
+    async def get(self, url: str, timeout=None):
+        self.calls.append(url)
+        if url.rsplit("/", 1)[1] in self.failing:
+            return FakeResponse(503, "")
+        return FakeResponse(200, RANKINGS_HTML)
+
+
+@pytest.mark.anyio
+async def test_vlr_rankings_all_merges_regions_and_caches_complete_result(monkeypatch):
+    cache_manager.clear_all()
+
+    async def no_sleep(_delay):
+        return None
+
+    monkeypatch.setattr("utils.http_client.asyncio.sleep", no_sleep)
+    client = RegionClient(failing={"korea"})
+    monkeypatch.setattr("api.scrapers.rankings.get_http_client", lambda: client)
+
+    await vlr_rankings("na")
+    partial = await vlr_rankings_all()
+    rows = partial["data"]["segments"]
+    assert [row["region"] for row in rows] == [key for key in region if key != "kr"]
+    assert rows[0]["team"] == "NRG" and rows[0]["region_name"] == "north-america"
+    korea = next(entry for entry in partial["data"]["meta"]["regions"] if entry["region"] == "kr")
+    assert korea["status"] == "error" and korea["code"] == 503
+    assert sum(url.endswith("/north-america") for url in client.calls) == 1
+
+    client.failing.clear()
+    calls_before = len(client.calls)
+    complete = await vlr_rankings_all()
+    assert len(complete["data"]["segments"]) == len(region)
+    assert client.calls[calls_before:] == ["https://www.vlr.gg/rankings/korea"]
+
+    cache_manager.reset_stats()
+    assert await vlr_rankings_all() is complete
+    assert len(client.calls) == calls_before + 1
+    totals = cache_manager.stats(include_sizes=False)["totals"]
+    assert (totals["hits"], totals["misses"]) == (1, 0)
+
+    # A region page expiring takes the merged result with it.
+    cache_manager.invalidate(CACHE_TTL_RANKINGS, "rankings", "na")
+    refreshed = await vlr_rankings_all()
+    assert refreshed is not complete
+    assert client.calls[calls_before + 1:] == ["https://www.vlr.gg/rankings/north-america"]
+    cache_manager.clear_all()
+    circuit_breaker.reset()
+
+
+@pytest.mark.anyio
+async def test_rankings_history_endpoint_serves_stored_snapshots(async_client, monkeypatch):
+    from utils.rankings_history import rankings_history
+
+    cache_manager.clear_all()
+    client = FakeAsyncClient(FakeResponse(200, RANKINGS_HTML))
+    monkeypatch.setattr("api.scrapers.rankings.get_http_client", lambda: client)
+
+    resp = await async_client.get("/v2/rankings/history?region=na")
+    assert resp.status_code == 404
+
+    await vlr_rankings("na")
+    assert rankings_history.count("na") == 1
+
+    resp = await async_client.get("/v2/rankings/history?region=na&days=30")
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    # A snapshot newer than the window start is no baseline: movement is unknown rather than "same".
+    assert data["segments"] == [
+        {"rank": 1, "team": "NRG", "country": "United States", "previous_rank": None, "change": None,
+         "movement": "unknown"}
+    ]
+    assert data["meta"]["days"] == 30 and data["meta"]["dropped"] == []
+    assert data["meta"]["baseline_at"] is None
+    assert len(client.calls) == 1
+
+    # An unchanged table seen since before the window start is its own baseline.
+    now = time.time()
+    rankings_history.record("eu", _snapshot_table("A", "B"), now=now - 30 * 86400)
+    rankings_history.record("eu", _snapshot_table("A", "B"), now=now)
+    resp = await async_client.get("/v2/rankings/history?region=eu&days=7")
+    data = resp.json()["data"]
+    assert [(row["team"], row["previous_rank"], row["change"], row["movement"]) for row in data["segments"]] == [
+        ("A", 1, 0, "same"), ("B", 2, 0, "same")
+    ]
+    assert data["meta"]["baseline_at"] == data["meta"]["current_at"] == now - 30 * 86400
+    cache_manager.clear_all()
+
+
+def _snapshot_table(*teams, last_played="1d ago"):
+    return [
+        {"rank": str(rank), "team": team, "country": "", "record": "", "earnings": "", "last_played": last_played}
+        for rank, team in enumerate(teams, start=1)
+    ]
+
+
+def test_rankings_history_dedupes_identical_tables_and_computes_deltas():
+    from utils.rankings_history import RankingsHistory, rank_deltas
+
+    history = RankingsHistory()
+    history.record("na", _snapshot_table("A", "B", "C"), now=1000.0)
+    history.record("na", _snapshot_table("A", "B", "C", last_played="2d ago"), now=2000.0)
+    history.record("na", _snapshot_table("B", "A", "D"), now=3000.0)
+
+    assert history.count("na") == 2
+    latest = history.latest("na")
+    assert (latest["taken_at"], latest["last_seen"]) == (3000.0, 3000.0)
+    baseline = history.as_of("na", 2500.0)
+    assert baseline["taken_at"] == 1000.0 and baseline["last_seen"] == 2000.0
+    assert history.as_of("na", 10.0)["taken_at"] == 1000.0
+
+    rows, dropped = rank_deltas(latest["rows"], baseline["rows"])
+    assert [(row["team"], row["previous_rank"], row["change"], row["movement"]) for row in rows] == [
+        ("B", 2, 1, "up"), ("A", 1, -1, "down"), ("D", None, None, "new")
+    ]
+    assert dropped == [{"team": "C", "previous_rank": 3}]
+
+    rows, dropped = rank_deltas(latest["rows"], None)
+    assert {row["movement"] for row in rows} == {"unknown"} and dropped == []
+    history.close()
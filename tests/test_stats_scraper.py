@@ -1,8 +1,10 @@
 import pytest
 from selectolax.parser import HTMLParser
 
-from api.scrapers.stats import _parse_stats_row, vlr_stats
+from api.scrapers.stats import _parse_stats_row, vlr_stats, vlr_stats_aggregate, vlr_stats_matrix
 from utils.cache_manager import cache_manager
+from utils.constants import CACHE_TTL_STATS
+from utils.http_client import circuit_breaker
 
 STATS_HTML = """
 <html>
@@ -120,3 +122,160 @@ async def test_vlr_stats_preserves_output_shape_with_structured_row_parsing(monk
         )
     ]
     cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_stats_numeric_rows_are_typed_once_per_cached_table(monkeypatch):
+    cache_manager.clear_all()
+    client = FakeAsyncClient(FakeResponse(200, STATS_HTML))
+
+    monkeypatch.setattr("api.scrapers.stats.get_http_client", lambda: client)
+
+    typed = await vlr_stats("na", "30", numeric=True)
+    row = typed["data"]["segments"][0]
+
+    assert row["rounds_played"] == 442
+    assert row["rating"] == 1.36
+    assert row["kill_assists_survived_traded"] == 79
+    assert row["clutch_attempts"] == "9/57"
+    assert row["player"] == "TenZ Prime"
+
+    assert (await vlr_stats("na", "30", numeric=True))["data"]["segments"] is typed["data"]["segments"]
+    strings = await vlr_stats("na", "30")
+    assert strings["data"]["segments"][0]["rating"] == "1.36"
+    assert len(client.calls) == 1
+    cache_manager.clear_all()
+
+
+def stats_row(player: str, org: str, agents: list[str], rounds: str, rating: str) -> str:
+    images = "".join(f'<img src="/img/vlr/game/agents/{agent}.png">' for agent in agents)
+    return (
+        f'<tr><td class="mod-player"><div class="text-of">{player}</div>'
+        f'<div class="stats-player-country">{org}</div></td>'
+        f'<td class="mod-agents">{images}</td><td>{rounds}</td><td>{rating}</td></tr>'
+    )
+
+
+@pytest.mark.anyio
+async def test_vlr_stats_sorts_filters_and_limits_from_the_cached_table(monkeypatch):
+    cache_manager.clear_all()
+    rows = "".join([
+        stats_row("a", "SEN", ["jett"], "300", "1.10"),
+        stats_row("b", "LOUD", ["omen", "jett"], "150", "1.40"),
+        stats_row("c", "sen", ["sova"], "500", "1.25"),
+        stats_row("d", "FNC", ["jett"], "400", ""),
+        stats_row("e", "FNC", ["jett"], "250", "0.95"),
+    ])
+    client = FakeAsyncClient(FakeResponse(200, f"<table><tbody>{rows}</tbody></table>"))
+    monkeypatch.setattr("api.scrapers.stats.get_http_client", lambda: client)
+
+    top = await vlr_stats("na", "30", sort="rating", limit=2)
+    assert [row["player"] for row in top["data"]["segments"]] == ["b", "c"]
+    assert top["data"]["segments"][0]["rating"] == "1.40"
+    assert top["data"]["meta"] == {"count": 2, "total": 5, "sort": "rating", "order": "desc", "limit": 2}
+
+    lowest = await vlr_stats("na", "30", sort="rating", order="asc")
+    assert [row["player"] for row in lowest["data"]["segments"]] == ["e", "a", "c", "b", "d"]
+
+    jett = await vlr_stats("na", "30", numeric=True, sort="rounds_played", agent="Jett", min_rounds=200)
+    assert [(row["player"], row["rounds_played"]) for row in jett["data"]["segments"]] == [
+        ("d", 400), ("a", 300), ("e", 250)
+    ]
+
+    sen = await vlr_stats("na", "30", org="SEN")
+    assert [row["player"] for row in sen["data"]["segments"]] == ["a", "c"]
+    assert len(client.calls) == 1
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_stats_matrix_tags_rows_reuses_cells_and_reports_failures(monkeypatch):
+    cache_manager.clear_all()
+    pages = {
+        "na": f"<table><tbody>{stats_row('a', 'SEN', ['jett'], '300', '1.10')}</tbody></table>",
+        "eu": f"<table><tbody>{stats_row('a', 'SEN', ['jett'], '400', '1.20')}"
+        f"{stats_row('b', 'FNC', ['sova'], '200', '1.00')}</tbody></table>",
+    }
+    calls = []
+
+    class MatrixClient:
+        async def get(self, url, timeout=None):
+            calls.append(url)
+            region_key = url.split("&region=")[1].split("&")[0]
+            if region_key == "kr":
+                return FakeResponse(503, "")
+            return FakeResponse(200, pages[region_key])
+
+    monkeypatch.setattr("api.scrapers.stats.get_http_client", lambda: MatrixClient())
+    monkeypatch.setattr("utils.http_client.asyncio.sleep", _no_sleep)
+
+    await vlr_stats("na", "30")
+    data = await vlr_stats_matrix(["na", "eu", "kr"], ["30"], numeric=True)
+
+    assert [(row["player"], row["region"], row["timespan"]) for row in data["data"]["segments"]] == [
+        ("a", "na", "30"), ("a", "eu", "30"), ("b", "eu", "30")
+    ]
+    assert data["data"]["segments"][0]["rounds_played"] == 300
+    cells = data["data"]["meta"]["cells"]
+    assert cells[:2] == [
+        {"region": "na", "timespan": "30", "status": "success", "rows": 1},
+        {"region": "eu", "timespan": "30", "status": "success", "rows": 2},
+    ]
+    assert cells[2]["status"] == "error" and cells[2]["code"] == 503
+    assert sum("region=na" in url for url in calls) == 1
+
+    deduped = await vlr_stats_matrix(["na", "eu"], ["30"], dedupe=True)
+    rows = deduped["data"]["segments"]
+    assert [(row["player"], row["region"], row["regions"]) for row in rows] == [
+        ("a", "eu", ["na", "eu"]), ("b", "eu", ["eu"])
+    ]
+    assert rows[0]["rounds_played"] == "400"
+    cache_manager.clear_all()
+    circuit_breaker.reset()
+
+
+async def _no_sleep(_delay):
+    return None
+
+
+@pytest.mark.anyio
+async def test_vlr_stats_aggregate_is_computed_once_per_cached_table(monkeypatch):
+    cache_manager.clear_all()
+    rows = "".join([
+        stats_row("a", "SEN", ["jett"], "300", "1.10"),
+        stats_row("b", "LOUD", ["omen"], "150", "1.40"),
+    ])
+    client = FakeAsyncClient(FakeResponse(200, f"<table><tbody>{rows}</tbody></table>"))
+    monkeypatch.setattr("api.scrapers.stats.get_http_client", lambda: client)
+
+    first = await vlr_stats_aggregate("na", "30", ["rating"], ["distributions", "percentiles"])
+    segment = first["data"]["segments"][0]
+    assert segment["distributions"]["rating"]["max"] == 1.4
+    assert [player["percentiles"]["rating"] for player in segment["players"]] == [25.0, 75.0]
+    assert "correlations" not in segment
+    assert first["data"]["meta"] == {"rows": 2, "region": "na", "timespan": "30"}
+
+    second = await vlr_stats_aggregate("na", "30", ["rating"], ["distributions"])
+    assert second["data"]["segments"][0]["distributions"]["rating"] is segment["distributions"]["rating"]
+    assert len(client.calls) == 1
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_stats_derived_views_expire_with_the_page(monkeypatch):
+    cache_manager.clear_all()
+    client = FakeAsyncClient(FakeResponse(200, STATS_HTML))
+    monkeypatch.setattr("api.scrapers.stats.get_http_client", lambda: client)
+
+    first = await vlr_stats_aggregate("na", "30")
+    typed = await vlr_stats("na", "30", numeric=True)
+
+    # Simulate the stats page TTL expiring.
+    cache_manager._get_cache(CACHE_TTL_STATS).clear()
+    client.response = FakeResponse(200, STATS_HTML.replace("1.36", "1.50"))
+
+    assert (await vlr_stats_aggregate("na", "30"))["data"]["segments"][0] != first["data"]["segments"][0]
+    assert (await vlr_stats("na", "30", numeric=True))["data"]["segments"][0]["rating"] == 1.5
+    assert typed["data"]["segments"][0]["rating"] == 1.36
+    assert len(client.calls) == 2
+    cache_manager.clear_all()
@@ -1,5 +1,7 @@
 """Tests for utility modules: pagination, html_parsers, error_handling, cache_manager."""
 import asyncio
+import json
+import weakref
 from datetime import timedelta
 
 import httpx
@@ -8,13 +10,15 @@ from fastapi import HTTPException
 
 from api.scrapers.events import vlr_event_matches, vlr_events
 from api.scrapers.match_detail import vlr_match_detail
-from api.scrapers.players import vlr_player, vlr_player_matches
+from api.scrapers.players import vlr_player, vlr_player_match_history, vlr_player_matches
 from utils.cache_manager import CacheManager, cache_manager
 from utils.constants import CACHE_TTL_EVENTS, CACHE_TTL_MATCH_DETAIL
 from utils.error_handling import validate_event_query, validate_match_query, validate_region, validate_timespan
 from utils.html_parsers import parse_eta_to_timedelta
 from utils.http_client import CircuitOpenError, circuit_breaker, fetch_with_retries
+from utils.metrics import UPSTREAM_RETRIES, MetricsRegistry, classify_url
 from utils.pagination import PaginationConfig, scrape_multiple_pages
+from utils.profiler import ProfilerBusyError, SamplingProfiler
 
 # --- PaginationConfig.get_page_range ---
 
@@ -69,6 +73,95 @@ class TestParseEta:
         assert parse_eta_to_timedelta(None) is None
 
 
+class TestParseNumber:
+    def test_decimal_and_integer(self):
+        from utils.numeric import parse_number
+
+        assert parse_number("1.20") == 1.2
+        assert parse_number("250") == 250 and isinstance(parse_number("250"), int)
+
+    def test_percent_sign_and_separators(self):
+        from utils.numeric import parse_number
+
+        assert parse_number("75%") == 75
+        assert parse_number("+5") == 5
+        assert parse_number("-3") == -3
+        assert parse_number("1,204") == 1204
+
+    def test_missing_values_become_none(self):
+        from utils.numeric import parse_number
+
+        assert parse_number("") is None
+        assert parse_number("N/A") is None
+        assert parse_number("9/57") is None
+        assert parse_number(None) is None
+
+    def test_numeric_row_converts_only_listed_fields(self):
+        from utils.numeric import numeric_row
+
+        row = {"player": "007", "rating": "1.05", "clutches": "2/9"}
+        assert numeric_row(row, ["rating", "missing"]) == {"player": "007", "rating": 1.05, "clutches": "2/9"}
+        assert row["rating"] == "1.05"
+
+
+class TestStatsTable:
+    def table(self):
+        from utils.stats_table import StatsTable
+
+        rows = [
+            {"player": "a", "org": "X", "agents": ["jett"], "rounds_played": "100", "rating": "1.0"},
+            {"player": "b", "org": "Y", "agents": ["sova"], "rounds_played": "200", "rating": ""},
+            {"player": "c", "org": "X", "agents": ["jett"], "rounds_played": "300", "rating": "1.0"},
+            {"player": "d", "org": "Y", "agents": ["jett"], "rounds_played": "50", "rating": "1.3"},
+        ]
+        return StatsTable(rows, ("rounds_played", "rating"))
+
+    def test_missing_values_sort_last_and_ties_keep_table_order(self):
+        table = self.table()
+        assert [row["player"] for row in table.select(sort="rating")] == ["d", "a", "c", "b"]
+        assert [row["player"] for row in table.select(sort="rating", order="asc")] == ["a", "c", "d", "b"]
+
+    def test_limit_stops_after_enough_matches(self):
+        table = self.table()
+        assert [row["player"] for row in table.select(sort="rounds_played", limit=1, org="x")] == ["c"]
+        assert table.select(sort="rating", min_rounds=100, agent="JETT", numeric=True) == [
+            {"player": "a", "org": "X", "agents": ["jett"], "rounds_played": 100, "rating": 1.0},
+            {"player": "c", "org": "X", "agents": ["jett"], "rounds_played": 300, "rating": 1.0},
+        ]
+
+
+class TestStatsAggregate:
+    def aggregate(self):
+        from utils.stats_table import StatsAggregate, StatsTable
+
+        rows = [
+            {"player": "a", "org": "X", "agents": [], "rounds_played": "100", "rating": "1.0"},
+            {"player": "b", "org": "Y", "agents": [], "rounds_played": "200", "rating": "2.0"},
+            {"player": "c", "org": "X", "agents": [], "rounds_played": "300", "rating": "3.0"},
+            {"player": "d", "org": "Y", "agents": [], "rounds_played": "400", "rating": ""},
+        ]
+        return StatsAggregate(StatsTable(rows, ("rounds_played", "rating")))
+
+    def test_distributions(self):
+        rating = self.aggregate().select(sections=["distributions"])["distributions"]["rating"]
+        assert rating == {
+            "count": 3, "missing": 1, "mean": 2.0, "stdev": 1.0, "min": 1.0,
+            "p10": 1.2, "p25": 1.5, "median": 2.0, "p75": 2.5, "p90": 2.8, "max": 3.0,
+        }
+
+    def test_percentile_ranks_and_z_scores(self):
+        players = self.aggregate().select(["rating"], ["percentiles"], players=["A", "d"])["players"]
+        assert players == [
+            {"player": "a", "org": "X", "percentiles": {"rating": 16.7}, "z_scores": {"rating": -1.0}},
+            {"player": "d", "org": "Y", "percentiles": {"rating": None}, "z_scores": {"rating": None}},
+        ]
+
+    def test_correlations_use_pairwise_complete_rows(self):
+        result = self.aggregate().select(sections=["correlations"])
+        assert set(result) == {"columns", "correlations"}
+        assert result["correlations"]["rating"] == {"rounds_played": 1.0, "rating": 1.0}
+
+
 # --- Validators ---
 
 class TestValidators:
@@ -142,6 +235,16 @@ class TestCacheManager:
         assert cm.get(60, "k1") is None
         assert cm.get(120, "k2") is None
 
+    def test_get_any_counts_one_lookup_across_buckets(self):
+        cm = CacheManager()
+        cm.set(120, "b", "k")
+        assert cm.get_any((30, 60, 120), "k") == "b"
+        assert cm.get_any((30, 60, 120), "missing") is None
+        buckets = {bucket["ttl"]: bucket for bucket in cm.stats(include_sizes=False)["buckets"]}
+        assert (buckets[30]["hits"], buckets[30]["misses"]) == (0, 1)
+        assert (buckets[60]["hits"], buckets[60]["misses"]) == (0, 0)
+        assert (buckets[120]["hits"], buckets[120]["misses"]) == (1, 0)
+
     def test_make_cache_key_deterministic(self):
         key1 = CacheManager.make_cache_key("a", "b", x=1)
         key2 = CacheManager.make_cache_key("a", "b", x=1)
@@ -212,6 +315,55 @@ class TestCacheManager:
         assert third == {"data": {"status": 503, "segments": []}}
         assert cm.get(60, "key1") is None
 
+    def test_stats_count_hits_misses_and_fills(self):
+        cm = CacheManager()
+        cm.get(60, "key1")
+        cm.set(60, {"data": {"status": 200, "segments": ["x"]}}, "key1")
+        cm.get(60, "key1")
+        cm.set_if_cacheable(60, {"data": {"status": 503}}, "key2")
+
+        stats = cm.stats()
+        bucket = stats["buckets"][0]
+
+        assert bucket["ttl"] == 60
+        assert bucket["entries"] == 1
+        assert (bucket["hits"], bucket["misses"], bucket["fills"], bucket["rejected"]) == (1, 1, 1, 1)
+        assert bucket["hit_ratio"] == 0.5
+        assert bucket["bytes"] > 0
+        assert stats["totals"]["bytes"] == bucket["bytes"]
+        assert "bytes" not in cm.stats(include_sizes=False)["totals"]
+
+    @pytest.mark.anyio
+    async def test_total_bytes_matches_stats_sizes(self):
+        cm = CacheManager()
+        shared = ["x" * 100]
+        cm.set(60, {"data": shared}, "a")
+        cm.set(120, {"data": shared}, "b")
+        assert await cm.total_bytes() == cm.stats()["totals"]["bytes"] > 100
+
+    @pytest.mark.anyio
+    async def test_stats_track_producers_and_coalesced_waiters(self):
+        cm = CacheManager()
+
+        async def producer():
+            await asyncio.sleep(0)
+            return {"data": {"status": 200, "segments": []}}
+
+        await asyncio.gather(
+            cm.get_or_create_async(60, producer, "news"),
+            cm.get_or_create_async(60, producer, "news"),
+        )
+        await cm.get_or_create_async(60, producer, "news")
+
+        stats = cm.stats(include_sizes=False)
+        producer_stats = stats["producers"]["news"]
+
+        assert producer_stats["calls"] == 1
+        assert producer_stats["coalesced_waiters"] == 1
+        assert producer_stats["max_seconds"] >= 0
+        assert stats["buckets"][0]["misses"] == 2
+        assert stats["buckets"][0]["hits"] == 1
+
 
 class FakeResponse:
     def __init__(self, status_code: int, text: str = "<html></html>", headers: dict | None = None):
@@ -275,6 +427,38 @@ async def test_scrape_multiple_pages_raises_when_any_page_exhausts_retries(monke
     ]
 
 
+@pytest.mark.anyio
+async def test_scrape_multiple_pages_stops_at_known_item(monkeypatch):
+    client = FakeAsyncClient(
+        {
+            "https://example.test/page-1": [FakeResponse(200)],
+            "https://example.test/page-2": [FakeResponse(200)],
+        }
+    )
+
+    async def fake_sleep(_delay):
+        return None
+
+    monkeypatch.setattr("utils.pagination.get_http_client", lambda: client)
+    monkeypatch.setattr("utils.pagination.asyncio.sleep", fake_sleep)
+
+    def parse_func(_html, page: int):
+        return [{"match_id": f"{page}{index}"} for index in range(3)]
+
+    data = await scrape_multiple_pages(
+        base_url="https://example.test",
+        parse_func=parse_func,
+        config=PaginationConfig(num_pages=3, timeout=5),
+        page_url_func=lambda _base, page: f"https://example.test/page-{page}",
+        stop_at=lambda item: item["match_id"] == "21",
+    )
+
+    assert [item["match_id"] for item in data["data"]["segments"]] == ["10", "11", "12", "20"]
+    assert data["data"]["meta"]["stopped_early"] is True
+    assert data["data"]["meta"]["successful_pages"] == 2
+    assert len(client.calls) == 2
+
+
 @pytest.mark.anyio
 async def test_vlr_events_does_not_cache_non_200_responses(monkeypatch):
     cache_manager.clear_all()
@@ -383,6 +567,96 @@ async def test_player_scrapers_return_error_payload_for_non_200(
     cache_manager.clear_all()
 
 
+@pytest.mark.anyio
+async def test_get_players_data_serves_cached_profiles_and_reports_per_id_status(monkeypatch):
+    from routers.shared_handlers import get_players_data
+
+    cache_manager.clear_all()
+    client = FakeAsyncClient(
+        {
+            "https://www.vlr.gg/player/1/?timespan=all": [FakeResponse(200)],
+            "https://www.vlr.gg/player/2/?timespan=all": [FakeResponse(200)],
+            "https://www.vlr.gg/player/3/?timespan=all": [FakeResponse(404)],
+        }
+    )
+    monkeypatch.setattr("api.scrapers.players.get_http_client", lambda: client)
+
+    await vlr_player("1", "all")
+    result = await get_players_data(["2", "1", "x", "3"], "all")
+    entries = result["data"]["segments"]
+
+    assert [(entry["player_id"], entry["status"]) for entry in entries] == [
+        ("2", "success"), ("1", "success"), ("x", "error"), ("3", "error")
+    ]
+    assert (entries[0]["source"], entries[1]["source"]) == ("upstream", "cache")
+    assert entries[0]["data"]["id"] == "2"
+    assert (entries[2]["code"], entries[3]["code"]) == (400, 404)
+    assert result["data"]["meta"] == {"count": 4, "failed": 2}
+    assert [call[0] for call in client.calls].count("https://www.vlr.gg/player/1/?timespan=all") == 1
+    cache_manager.clear_all()
+
+
+def _player_matches_html(*match_ids: int) -> str:
+    cards = "".join(f'<a class="wf-card m-item" href="/{match_id}/a-vs-b"></a>' for match_id in match_ids)
+    return f"<html><body>{cards}</body></html>"
+
+
+@pytest.mark.anyio
+async def test_vlr_player_match_history_merges_pages_in_order_and_stops_at_empty_page(monkeypatch):
+    cache_manager.clear_all()
+    url = "https://www.vlr.gg/player/matches/9/?page={}"
+    client = FakeAsyncClient(
+        {
+            url.format(1): [FakeResponse(200, _player_matches_html(10, 9))],
+            url.format(2): [FakeResponse(200, _player_matches_html(9, 8, 7))],
+            url.format(3): [FakeResponse(200, _player_matches_html())],
+            url.format(4): [FakeResponse(200, _player_matches_html(1))],
+            url.format(5): [FakeResponse(200, _player_matches_html(0))],
+        }
+    )
+    monkeypatch.setattr("api.scrapers.players.get_http_client", lambda: client)
+
+    result = await vlr_player_match_history("9", 1, 5)
+    limited = await vlr_player_match_history("9", 1, 5, limit=3)
+    single = await vlr_player_matches("9", 2)
+
+    assert [match["match_id"] for match in result["data"]["segments"]] == ["10", "9", "8", "7"]
+    assert result["data"]["meta"] == {
+        "pages": [1, 2], "first_page": 1, "last_page": 5, "count": 4, "limit": None, "stopped": "empty_page",
+    }
+    assert [match["match_id"] for match in limited["data"]["segments"]] == ["10", "9", "8"]
+    assert limited["data"]["meta"]["stopped"] == "limit"
+    assert len(single["data"]["segments"]) == 3
+    # Each page is fetched once and then served from its own cache entry.
+    assert sorted(call[0] for call in client.calls) == [url.format(page) for page in range(1, 5)]
+    cache_manager.clear_all()
+
+
+@pytest.mark.anyio
+async def test_vlr_player_match_history_keeps_pages_before_a_failed_page(monkeypatch):
+    cache_manager.clear_all()
+    circuit_breaker.reset()
+    url = "https://www.vlr.gg/player/matches/9/?page={}"
+    client = FakeAsyncClient(
+        {
+            url.format(1): [FakeResponse(200, _player_matches_html(3)), FakeResponse(404)],
+            url.format(2): [FakeResponse(404)],
+        }
+    )
+    monkeypatch.setattr("api.scrapers.players.get_http_client", lambda: client)
+
+    partial = await vlr_player_match_history("9", 1, 2)
+    cache_manager.clear_all()
+    failed = await vlr_player_match_history("9", 1, 2)
+
+    assert [match["match_id"] for match in partial["data"]["segments"]] == ["3"]
+    assert partial["data"]["meta"]["stopped"] == "error"
+    assert partial["data"]["meta"]["failed_page"]["page"] == 2
+    assert failed["data"]["status"] == 404
+    circuit_breaker.reset()
+    cache_manager.clear_all()
+
+
 @pytest.mark.anyio
 async def test_vlr_match_detail_does_not_cache_non_200_responses(monkeypatch):
     cache_manager.clear_all()
@@ -412,7 +686,7 @@ async def test_vlr_match_detail_does_not_cache_non_200_responses(monkeypatch):
         ("https://www.vlr.gg/123", None),
         ("https://www.vlr.gg/123", None),
     ]
-    assert cache_manager.get(CACHE_TTL_MATCH_DETAIL, "match_detail", "123") == second
+    assert cache_manager.get(CACHE_TTL_MATCH_DETAIL, "match_detail", "123", "header") is not None
     cache_manager.clear_all()
 
 
@@ -667,3 +941,553 @@ async def test_fetch_with_retries_does_not_count_429_as_circuit_failure(monkeypa
 
     circuit_breaker.reset()
     circuit_breaker.fail_max = 5
+
+
+class TestMetricsRegistry:
+    def test_histogram_renders_cumulative_buckets(self):
+        reg = MetricsRegistry()
+        hist = reg.histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+        hist.observe(0.05, route="/a")
+        hist.observe(0.5, route="/a")
+        hist.observe(5, route="/a")
+
+        text = reg.render()
+
+        assert '# TYPE demo_seconds histogram' in text
+        assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in text
+        assert 'demo_seconds_bucket{route="/a",le="1"} 2' in text
+        assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in text
+        assert 'demo_seconds_count{route="/a"} 3' in text
+
+    def test_counter_escapes_label_values(self):
+        reg = MetricsRegistry()
+        reg.counter("demo_total", "Demo.", ("path",)).inc(path='a"b')
+        assert 'demo_total{path="a\\"b"} 1' in reg.render()
+
+    def test_callback_metric_is_evaluated_at_render_time(self):
+        reg = MetricsRegistry()
+        state = {"value": 1}
+        reg.callback("demo_state", "Demo.", ("host",), lambda: {("h",): state["value"]})
+        state["value"] = 2
+        assert 'demo_state{host="h"} 2' in reg.render()
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("https://www.vlr.gg", ("www.vlr.gg", "home")),
+            ("https://www.vlr.gg/123/?game=1&tab=economy", ("www.vlr.gg", "match_tab")),
+            ("https://www.vlr.gg/123", ("www.vlr.gg", "match")),
+            ("https://www.vlr.gg/player/matches/9/?page=2", ("www.vlr.gg", "player_matches")),
+            ("https://www.vlr.gg/rankings/north-america", ("www.vlr.gg", "rankings")),
+        ],
+    )
+    def test_classify_url_uses_bounded_path_classes(self, url, expected):
+        assert classify_url(url) == expected
+
+
+@pytest.mark.anyio
+async def test_fetch_with_retries_reports_retries_to_metrics(monkeypatch):
+    circuit_breaker.reset()
+    url = "https://metrics.example.test/page"
+    client = FakeAsyncClient({url: [FakeResponse(503), FakeResponse(200)]})
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("utils.http_client.asyncio.sleep", fake_sleep)
+    before = UPSTREAM_RETRIES.value(host="metrics.example.test", reason=503)
+
+    await fetch_with_retries(url, client=client, max_retries=2, request_delay=0.5)
+
+    assert UPSTREAM_RETRIES.value(host="metrics.example.test", reason=503) == before + 1
+
+
+class TestSamplingProfiler:
+    @pytest.mark.anyio
+    async def test_groups_stacks_by_scraper_function(self):
+        import threading
+
+        import api.scrapers.news as news_module
+
+        # Define a busy loop inside the scraper module's namespace so its frames
+        # are attributed to api.scrapers.news.
+        namespace = {"__name__": news_module.__name__}
+        exec(compile("def spin(stop):\n    while not stop.wait(0.001):\n        pass\n", news_module.__file__, "exec"), namespace)
+        stop = threading.Event()
+        worker = threading.Thread(target=namespace["spin"], args=(stop,))
+        worker.start()
+        try:
+            report = await SamplingProfiler().run(0.05, 0.005)
+        finally:
+            stop.set()
+            worker.join()
+
+        assert "news.spin" in report["groups"]
+        stacks = report["groups"]["news.spin"]["stacks"]
+        assert any("api.scrapers.news:spin" in item["stack"] for item in stacks)
+
+    @pytest.mark.anyio
+    async def test_rejects_concurrent_runs(self):
+        profiler = SamplingProfiler()
+        first = asyncio.create_task(profiler.run(0.05, 0.01))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ProfilerBusyError):
+            await profiler.run(0.01, 0.01)
+        await first
+
+
+class TestSQLiteStore:
+    def test_match_archive_round_trips_compressed_segments(self):
+        from utils.match_archive import MatchArchive
+
+        archive = MatchArchive()
+        segment = {"match_id": "1", "event": {"name": "Champions"}, "teams": [{"name": "A"}, {"name": "B"}]}
+
+        assert archive.put(segment) is True
+        assert archive.get("1") == segment
+        listed = archive.list(10)
+        assert [(entry["match_id"], entry["event"], entry["teams"]) for entry in listed] == [("1", "Champions", "A vs B")]
+        archive.close()
+
+    def test_store_disables_itself_on_storage_errors(self, tmp_path, monkeypatch):
+        from utils.match_archive import MatchArchive
+
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        monkeypatch.setenv("VLRGGAPI_DATA_DIR", str(blocker))
+        archive = MatchArchive()
+
+        assert archive.put({"match_id": "1"}) is False
+        assert archive.get("1") is None
+        assert archive.enabled is False
+
+    def test_store_retries_locked_database_and_recovers_after_backoff(self, monkeypatch):
+        import sqlite3
+
+        from utils import sqlite_store
+        from utils.match_archive import MatchArchive
+
+        now = [1000.0]
+        monkeypatch.setattr(sqlite_store.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(sqlite_store.time, "sleep", lambda _delay: None)
+        archive = MatchArchive()
+        connect = archive._connect
+        failures = [sqlite3.OperationalError("database is locked")] * 2
+
+        def flaky_connect():
+            if failures:
+                raise failures.pop()
+            return connect()
+
+        monkeypatch.setattr(archive, "_connect", flaky_connect)
+        assert archive.put({"match_id": "1"}) is True
+
+        failures.append(sqlite3.DatabaseError("disk I/O error"))
+        assert archive.get("1") is None
+        assert archive.enabled is False
+        now[0] += sqlite_store.SQLITE_ERROR_BACKOFF
+        assert archive.enabled is True
+        assert archive.get("1") == {"match_id": "1"}
+        archive.close()
+
+    def test_match_store_merges_sources_and_paginates_by_cursor(self):
+        from utils.match_store import MatchStore, normalize_day
+
+        store = MatchStore()
+        store.upsert([
+            {"match_id": "10", "match_time": "2026-02-09", "team1": "Alpha", "team2": "Beta", "event_id": "5"},
+            {"match_id": "11", "match_time": "2026-02-10 18:00:00", "team1": "Gamma", "team2": "Alpha",
+             "event": "Masters", "state": "completed"},
+            {"match_id": "12", "match_time": "2026-02-11 18:00:00", "team1": "Alpha", "team2": "Delta",
+             "event": "Masters", "state": "upcoming"},
+            {"match_id": "bad", "team1": "ignored"},
+        ])
+        # A later, more precise source fills blanks without erasing known fields.
+        store.upsert([{"match_id": "10", "match_time": "2026-02-09 15:00:00", "event": "Masters", "state": "completed"}])
+        store.set_players("11", [("TenZ", "Gamma"), ("Boaster", "Alpha")])
+
+        assert store.count() == 3
+        first, cursor = store.query(team="alpha", event="masters", limit=2)
+        assert [match["match_id"] for match in first] == ["12", "11"]
+        assert first[1]["players"] == [{"name": "Boaster", "team": "Alpha"}, {"name": "TenZ", "team": "Gamma"}]
+        second, end = store.query(team="alpha", event="masters", limit=2, cursor=cursor)
+        assert [(match["match_id"], match["event_id"], match["match_time"]) for match in second] == [
+            ("10", "5", "2026-02-09 15:00:00")
+        ]
+        assert end is None
+
+        assert [m["match_id"] for m in store.query(player="tenz")[0]] == ["11"]
+        assert [m["match_id"] for m in store.query(state="completed", order="asc")[0]] == ["10", "11"]
+        assert [m["match_id"] for m in store.query(date_from="2026-02-10", date_to="2026-02-10")[0]] == ["11"]
+        assert [m["match_id"] for m in store.query(sort="match_id", order="asc", limit=1)[0]] == ["10"]
+        assert normalize_day("Mon, February 9, 2026") == normalize_day("2026/02/09") == "2026-02-09"
+        with pytest.raises(ValueError):
+            store.query(cursor="not-a-cursor")
+        store.close()
+
+    def test_match_store_keeps_the_most_precise_match_time(self):
+        from utils.match_store import MatchStore
+
+        store = MatchStore()
+        store.upsert([
+            {"match_id": "1", "match_time": "2026-02-09 15:00:00"},
+            {"match_id": "2", "completed_at": "2026-02-10 01:30:00"},
+        ])
+        # Results-page completion times never replace a known start.
+        store.upsert([
+            {"match_id": "1", "completed_at": "2026-02-09 18:10:00"},
+            {"match_id": "1", "match_time": "2026-02-09"},
+            {"match_id": "2", "match_time": "2026-02-09"},
+        ])
+        assert [(m["match_id"], m["match_time"]) for m in store.query(order="asc")[0]] == [
+            ("2", "2026-02-09"), ("1", "2026-02-09 15:00:00")
+        ]
+        store.upsert([{"match_id": "2", "match_time": "2026-02-09 23:00:00"}, {"match_id": "2", "completed_at": "x"}])
+        assert store.query(sort="match_id", order="desc", limit=1)[0][0]["match_time"] == "2026-02-09 23:00:00"
+
+        # A start estimated from a /matches countdown is approximate too.
+        store.upsert([{"match_id": "1", "match_time": "2026-02-09 14:12:43", "match_time_approximate": True}])
+        assert store.query(sort="match_id", order="asc", limit=1)[0][0]["match_time"] == "2026-02-09 15:00:00"
+        store.close()
+
+    def test_match_timestamp_with_source_reports_the_strategy(self):
+        from selectolax.parser import HTMLParser
+
+        from utils.html_parsers import TIMESTAMP_ETA, TIMESTAMP_SCHEDULE, TIMESTAMP_UTC, match_timestamp_with_source
+
+        def item(html):
+            return HTMLParser(f"<a>{html}</a>").css_first("a")
+
+        utc = item('<div class="moment-tz-convert" data-utc-ts="1770649200"></div><div class="ml-eta">1h</div>')
+        assert match_timestamp_with_source(utc, "") == ("2026-02-09 15:00:00", TIMESTAMP_UTC)
+        timestamp, source = match_timestamp_with_source(item('<div class="ml-eta">1h 5m</div>'), "")
+        assert len(timestamp) == 19 and source == TIMESTAMP_ETA
+        schedule = item('<div class="match-item-time">10:00 AM</div>')
+        assert match_timestamp_with_source(schedule, "Mon, February 9, 2026") == ("2026-02-09 15:00:00", TIMESTAMP_SCHEDULE)
+        assert match_timestamp_with_source(item(""), "") == ("", "")
+
+    def test_normalize_utc_timestamp_accepts_unix_seconds_and_datetimes(self):
+        from utils.html_parsers import normalize_utc_timestamp
+
+        assert normalize_utc_timestamp("1770649200") == "2026-02-09 15:00:00"
+        assert normalize_utc_timestamp(" 2026-02-09 15:00:00 ") == "2026-02-09 15:00:00"
+        assert normalize_utc_timestamp("Feb 9") == normalize_utc_timestamp("") == ""
+
+
+class TestBatchHelpers:
+    @pytest.mark.anyio
+    async def test_bounded_as_completed_limits_concurrency_and_captures_errors(self):
+        from utils.batch import bounded_as_completed
+
+        active = 0
+        peak = 0
+
+        async def worker(item):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01 * item)
+            active -= 1
+            if item == 2:
+                raise ValueError("boom")
+            return item * 10
+
+        results = [entry async for entry in bounded_as_completed([3, 1, 2], worker, 2)]
+
+        assert peak == 2
+        assert {item: (result, type(error)) for item, result, error in results} == {
+            1: (10, type(None)),
+            2: (None, ValueError),
+            3: (30, type(None)),
+        }
+
+    @pytest.mark.anyio
+    async def test_fetch_with_retries_shares_upstream_slots(self, monkeypatch):
+        monkeypatch.setattr("utils.http_client.UPSTREAM_FETCH_CONCURRENCY", 2)
+        monkeypatch.setattr("utils.http_client._upstream_slots", weakref.WeakKeyDictionary())
+        active = 0
+        peak = 0
+
+        class SlowClient:
+            async def get(self, url, timeout=None):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                return httpx.Response(200, request=httpx.Request("GET", url))
+
+        client = SlowClient()
+        await asyncio.gather(*[fetch_with_retries(f"https://www.vlr.gg/{i}", client=client) for i in range(6)])
+
+        assert peak == 2
+
+
+class TestSharedPoller:
+    @pytest.mark.anyio
+    async def test_publishes_snapshot_then_only_changes_and_stops_with_last_subscriber(self):
+        from utils.live_feed import SharedPoller, diff_by_key
+
+        snapshots = [
+            {"1": {"id": "1", "score": "0-0"}, "2": {"id": "2", "score": "1-0"}},
+            {"1": {"id": "1", "score": "0-0"}, "2": {"id": "2", "score": "1-0"}},
+            {"1": {"id": "1", "score": "1-0"}},
+        ]
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return snapshots[min(calls, len(snapshots)) - 1]
+
+        poller = SharedPoller("test", fetch, diff_by_key, interval=0.001)
+        first = poller.subscribe()
+        second = poller.subscribe()
+
+        assert await first.get() == ("snapshot", snapshots[0])
+        assert await second.get() == ("snapshot", snapshots[0])
+        assert await first.get() == ("update", {"changed": [{"id": "1", "score": "1-0"}], "removed": ["2"]})
+
+        late = poller.subscribe()
+        assert (await late.get())[0] == "snapshot"
+
+        for queue in (first, second, late):
+            poller.unsubscribe(queue)
+        assert poller.running is False
+        await poller.stop()
+
+    @pytest.mark.anyio
+    async def test_live_score_events_stream_sse_frames(self, monkeypatch):
+        from routers import live_streams
+        from utils.live_feed import SharedPoller, diff_by_key
+
+        scores = iter(["0", "1"])
+
+        async def fake_live_score():
+            score = next(scores, "1")
+            return {"data": {"status": 200, "segments": [{"match_id": "9", "score1": score}]}}
+
+        monkeypatch.setattr(live_streams, "vlr_live_score", fake_live_score)
+        monkeypatch.setattr(
+            live_streams,
+            "live_score_feed",
+            SharedPoller("live_score", live_streams._fetch_live_scores, diff_by_key, interval=0.001),
+        )
+
+        async def connected():
+            return False
+
+        events = live_streams.live_score_events(connected)
+        assert await events.__anext__() == 'event: snapshot\ndata: {"segments":[{"match_id":"9","score1":"0"}]}\n\n'
+        assert await events.__anext__() == (
+            'event: update\ndata: {"changed":[{"match_id":"9","score1":"1"}],"removed":[]}\n\n'
+        )
+        await events.aclose()
+
+        assert live_streams.live_score_feed.running is False
+
+
+class TestLiveStateTracker:
+    def test_classifies_matches_by_state(self):
+        from utils.live_state import LiveStateTracker
+
+        tracker = LiveStateTracker()
+        assert tracker.observe("1", live=False, eta="2d 3h").state == "upcoming"
+        assert tracker.observe("2", live=False, eta="10m").state == "starting_soon"
+        assert tracker.observe("3", live=True, map_in_progress=False).state == "between_maps"
+        assert tracker.observe("4", live=True, progress=(1, 0)).state == "active"
+        completed = tracker.observe("5", live=False, completed=True)
+        assert (completed.state, completed.ttl) == ("completed", 86400)
+        assert tracker.states()["4"] == "active"
+
+    def test_drops_to_paused_when_progress_stalls(self, monkeypatch):
+        from utils import live_state as live_state_module
+
+        now = [1000.0]
+        monkeypatch.setattr(live_state_module.time, "monotonic", lambda: now[0])
+        tracker = live_state_module.LiveStateTracker()
+
+        active = tracker.observe("1", live=True, progress=(5, 3))
+        now[0] += 200
+        paused = tracker.observe("1", live=True, progress=(5, 3))
+        resumed = tracker.observe("1", live=True, progress=(6, 3))
+
+        assert (active.state, paused.state, resumed.state) == ("active", "paused", "active")
+        assert paused.interval > active.interval
+        assert tracker.interval_for("1", 99) == resumed.interval
+        assert tracker.interval_for("unknown", 99) == 99
+
+    def test_shared_poller_accepts_interval_callable(self):
+        from utils.live_feed import SharedPoller, diff_by_key
+
+        async def fetch():
+            return {}
+
+        poller = SharedPoller("test", fetch, diff_by_key, interval=lambda state: 5 if state is None else 1)
+        assert poller.next_interval() == 5
+
+
+class TestWebhooks:
+    def test_diff_match_events_detects_start_map_end_and_completion(self):
+        from utils.webhooks import diff_match_events
+
+        def match(score):
+            return {"teams": ["A", "B"], "event": "Champions", "score": score}
+
+        baseline = {"live": {"1": match(["0", "0"])}, "results": {"9": match(["2", "0"])}}
+        assert diff_match_events(None, baseline) is None
+        assert diff_match_events(baseline, baseline) is None
+
+        current = {
+            "live": {"1": match(["1", "0"]), "2": match(["0", "0"])},
+            "results": {"9": match(["2", "0"]), "3": match(["2", "1"])},
+        }
+        events = diff_match_events(baseline, current)
+        assert [(event["type"], event["match_id"]) for event in events] == [
+            ("map_ended", "1"),
+            ("match_started", "2"),
+            ("match_completed", "3"),
+        ]
+
+    @pytest.mark.anyio
+    async def test_delivery_filters_signs_and_retries(self):
+        import hashlib
+        import hmac
+
+        from utils.webhooks import WebhookDelivery
+
+        attempts = {"a": 0, "b": 0}
+        received = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            target = request.url.path.strip("/")
+            attempts[target] += 1
+            if target == "a" and attempts["a"] == 1:
+                return httpx.Response(500)
+            received[target] = request
+            return httpx.Response(204)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        delivery = WebhookDelivery(client=client, concurrency=2, max_retries=3, retry_delay=0)
+        subscriptions = [
+            {"id": "a", "url": "http://sink.test/a", "events": ["match_started"], "secret": "k"},
+            {"id": "b", "url": "http://sink.test/b", "events": ["match_completed"], "secret": ""},
+        ]
+        events = [{"type": "match_started", "match_id": "1"}, {"type": "map_ended", "match_id": "1"}]
+
+        outcomes = await delivery.deliver(subscriptions, events)
+        await delivery.close()
+
+        assert list(outcomes) == ["a"]
+        assert outcomes["a"]["ok"] is True and outcomes["a"]["attempts"] == 2
+        assert attempts["b"] == 0
+        body = received["a"].content
+        assert body == b'{"events":[{"type":"match_started","match_id":"1"}]}'
+        expected = "sha256=" + hmac.new(b"k", body, hashlib.sha256).hexdigest()
+        assert received["a"].headers["X-Vlrggapi-Signature"] == expected
+
+    @pytest.mark.anyio
+    async def test_notifier_delivers_feed_updates(self):
+        from routers.notifications import WebhookNotifier
+        from utils.live_feed import SharedPoller
+        from utils.webhooks import WebhookDelivery, diff_match_state, webhook_store
+
+        states = iter([
+            {"live": {}, "results": {}},
+            {"live": {"7": {"teams": ["A", "B"], "event": "", "score": ["0", "0"]}}, "results": {}},
+        ])
+
+        async def fetch():
+            return next(states, {"live": {}, "results": {}})
+
+        delivered = asyncio.Event()
+        bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(request.content)
+            delivered.set()
+            return httpx.Response(200)
+
+        webhook_store.add("http://sink.test/hook", ["match_started"])
+        feed = SharedPoller("events", fetch, diff_match_state, interval=0.001)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        notifier = WebhookNotifier(feed, webhook_store, WebhookDelivery(client=client, retry_delay=0))
+
+        await notifier.ensure_running()
+        await asyncio.wait_for(delivered.wait(), timeout=2)
+        await notifier.stop()
+
+        assert b'"type":"match_started"' in bodies[0]
+        assert feed.running is False
+
+    @pytest.mark.anyio
+    async def test_notifier_starts_once_for_concurrent_callers(self):
+        from routers.notifications import WebhookNotifier
+        from utils.webhooks import WebhookDelivery, webhook_store
+
+        class CountingFeed:
+            def __init__(self):
+                self.subscribers = 0
+
+            def subscribe(self):
+                self.subscribers += 1
+                return asyncio.Queue()
+
+            def unsubscribe(self, queue):
+                pass
+
+        feed = CountingFeed()
+        notifier = WebhookNotifier(feed, webhook_store, WebhookDelivery(retry_delay=0))
+        await notifier.ensure_running()
+        assert notifier.running is False
+
+        webhook_store.add("http://sink.test/hook", ["match_started"])
+        await asyncio.gather(notifier.ensure_running(), notifier.ensure_running())
+        assert notifier.running is True and feed.subscribers == 1
+        await notifier.stop()
+
+    @pytest.mark.anyio
+    async def test_notifier_delivers_events_skipped_by_a_snapshot_resync(self):
+        from routers.notifications import WebhookNotifier
+        from utils.webhooks import WebhookDelivery, diff_match_state, webhook_store
+
+        match = {"teams": ["A", "B"], "event": "", "score": ["0", "0"]}
+        baseline = {"live": {}, "results": {}}
+        started = {"live": {"7": match}, "results": {}}
+        latest = {"live": {"8": match}, "results": {"7": match}}
+
+        class QueuedFeed:
+            # What a SharedPoller queue holds after overflowing: the update for
+            # match 8 starting was replaced by a snapshot of the latest state.
+            def __init__(self):
+                self.queue = asyncio.Queue()
+                for message in [("snapshot", baseline), ("update", diff_match_state(baseline, started)),
+                                ("error", "boom"), ("snapshot", latest)]:
+                    self.queue.put_nowait(message)
+
+            def subscribe(self):
+                return self.queue
+
+            def unsubscribe(self, queue):
+                pass
+
+        batches = []
+        delivered = asyncio.Event()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            batches.append([(event["type"], event["match_id"]) for event in json.loads(request.content)["events"]])
+            if len(batches) == 2:
+                delivered.set()
+            return httpx.Response(200)
+
+        webhook_store.add("http://sink.test/hook", ["match_started", "match_completed"])
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        notifier = WebhookNotifier(QueuedFeed(), webhook_store, WebhookDelivery(client=client, retry_delay=0))
+
+        await notifier.ensure_running()
+        await asyncio.wait_for(delivered.wait(), timeout=2)
+        await notifier.stop()
+
+        assert batches == [[("match_started", "7")], [("match_started", "8"), ("match_completed", "7")]]
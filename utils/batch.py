@@ -0,0 +1,38 @@
+"""
+Helpers for fanning out per-item work with bounded concurrency.
+"""
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def bounded_as_completed(
+    items: Iterable[T],
+    worker: Callable[[T], Awaitable[R]],
+    limit: int,
+) -> AsyncIterator[tuple[T, R | None, Exception | None]]:
+    """Run ``worker`` over ``items`` with at most ``limit`` in flight.
+
+    Yields ``(item, result, error)`` in completion order; exactly one of
+    ``result`` / ``error`` is meaningful. Work still pending when the consumer
+    stops iterating (e.g. a streaming client disconnects) is cancelled.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(item: T):
+        async with semaphore:
+            try:
+                return item, await worker(item), None
+            except Exception as exc:
+                return item, None, exc
+
+    tasks = [asyncio.create_task(run(item)) for item in items]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
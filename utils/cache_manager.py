@@ -4,11 +4,71 @@ In-memory TTL cache manager using cachetools.
 import asyncio
 import hashlib
 import json
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
 
 from cachetools import TTLCache
 
+from utils import request_timing
 from utils.constants import CACHE_MAX_SIZE
 from utils.id_mapper import id_mapper
+from utils.metrics import registry
+
+
+@dataclass
+class _BucketCounters:
+    """Lookup/fill counters for one TTL bucket."""
+    hits: int = 0
+    misses: int = 0
+    fills: int = 0
+    rejected: int = 0
+
+
+@dataclass
+class _ProducerCounters:
+    """Call/latency counters for one coalesced producer label."""
+    calls: int = 0
+    errors: int = 0
+    coalesced_waiters: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+def _ratio(part: int, whole: int) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+def estimate_size(value, _seen: set[int] | None = None) -> int:
+    """Approximate the deep in-memory size of a cached payload in bytes.
+
+    Walks dicts, lists, tuples, and sets recursively; shared objects are only
+    counted once. Objects exposing ``__slots__`` are walked slot by slot.
+    """
+    seen = _seen if _seen is not None else set()
+    obj_id = id(value)
+    if obj_id in seen:
+        return 0
+    seen.add(obj_id)
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key, seen) + estimate_size(item, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, seen)
+    elif hasattr(value, "__slots__"):
+        for slot in value.__slots__:
+            if hasattr(value, slot):
+                size += estimate_size(getattr(value, slot), seen)
+    return size
+
+
+def _total_size(values: list) -> int:
+    seen: set[int] = set()
+    return sum(estimate_size(value, seen) for value in values)
 
 
 class CacheManager:
@@ -18,6 +78,8 @@ class CacheManager:
         self._max_size = max_size
         self._caches: dict[str, TTLCache] = {}
         self._inflight: dict[str, asyncio.Task] = {}
+        self._bucket_counters: dict[str, _BucketCounters] = {}
+        self._producer_counters: dict[str, _ProducerCounters] = {}
 
     def _get_cache(self, ttl: int) -> TTLCache:
         key = str(ttl)
@@ -25,23 +87,70 @@ class CacheManager:
             self._caches[key] = TTLCache(maxsize=self._max_size, ttl=ttl)
         return self._caches[key]
 
+    def _bucket(self, ttl: int) -> _BucketCounters:
+        key = str(ttl)
+        counters = self._bucket_counters.get(key)
+        if counters is None:
+            counters = self._bucket_counters[key] = _BucketCounters()
+        return counters
+
+    def _producer(self, label: str) -> _ProducerCounters:
+        counters = self._producer_counters.get(label)
+        if counters is None:
+            counters = self._producer_counters[label] = _ProducerCounters()
+        return counters
+
     @staticmethod
     def make_cache_key(*args, **kwargs) -> str:
         """Deterministic cache key from args and kwargs."""
         raw = json.dumps({"a": args, "k": kwargs}, sort_keys=True, default=str)
         return hashlib.md5(raw.encode()).hexdigest()
 
-    def get(self, ttl: int, *args, **kwargs):
-        """Get cached value or None."""
+    def _lookup(self, ttl: int, *args, **kwargs):
+        """Get cached value or None without touching the hit/miss counters."""
         cache = self._get_cache(ttl)
         key = self.make_cache_key(*args, **kwargs)
         return cache.get(key)
 
+    def _count_lookup(self, ttl: int, hit: bool) -> None:
+        counters = self._bucket(ttl)
+        if hit:
+            counters.hits += 1
+        else:
+            counters.misses += 1
+        request_timing.record_cache_lookup(hit)
+
+    def get(self, ttl: int, *args, **kwargs):
+        """Get cached value or None."""
+        value = self._lookup(ttl, *args, **kwargs)
+        self._count_lookup(ttl, value is not None)
+        return value
+
+    def peek(self, ttl: int, *args, **kwargs):
+        """Get cached value or None without counting a lookup (for validity checks)."""
+        return self._lookup(ttl, *args, **kwargs)
+
+    def get_any(self, ttls: Iterable[int], *args, **kwargs):
+        """Get a value stored under any of ``ttls``, counted as one lookup.
+
+        A hit is credited to the bucket holding the value; a miss is charged
+        to the first TTL.
+        """
+        ttls = tuple(ttls)
+        for ttl in ttls:
+            value = self._lookup(ttl, *args, **kwargs)
+            if value is not None:
+                self._count_lookup(ttl, True)
+                return value
+        self._count_lookup(ttls[0], False)
+        return None
+
     def set(self, ttl: int, value, *args, **kwargs):
         """Store a value in the cache."""
         cache = self._get_cache(ttl)
         key = self.make_cache_key(*args, **kwargs)
         cache[key] = value
+        self._bucket(ttl).fills += 1
 
     @staticmethod
     def is_cacheable(value) -> bool:
@@ -65,20 +174,46 @@ class CacheManager:
     def set_if_cacheable(self, ttl: int, value, *args, **kwargs) -> bool:
         """Store a value only when it does not represent an upstream error."""
         if not self.is_cacheable(value):
+            self._bucket(ttl).rejected += 1
             return False
         self.set(ttl, value, *args, **kwargs)
         return True
 
-    async def coalesce_async(self, key: str, producer):
-        """Share one in-flight async producer across concurrent callers."""
+    async def _run_producer(self, counters: _ProducerCounters, producer):
+        counters.calls += 1
+        started = time.perf_counter()
+        try:
+            return await producer()
+        except Exception:
+            counters.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            counters.total_seconds += elapsed
+            if elapsed > counters.max_seconds:
+                counters.max_seconds = elapsed
+
+    async def coalesce_async(self, key: str, producer, *, label: str | None = None):
+        """Share one in-flight async producer across concurrent callers.
+
+        ``label`` groups producer statistics; it defaults to the key prefix
+        before the first ``:`` (e.g. ``match_detail`` for ``match_detail:123``).
+        """
+        counters = self._producer(label or key.split(":", 1)[0])
         task = self._inflight.get(key)
+        waited_from = None
         if task is None:
-            task = asyncio.create_task(producer())
+            task = asyncio.create_task(self._run_producer(counters, producer))
             self._inflight[key] = task
+        else:
+            counters.coalesced_waiters += 1
+            waited_from = time.perf_counter()
 
         try:
             return await task
         finally:
+            if waited_from is not None:
+                request_timing.add("coalesced", time.perf_counter() - waited_from)
             if self._inflight.get(key) is task and task.done():
                 self._inflight.pop(key, None)
 
@@ -91,7 +226,7 @@ class CacheManager:
         key = f"{ttl}:{self.make_cache_key(*args, **kwargs)}"
 
         async def build():
-            cached_value = self.get(ttl, *args, **kwargs)
+            cached_value = self._lookup(ttl, *args, **kwargs)
             if cached_value is not None:
                 return cached_value
 
@@ -99,7 +234,8 @@ class CacheManager:
             self.set_if_cacheable(ttl, value, *args, **kwargs)
             return value
 
-        return await self.coalesce_async(key, build)
+        label = str(args[0]) if args else str(ttl)
+        return await self.coalesce_async(key, build, label=label)
 
     def invalidate(self, ttl: int, *args, **kwargs):
         """Remove a specific entry."""
@@ -107,12 +243,110 @@ class CacheManager:
         key = self.make_cache_key(*args, **kwargs)
         cache.pop(key, None)
 
+    def stats(self, include_sizes: bool = True) -> dict:
+        """Return hit/miss/fill counters, entry counts, and producer latencies.
+
+        Counters are plain integer increments on the lookup path. Byte sizes
+        walk every cached payload, so they are only computed on request.
+        """
+        buckets = []
+        totals = {"hits": 0, "misses": 0, "fills": 0, "rejected": 0, "entries": 0}
+        seen: set[int] = set()
+        total_bytes = 0
+
+        for key in sorted(set(self._caches) | set(self._bucket_counters), key=int):
+            counters = self._bucket_counters.get(key, _BucketCounters())
+            cache = self._caches.get(key)
+            entries = 0
+            if cache is not None:
+                cache.expire()
+                entries = len(cache)
+
+            bucket = {
+                "ttl": int(key),
+                "entries": entries,
+                "max_size": self._max_size,
+                "hits": counters.hits,
+                "misses": counters.misses,
+                "hit_ratio": _ratio(counters.hits, counters.hits + counters.misses),
+                "fills": counters.fills,
+                "rejected": counters.rejected,
+            }
+            if include_sizes:
+                bucket_bytes = 0
+                if cache is not None:
+                    for value in cache.values():
+                        bucket_bytes += estimate_size(value, seen)
+                bucket["bytes"] = bucket_bytes
+                total_bytes += bucket_bytes
+            buckets.append(bucket)
+
+            totals["hits"] += counters.hits
+            totals["misses"] += counters.misses
+            totals["fills"] += counters.fills
+            totals["rejected"] += counters.rejected
+            totals["entries"] += entries
+
+        producers = {}
+        for label, counters in sorted(self._producer_counters.items()):
+            producers[label] = {
+                "calls": counters.calls,
+                "errors": counters.errors,
+                "coalesced_waiters": counters.coalesced_waiters,
+                "avg_seconds": round(counters.total_seconds / counters.calls, 6) if counters.calls else 0.0,
+                "max_seconds": round(counters.max_seconds, 6),
+                "total_seconds": round(counters.total_seconds, 6),
+            }
+
+        totals["hit_ratio"] = _ratio(totals["hits"], totals["hits"] + totals["misses"])
+        totals["inflight"] = len(self._inflight)
+        if include_sizes:
+            totals["bytes"] = total_bytes
+
+        return {"totals": totals, "buckets": buckets, "producers": producers}
+
+    async def total_bytes(self) -> int:
+        """Approximate deep size of every live cached payload.
+
+        The values are collected on the event loop and sized in a worker
+        thread, so the walk neither blocks the loop nor races cache writes.
+        """
+        values = []
+        for cache in self._caches.values():
+            cache.expire()
+            values.extend(cache.values())
+        return await asyncio.to_thread(_total_size, values)
+
+    def reset_stats(self):
+        """Zero all counters without touching cached values."""
+        self._bucket_counters.clear()
+        self._producer_counters.clear()
+
     def clear_all(self):
-        """Clear all caches and the id mapper."""
+        """Clear all caches, counters, and the id mapper."""
         for cache in self._caches.values():
             cache.clear()
         self._inflight.clear()
+        self.reset_stats()
         id_mapper.clear()
 
 
 cache_manager = CacheManager()
+
+
+def _bucket_samples(field: str) -> dict[tuple[str, ...], float]:
+    return {(str(bucket["ttl"]),): bucket[field] for bucket in cache_manager.stats(include_sizes=False)["buckets"]}
+
+
+registry.callback(
+    "vlrgg_cache_entries", "Live entries per cache TTL bucket.", ("ttl",),
+    lambda: _bucket_samples("entries"),
+)
+registry.callback(
+    "vlrgg_cache_hits_total", "Cache hits per TTL bucket.", ("ttl",),
+    lambda: _bucket_samples("hits"), kind="counter",
+)
+registry.callback(
+    "vlrgg_cache_misses_total", "Cache misses per TTL bucket.", ("ttl",),
+    lambda: _bucket_samples("misses"), kind="counter",
+)
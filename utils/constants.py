@@ -13,6 +13,35 @@ VLR_NEWS_URL = f"{VLR_BASE_URL}/news"
 # Rate limiting
 RATE_LIMIT = "600/minute"
 
+# Admin endpoints are disabled unless this environment variable holds a token
+ADMIN_TOKEN_ENV = "VLRGGAPI_ADMIN_TOKEN"
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+# Local SQLite stores (match archive, ...) live here; defaults to <tempdir>/vlrggapi
+DATA_DIR_ENV = "VLRGGAPI_DATA_DIR"
+# Retries (with doubling delay) for a locked database, then seconds a store stays off after an error
+SQLITE_LOCK_RETRIES = 3
+SQLITE_LOCK_RETRY_DELAY = 0.05
+SQLITE_ERROR_BACKOFF = 60
+
+# Sampling profiler
+PROFILER_MAX_SECONDS = 30
+PROFILER_DEFAULT_INTERVAL_MS = 5
+PROFILER_MIN_INTERVAL_MS = 1
+PROFILER_MAX_DEPTH = 64
+
+# Heap snapshots (tracemalloc)
+HEAP_TRACE_MAX_FRAMES = 25
+
+# Webhook notifications (match_started / map_ended / match_completed)
+WEBHOOK_POLL_INTERVAL = 60
+WEBHOOK_DELIVERY_CONCURRENCY = 4
+WEBHOOK_MAX_RETRIES = 3
+WEBHOOK_RETRY_DELAY = 1.0
+WEBHOOK_TIMEOUT = 10
+WEBHOOK_MAX_SUBSCRIPTIONS = 50
+WEBHOOK_SIGNATURE_HEADER = "X-Vlrggapi-Signature"
+
 # API Settings
 API_TITLE = "vlrggapi"
 API_DESCRIPTION = (
@@ -31,6 +60,9 @@ DEFAULT_TIMEOUT = 30
 DEFAULT_RETRIES = 3
 DEFAULT_REQUEST_DELAY = 1.0
 
+# Shared cap on concurrent upstream requests (below the client's 20 connections)
+UPSTREAM_FETCH_CONCURRENCY = 12
+
 # Circuit breaker
 CIRCUIT_FAIL_MAX = 5
 CIRCUIT_RESET_TIMEOUT = 30.0
@@ -42,11 +74,42 @@ MAX_MATCH_RETRIES = 3
 MAX_MATCH_TIMEOUT = 45
 LIVE_DETAIL_FETCH_CONCURRENCY = 4
 LIVE_DETAIL_FETCH_TIMEOUT = 10
+LIVE_STREAM_POLL_INTERVAL = 10
+LIVE_STREAM_KEEPALIVE = 15
+LIVE_MATCH_POLL_INTERVAL = 10
+
+# Adaptive live cadence: state -> (poll interval seconds, cache TTL seconds)
+LIVE_CADENCES = {
+    "active": (10, 10),
+    "paused": (30, 30),
+    "between_maps": (45, 45),
+    "starting_soon": (30, 30),
+    "upcoming": (120, 300),
+    "completed": (600, 86400),
+}
+LIVE_STREAM_IDLE_INTERVAL = 30
+LIVE_PAUSE_AFTER_SECONDS = 180
+LIVE_STARTING_SOON_SECONDS = 900
+LIVE_STATE_MAX_MATCHES = 1000
+LIVE_STATE_RETENTION = 6 * 3600
+LIVE_WS_MAX_SUBSCRIPTIONS = 10
+LIVE_WS_MAX_MATCH_FEEDS = 50
 MATCH_DETAIL_TAB_FETCH_CONCURRENCY = 4
 MATCH_DETAIL_TAB_FETCH_TIMEOUT = 10
+MAX_BATCH_MATCH_IDS = 25
+MATCH_BATCH_CONCURRENCY = 4
+MAX_BATCH_PLAYER_IDS = 25
+PLAYER_BATCH_CONCURRENCY = 4
+PLAYER_MATCHES_PAGE_CONCURRENCY = 4
+MAX_PLAYER_MATCHES_LIMIT = 1000
+MATCH_DETAIL_COMPONENTS = ("maps", "rounds", "performance", "economy", "h2h")
+STATS_MATRIX_CONCURRENCY = 6
+RANKINGS_FETCH_CONCURRENCY = 6
+RANKINGS_HISTORY_RETENTION = 365 * 86400
 
 # Cache TTLs (seconds)
 CACHE_TTL_LIVE = 30
+CACHE_TTL_LIVE_ENRICHMENT = 6 * 3600
 CACHE_TTL_UPCOMING = 300
 CACHE_TTL_RESULTS = 60
 CACHE_TTL_NEWS = 600
@@ -59,6 +122,7 @@ CACHE_MAX_SIZE = 1000
 # Cache TTLs — new scraper endpoints
 CACHE_TTL_MATCH_DETAIL = 300
 CACHE_TTL_MATCH_DETAIL_LIVE = 30
+CACHE_TTL_MATCH_DETAIL_FINISHED_MAP = 86400
 CACHE_TTL_PLAYER = 1800
 CACHE_TTL_PLAYER_MATCHES = 600
 CACHE_TTL_TEAM = 1800
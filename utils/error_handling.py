@@ -3,17 +3,20 @@ Error handling utilities for VLR.GG API
 """
 import asyncio
 import logging
+from datetime import datetime
 from functools import wraps
 
 import httpx
 from fastapi import HTTPException
 
 from utils.constants import (
+    MATCH_DETAIL_COMPONENTS,
     MAX_MATCH_PAGE_WINDOW,
     MAX_MATCH_RETRIES,
     MAX_MATCH_TIMEOUT,
 )
 from utils.http_client import CircuitOpenError
+from utils.metrics import finish_scraper, start_scraper
 from utils.utils import region
 
 logger = logging.getLogger(__name__)
@@ -45,41 +48,56 @@ def raise_for_upstream_status(status_code: int, context: str) -> None:
 
 
 def handle_scraper_errors(func):
-    """Decorator to handle common scraper errors. Works with both sync and async functions."""
-    def _raise_http_error(exc: Exception):
+    """Decorator to handle common scraper errors. Works with both sync and async functions.
+
+    Each call is also timed into the metrics registry under the scraper's name.
+    """
+    def _to_http_error(exc: Exception) -> HTTPException:
         if isinstance(exc, HTTPException):
-            raise exc
+            return exc
 
         if isinstance(exc, CircuitOpenError):
             logger.warning("Circuit open in %s: %s", func.__name__, exc)
-            raise HTTPException(status_code=503, detail=str(exc))
+            return HTTPException(status_code=503, detail=str(exc))
 
         if isinstance(exc, httpx.TimeoutException):
             logger.error("Timeout in %s: %s", func.__name__, exc)
-            raise HTTPException(status_code=504, detail="Upstream request timed out")
+            return HTTPException(status_code=504, detail="Upstream request timed out")
 
         if isinstance(exc, httpx.HTTPError):
             logger.error("HTTP error in %s: %s", func.__name__, exc)
-            raise HTTPException(status_code=502, detail="Failed to fetch data from VLR.GG")
+            return HTTPException(status_code=502, detail="Failed to fetch data from VLR.GG")
 
         logger.exception("Unexpected error in %s", func.__name__)
-        raise HTTPException(status_code=500, detail="Internal server error")
+        return HTTPException(status_code=500, detail="Internal server error")
 
     if asyncio.iscoroutinefunction(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
+            token, timer = start_scraper(func.__name__)
+            status = None
             try:
                 return await func(*args, **kwargs)
             except Exception as exc:
-                _raise_http_error(exc)
+                http_exc = _to_http_error(exc)
+                status = http_exc.status_code
+                raise http_exc
+            finally:
+                finish_scraper(token, timer, status)
         return wrapper
     else:
         @wraps(func)
         def wrapper(*args, **kwargs):
+            token, timer = start_scraper(func.__name__)
+            status = None
             try:
                 return func(*args, **kwargs)
             except Exception as exc:
-                _raise_http_error(exc)
+                http_exc = _to_http_error(exc)
+                status = http_exc.status_code
+                raise http_exc
+            finally:
+                finish_scraper(token, timer, status)
         return wrapper
 
 
@@ -129,6 +147,43 @@ def validate_player_timespan(ts: str):
         )
 
 
+def parse_match_detail_include(include: str | None) -> frozenset[str] | None:
+    """Parse a comma-separated include list for match details. Raises 400 on invalid.
+
+    Returns None (all components) when the parameter is omitted or empty.
+    """
+    if include is None or not include.strip():
+        return None
+    parts = {part.strip().lower() for part in include.split(",") if part.strip()}
+    invalid = parts - set(MATCH_DETAIL_COMPONENTS)
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Invalid include value(s) {', '.join(sorted(invalid))}. "
+                f"Valid values: {', '.join(MATCH_DETAIL_COMPONENTS)}"
+            ),
+        )
+    return frozenset(parts)
+
+
+def parse_choice_list(value: str | None, choices: list[str], name: str) -> list[str]:
+    """Parse a comma-separated subset of ``choices`` in request order. Raises 400 on invalid.
+
+    Returns every choice when the parameter is omitted or empty.
+    """
+    if value is None or not value.strip():
+        return list(choices)
+    parts = list(dict.fromkeys(part.strip().lower() for part in value.split(",") if part.strip()))
+    invalid = [part for part in parts if part not in choices]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {name} value(s) {', '.join(invalid)}. Valid values: {', '.join(choices)}",
+        )
+    return parts
+
+
 def validate_id_param(value: str, name: str = "id"):
     """Validate that an ID parameter is a positive integer string. Raises 400 on invalid."""
     if not value or not value.isdigit():
@@ -138,6 +193,40 @@ def validate_id_param(value: str, name: str = "id"):
         )
 
 
+def validate_date_param(value: str, name: str = "date"):
+    """Validate a YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS' string. Raises 400 on invalid."""
+    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S"):
+        try:
+            datetime.strptime(value, fmt)
+            return
+        except ValueError:
+            continue
+    raise HTTPException(
+        status_code=400,
+        detail=f"Invalid {name} '{value}'. Use YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS'.",
+    )
+
+
+def parse_page_range(value: str) -> tuple[int, int]:
+    """Parse '3' or '1-10' into an inclusive (first, last) page range. Raises 400 on invalid.
+
+    The window may span at most MAX_MATCH_PAGE_WINDOW pages.
+    """
+    first, _, last = value.strip().partition("-")
+    if not first.strip().isdigit() or (last and not last.strip().isdigit()):
+        raise HTTPException(status_code=400, detail=f"Invalid pages '{value}'. Use a page number or a range like 1-10.")
+    start = int(first)
+    end = int(last) if last else start
+    if start < 1 or end < start:
+        raise HTTPException(status_code=400, detail=f"Invalid pages '{value}'. Pages start at 1 and must be ascending.")
+    if end - start + 1 > MAX_MATCH_PAGE_WINDOW:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Requested page window ({end - start + 1}) exceeds the maximum allowed ({MAX_MATCH_PAGE_WINDOW}).",
+        )
+    return start, end
+
+
 def validate_match_workload(
     num_pages: int,
     from_page: int | None,
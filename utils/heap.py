@@ -0,0 +1,174 @@
+"""
+tracemalloc-based heap snapshots for diagnosing memory growth.
+
+Tracing is off by default; ``HeapTracker.start`` turns it on and records a
+baseline, and ``HeapTracker.report`` takes a new snapshot, diffs it against
+the baseline, and groups live allocations by the innermost frame that
+belongs to a known module.
+
+Allocations are attributed to the code that made them, so cached payloads
+show up under ``scrapers`` (which built them) rather than ``cache_manager``;
+the cache's own footprint is reported separately via ``estimate_size``.
+Memory held by lexbor (selectolax's C parser) is allocated outside the
+Python allocator and is only visible in the process RSS figure.
+
+Snapshots and diffs take seconds on a large heap, so they run in a worker
+thread instead of on the event loop.
+"""
+import asyncio
+import os
+import threading
+import tracemalloc
+
+from utils.cache_manager import cache_manager
+from utils.constants import HEAP_TRACE_MAX_FRAMES
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (group, path fragment) checked in order against each frame's filename.
+_MODULE_GROUPS = (
+    ("scrapers", os.path.join(_REPO_ROOT, "api", "scrapers") + os.sep),
+    ("cache_manager", os.path.join(_REPO_ROOT, "utils", "cache_manager.py")),
+    ("http_client", os.path.join(_REPO_ROOT, "utils", "http_client.py")),
+    ("html_parsers", os.path.join(_REPO_ROOT, "utils", "html_parsers.py")),
+    ("httpx", f"{os.sep}httpx{os.sep}"),
+    ("httpx", f"{os.sep}httpcore{os.sep}"),
+    ("selectolax", f"{os.sep}selectolax{os.sep}"),
+)
+OTHER_GROUP = "other"
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _group_for(traceback: tracemalloc.Traceback) -> str:
+    # Traceback frames run oldest to most recent; the innermost match wins.
+    for frame in reversed(traceback):
+        for group, fragment in _MODULE_GROUPS:
+            if fragment in frame.filename:
+                return group
+    return OTHER_GROUP
+
+
+def _group_sizes(snapshot: tracemalloc.Snapshot) -> dict[str, dict]:
+    groups: dict[str, dict] = {}
+    for stat in snapshot.statistics("traceback"):
+        entry = groups.setdefault(_group_for(stat.traceback), {"bytes": 0, "blocks": 0})
+        entry["bytes"] += stat.size
+        entry["blocks"] += stat.count
+    return groups
+
+
+def process_rss_bytes() -> int | None:
+    """Resident set size from /proc, or None where unavailable."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+class HeapTracker:
+    """Owns the tracemalloc lifecycle and the baseline snapshot."""
+
+    def __init__(self) -> None:
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    async def start(self, frames: int = HEAP_TRACE_MAX_FRAMES) -> None:
+        """Begin tracing with ``frames`` frames per allocation and record a fresh baseline.
+
+        Tracing that is already on with a different depth is restarted, which
+        forgets allocations traced so far.
+        """
+        await asyncio.to_thread(self._start, frames)
+
+    def _start(self, frames: int) -> None:
+        with self._lock:
+            if tracemalloc.is_tracing() and tracemalloc.get_traceback_limit() != frames:
+                tracemalloc.stop()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            self._baseline = self._take()
+
+    async def stop(self) -> None:
+        """Stop tracing and drop the baseline, releasing tracemalloc's memory.
+
+        Runs in a worker thread: it waits for any report still holding the lock.
+        """
+        await asyncio.to_thread(self._stop)
+
+    def _stop(self) -> None:
+        with self._lock:
+            self._baseline = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    async def report(self, top: int = 10, rebase: bool = False) -> dict:
+        """Summarize memory use; includes heap data only while tracing.
+
+        ``rebase`` replaces the baseline with the new snapshot so the next
+        report diffs against this point.
+        """
+        report = {
+            "tracing": self.tracing,
+            "rss_bytes": process_rss_bytes(),
+            "cache_bytes": await cache_manager.total_bytes(),
+        }
+        if self.tracing:
+            report.update(await asyncio.to_thread(self._heap_report, top, rebase))
+        return report
+
+    def _heap_report(self, top: int, rebase: bool) -> dict:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                return {"tracing": False}
+            return self._diff(top, rebase)
+
+    def _diff(self, top: int, rebase: bool) -> dict:
+        report: dict = {"frames": tracemalloc.get_traceback_limit()}
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = self._take()
+        groups = _group_sizes(snapshot)
+        if self._baseline is not None:
+            before = _group_sizes(self._baseline)
+            for name, entry in groups.items():
+                entry["delta_bytes"] = entry["bytes"] - before.get(name, {}).get("bytes", 0)
+            for name, entry in before.items():
+                groups.setdefault(name, {"bytes": 0, "blocks": 0, "delta_bytes": -entry["bytes"]})
+            diff = snapshot.compare_to(self._baseline, "lineno")
+            report["top_growth"] = [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_diff_bytes": stat.size_diff,
+                    "bytes": stat.size,
+                    "blocks": stat.count,
+                }
+                for stat in diff[:top]
+            ]
+
+        report["traced_bytes"] = current
+        report["traced_peak_bytes"] = peak
+        report["tracemalloc_overhead_bytes"] = tracemalloc.get_tracemalloc_memory()
+        report["groups"] = dict(sorted(groups.items(), key=lambda item: -item[1]["bytes"]))
+        if rebase:
+            self._baseline = snapshot
+        return report
+
+
+heap_tracker = HeapTracker()
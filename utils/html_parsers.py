@@ -2,6 +2,7 @@
 Common HTML parsing utilities for VLR.GG scrapers
 """
 import re
+import time
 from datetime import UTC, datetime, timedelta
 from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
@@ -9,6 +10,8 @@ from zoneinfo import ZoneInfo
 from selectolax.lexbor import LexborHTMLParser
 from selectolax.parser import HTMLParser  # noqa: F401  re-exported for type hints
 
+from utils.metrics import observe_parse
+
 
 def extract_text_content(element, strip: bool = True) -> str:
     """Extract text content from an HTML element safely, collapsing internal whitespace."""
@@ -230,25 +233,42 @@ def combine_date_and_time(date_str: str, time_text: str) -> str:
     return utc_dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
-def parse_match_timestamp(item, date_str: str) -> str:
+def normalize_utc_timestamp(value: str) -> str:
+    """A ``data-utc-ts`` value (unix seconds or 'YYYY-MM-DD HH:MM:SS') as
+    'YYYY-MM-DD HH:MM:SS' in UTC ('' if unparseable)."""
+    value = (value or "").strip()
+    if value.isdigit():
+        try:
+            return datetime.fromtimestamp(int(value), tz=UTC).strftime("%Y-%m-%d %H:%M:%S")
+        except (ValueError, OSError, OverflowError):
+            return ""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return ""
+
+
+TIMESTAMP_UTC = "utc"
+TIMESTAMP_ETA = "eta"
+TIMESTAMP_SCHEDULE = "schedule"
+
+
+def match_timestamp_with_source(item, date_str: str) -> tuple[str, str]:
     """Multi-strategy timestamp extraction for a match item.
 
-    1. .moment-tz-convert[data-utc-ts]
-    2. .ml-eta countdown -> utcnow() + delta
-    3. date header + .match-item-time -> Eastern -> UTC
-    4. '' if all fail
+    Returns ``(timestamp, source)``, where source names the strategy used:
+
+    1. TIMESTAMP_UTC: .moment-tz-convert[data-utc-ts]
+    2. TIMESTAMP_ETA: .ml-eta countdown -> utcnow() + delta (approximate)
+    3. TIMESTAMP_SCHEDULE: date header + .match-item-time -> Eastern -> UTC
+    4. ('', '') if all fail
     """
     # Strategy 1: direct UTC timestamp element
     ts_elem = item.css_first(".moment-tz-convert")
     if ts_elem:
-        unix_ts = ts_elem.attributes.get("data-utc-ts")
-        if unix_ts:
-            try:
-                return datetime.fromtimestamp(
-                    int(unix_ts), tz=UTC
-                ).strftime("%Y-%m-%d %H:%M:%S")
-            except (ValueError, OSError):
-                pass
+        timestamp = normalize_utc_timestamp(ts_elem.attributes.get("data-utc-ts") or "")
+        if timestamp:
+            return timestamp, TIMESTAMP_UTC
 
     # Strategy 2: ETA countdown
     eta_elem = item.css_first(".ml-eta")
@@ -256,7 +276,7 @@ def parse_match_timestamp(item, date_str: str) -> str:
         delta = parse_eta_to_timedelta(eta_elem.text())
         if delta is not None:
             utc_dt = datetime.now(UTC) + delta
-            return utc_dt.strftime("%Y-%m-%d %H:%M:%S")
+            return utc_dt.strftime("%Y-%m-%d %H:%M:%S"), TIMESTAMP_ETA
 
     # Strategy 3: date header + match time
     time_elem = item.css_first(".match-item-time")
@@ -264,9 +284,14 @@ def parse_match_timestamp(item, date_str: str) -> str:
         time_text = time_elem.text().strip()
         result = combine_date_and_time(date_str, time_text)
         if result:
-            return result
+            return result, TIMESTAMP_SCHEDULE
 
-    return ""
+    return "", ""
+
+
+def parse_match_timestamp(item, date_str: str) -> str:
+    """The timestamp from ``match_timestamp_with_source``, without its source."""
+    return match_timestamp_with_source(item, date_str)[0]
 
 
 # --- Shared helpers for new scrapers ---
@@ -321,7 +346,10 @@ def strip_html(html: str) -> str:
 
 def parse_html(html: str):
     """Strip noise from HTML then parse with selectolax (lexbor backend)."""
-    return LexborHTMLParser(strip_html(html))
+    started = time.perf_counter()
+    tree = LexborHTMLParser(strip_html(html))
+    observe_parse(time.perf_counter() - started)
+    return tree
 
 
 def parse_match_items(html, container_selector: str = "a.wf-module-item.match-item") -> list[dict]:
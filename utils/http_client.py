@@ -4,19 +4,24 @@ Async HTTP client singleton using httpx.
 import asyncio
 import logging
 import time
+import weakref
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 
 import httpx
 
+from utils import request_timing
 from utils.constants import (
     CIRCUIT_FAIL_MAX,
     CIRCUIT_RESET_TIMEOUT,
     DEFAULT_REQUEST_DELAY,
     DEFAULT_RETRIES,
     DEFAULT_TIMEOUT,
+    UPSTREAM_FETCH_CONCURRENCY,
 )
+from utils.metrics import CIRCUIT_REJECTIONS, observe_retry, observe_upstream, registry
 from utils.utils import headers
 
 logger = logging.getLogger(__name__)
@@ -76,6 +81,10 @@ class CircuitBreaker:
             self._opened_at[host] = time.monotonic()
             logger.warning("Circuit opened for %s after %d consecutive failures", host, count)
 
+    def snapshot(self) -> dict[str, str]:
+        """Return the current state of every host seen so far."""
+        return {host: self._current_state(host) for host in list(self._state)}
+
     def reset(self) -> None:
         """Clear all state. Intended for use in tests."""
         self._failures.clear()
@@ -85,6 +94,22 @@ class CircuitBreaker:
 
 circuit_breaker = CircuitBreaker()
 
+_CIRCUIT_STATE_VALUES = {
+    CircuitBreaker._CLOSED: 0,
+    CircuitBreaker._HALF_OPEN: 1,
+    CircuitBreaker._OPEN: 2,
+}
+
+registry.callback(
+    "vlrgg_circuit_state",
+    "Circuit breaker state per upstream host (0=closed, 1=half-open, 2=open).",
+    ("host",),
+    lambda: {
+        (host,): _CIRCUIT_STATE_VALUES[state]
+        for host, state in circuit_breaker.snapshot().items()
+    },
+)
+
 
 def _parse_retry_after(response: httpx.Response) -> float | None:
     """Parse the Retry-After header into seconds. Returns None if absent or unparseable."""
@@ -119,6 +144,41 @@ def get_http_client() -> httpx.AsyncClient:
     return _client
 
 
+_upstream_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def upstream_slots() -> asyncio.Semaphore:
+    """Process-wide cap on concurrent upstream requests for the running event loop.
+
+    Every fetch_with_retries attempt holds a slot while its request is in
+    flight (not while backing off), so batch fan-out from any endpoint shares
+    one budget.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _upstream_slots.get(loop)
+    if slots is None:
+        slots = _upstream_slots[loop] = asyncio.Semaphore(UPSTREAM_FETCH_CONCURRENCY)
+    return slots
+
+
+@asynccontextmanager
+async def upstream_slot():
+    """Hold one shared upstream slot; time spent queueing is added to Server-Timing."""
+    slots = upstream_slots()
+    if slots.locked():
+        queued_at = time.perf_counter()
+        await slots.acquire()
+        request_timing.add("upstream_queue", time.perf_counter() - queued_at)
+    else:
+        await slots.acquire()
+    try:
+        yield
+    finally:
+        slots.release()
+
+
 async def fetch_with_retries(
     url: str,
     *,
@@ -135,6 +195,7 @@ async def fetch_with_retries(
     circuit failures (they indicate rate-limiting, not a service outage).
     """
     if not circuit_breaker.allow_request(url):
+        CIRCUIT_REJECTIONS.inc(host=urlparse(url).netloc)
         raise CircuitOpenError(
             f"Circuit open for {urlparse(url).netloc} — request to {url} blocked"
         )
@@ -145,18 +206,29 @@ async def fetch_with_retries(
 
     for attempt in range(1, retries + 1):
         try:
-            response = await client.get(url, timeout=timeout)
+            async with upstream_slot():
+                started = time.perf_counter()
+                response = await client.get(url, timeout=timeout)
         except httpx.RequestError as exc:
+            observe_upstream(url, "error", time.perf_counter() - started)
             if attempt >= retries:
                 circuit_breaker.record_failure(url)
                 raise
+            backoff = request_delay * (2 ** (attempt - 1))
             logger.warning(
                 "Retrying %s after request error on attempt %d/%d: %s",
                 url, attempt, retries, exc,
             )
-            await asyncio.sleep(request_delay * (2 ** (attempt - 1)))
+            observe_retry(url, "request_error", backoff)
+            await asyncio.sleep(backoff)
             continue
 
+        observe_upstream(
+            url,
+            response.status_code,
+            time.perf_counter() - started,
+            getattr(response, "num_bytes_downloaded", 0),
+        )
         last_response = response
 
         if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= retries:
@@ -175,6 +247,7 @@ async def fetch_with_retries(
             "Retrying %s after upstream status %d on attempt %d/%d (backoff %.1fs)",
             url, response.status_code, attempt, retries, backoff,
         )
+        observe_retry(url, response.status_code, backoff)
         await asyncio.sleep(backoff)
 
     if last_response is not None:
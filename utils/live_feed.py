@@ -0,0 +1,139 @@
+"""
+Shared background pollers that fan live data out to many subscribers.
+
+A ``SharedPoller`` runs one fetch loop no matter how many clients are
+listening: it starts with the first subscriber, stops with the last, and
+pushes only what changed between successive snapshots to every subscriber
+queue. Upstream load therefore depends on the poll interval, not the
+audience size.
+"""
+import asyncio
+import contextvars
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def diff_by_key(previous: dict[str, dict], current: dict[str, dict]) -> dict | None:
+    """Compare two ``{key: item}`` snapshots.
+
+    Returns ``{"changed": [...], "removed": [...]}`` or None when identical.
+    """
+    changed = [item for key, item in current.items() if previous.get(key) != item]
+    removed = [key for key in previous if key not in current]
+    if not changed and not removed:
+        return None
+    return {"changed": changed, "removed": removed}
+
+
+class SharedPoller:
+    """One polling task per feed, shared by every subscriber.
+
+    ``fetch`` returns the current snapshot; ``diff(previous, current)``
+    returns the message to publish, or None when nothing changed. Each
+    subscriber receives ``("snapshot", state)`` first and ``("update", delta)``
+    afterwards; a failed fetch publishes ``("error", message)`` and the feed
+    keeps polling. A subscriber that falls ``queue_size`` messages behind is
+    resynchronised with a fresh snapshot instead of blocking the feed.
+
+    ``interval`` is either a fixed number of seconds or a callable that
+    receives the latest snapshot (None before the first successful fetch)
+    and returns the delay before the next poll.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        diff: Callable[[Any, Any], Any],
+        interval: float | Callable[[Any], float],
+        queue_size: int = 16,
+    ) -> None:
+        self.name = name
+        self.interval = interval
+        self._fetch = fetch
+        self._diff = diff
+        self._queue_size = queue_size
+        self._subscribers: set[asyncio.Queue] = set()
+        self._task: asyncio.Task | None = None
+        self._state: Any = None
+        self._ready = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.add(queue)
+        if self._ready.is_set():
+            queue.put_nowait(("snapshot", self._state))
+        if not self.running:
+            # A fresh context keeps the poller from inheriting (and growing)
+            # the first subscriber's per-request state.
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name=f"poller:{self.name}", context=contextvars.Context()
+            )
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+            self._state = None
+            self._ready = asyncio.Event()
+
+    def next_interval(self) -> float:
+        if callable(self.interval):
+            return self.interval(self._state)
+        return self.interval
+
+    def _publish(self, message: tuple[str, Any]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("snapshot", self._state))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                current = await self._fetch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Live poller %s fetch failed: %s", self.name, exc)
+                self._publish(("error", getattr(exc, "detail", None) or str(exc) or type(exc).__name__))
+            else:
+                if not self._ready.is_set():
+                    self._state = current
+                    self._ready.set()
+                    self._publish(("snapshot", current))
+                else:
+                    delta = self._diff(self._state, current)
+                    self._state = current
+                    if delta is not None:
+                        self._publish(("update", delta))
+            await asyncio.sleep(self.next_interval())
+
+    async def stop(self) -> None:
+        """Cancel the polling task and drop all subscribers (app shutdown)."""
+        task, self._task = self._task, None
+        self._subscribers.clear()
+        self._state = None
+        self._ready = asyncio.Event()
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, RuntimeError):
+                pass
@@ -0,0 +1,127 @@
+"""
+Per-match live state tracking used to pick refresh cadence.
+
+Every time a scraper sees a match it reports what it observed (live flag,
+whether a map is in progress, the ETA text, and a progress fingerprint built
+with ``live_progress``). The tracker classifies the match and returns a
+``Cadence``: how often to poll it and how long to cache data read from it.
+"""
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+
+from utils.constants import (
+    LIVE_CADENCES,
+    LIVE_PAUSE_AFTER_SECONDS,
+    LIVE_STARTING_SOON_SECONDS,
+    LIVE_STATE_MAX_MATCHES,
+    LIVE_STATE_RETENTION,
+)
+from utils.html_parsers import parse_eta_to_timedelta
+from utils.numeric import parse_number
+
+ACTIVE = "active"
+PAUSED = "paused"
+BETWEEN_MAPS = "between_maps"
+STARTING_SOON = "starting_soon"
+UPCOMING = "upcoming"
+COMPLETED = "completed"
+
+
+@dataclass(frozen=True)
+class Cadence:
+    state: str
+    interval: float
+    ttl: int
+
+
+def cadence_for(state: str) -> Cadence:
+    interval, ttl = LIVE_CADENCES[state]
+    return Cadence(state, interval, ttl)
+
+
+def cadence_ttls() -> set[int]:
+    """Every cache TTL a cadence can assign (for multi-bucket lookups)."""
+    return {ttl for _, ttl in LIVE_CADENCES.values()}
+
+
+def live_progress(series_score: Iterable, map_score: Iterable) -> tuple:
+    """Canonical progress fingerprint: the series score plus the current map's rounds.
+
+    Several pages report the same match (the homepage live scores and the
+    match detail page), so they must all build their fingerprint here;
+    otherwise alternating sources would look like progress on every poll.
+    """
+    return tuple(parse_number(value) for value in series_score), tuple(parse_number(value) for value in map_score)
+
+
+@dataclass
+class _MatchState:
+    progress: tuple
+    changed_at: float
+    cadence: Cadence
+
+
+class LiveStateTracker:
+    """Remembers when each match last made progress."""
+
+    def __init__(self) -> None:
+        self._matches: TTLCache = TTLCache(maxsize=LIVE_STATE_MAX_MATCHES, ttl=LIVE_STATE_RETENTION)
+
+    def observe(
+        self,
+        match_id: str,
+        *,
+        live: bool,
+        completed: bool = False,
+        map_in_progress: bool = True,
+        eta: str = "",
+        progress: tuple = (),
+    ) -> Cadence:
+        """Record an observation and return the cadence the match should use.
+
+        Live matches whose ``progress`` fingerprint has not changed for
+        ``LIVE_PAUSE_AFTER_SECONDS`` (technical pauses, long timeouts) drop
+        from ``active`` to ``paused``.
+        """
+        now = time.monotonic()
+        previous = self._matches.get(match_id)
+        changed_at = now
+        if previous is not None and previous.progress == progress:
+            changed_at = previous.changed_at
+
+        if completed:
+            state = COMPLETED
+        elif not live:
+            eta_delta = parse_eta_to_timedelta(eta)
+            soon = eta_delta is not None and eta_delta.total_seconds() <= LIVE_STARTING_SOON_SECONDS
+            state = STARTING_SOON if soon else UPCOMING
+        elif not map_in_progress:
+            state = BETWEEN_MAPS
+        elif now - changed_at >= LIVE_PAUSE_AFTER_SECONDS:
+            state = PAUSED
+        else:
+            state = ACTIVE
+
+        cadence = cadence_for(state)
+        self._matches[match_id] = _MatchState(progress, changed_at, cadence)
+        return cadence
+
+    def cadence(self, match_id: str) -> Cadence | None:
+        entry = self._matches.get(match_id)
+        return entry.cadence if entry is not None else None
+
+    def interval_for(self, match_id: str, default: float) -> float:
+        cadence = self.cadence(match_id)
+        return cadence.interval if cadence is not None else default
+
+    def states(self) -> dict[str, str]:
+        return {match_id: entry.cadence.state for match_id, entry in list(self._matches.items())}
+
+    def clear(self) -> None:
+        self._matches.clear()
+
+
+live_state = LiveStateTracker()
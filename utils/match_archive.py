@@ -0,0 +1,70 @@
+"""
+Permanent archive of fully parsed, completed match details.
+
+Completed vlr.gg match pages do not change, so once a final match has been
+scraped with every component its segment is stored here and served from
+disk on every later request.
+"""
+import time
+
+from utils.sqlite_store import SQLiteStore, pack_json, unpack_json
+
+COMPLETED_STATUSES = {"final"}
+
+
+def is_completed_status(status: str) -> bool:
+    return status.strip().lower() in COMPLETED_STATUSES
+
+
+class MatchArchive(SQLiteStore):
+    """match_id -> compressed segment, plus a few columns for listing."""
+
+    filename = "match_archive.sqlite3"
+    schema = """
+        CREATE TABLE IF NOT EXISTS matches (
+            match_id TEXT PRIMARY KEY,
+            archived_at REAL NOT NULL,
+            event TEXT NOT NULL DEFAULT '',
+            date TEXT NOT NULL DEFAULT '',
+            teams TEXT NOT NULL DEFAULT '',
+            payload BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS matches_archived_at ON matches (archived_at);
+    """
+
+    def get(self, match_id: str) -> dict | None:
+        rows = self._query("SELECT payload FROM matches WHERE match_id = ?", (match_id,))
+        return unpack_json(rows[0][0]) if rows else None
+
+    def put(self, segment: dict) -> bool:
+        teams = " vs ".join(team.get("name", "") for team in segment.get("teams", []))
+        return self._execute(
+            "INSERT OR REPLACE INTO matches (match_id, archived_at, event, date, teams, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                str(segment["match_id"]),
+                time.time(),
+                segment.get("event", {}).get("name", ""),
+                segment.get("date", ""),
+                teams,
+                pack_json(segment),
+            ),
+        )
+
+    def list(self, limit: int, offset: int = 0) -> list[dict]:
+        rows = self._query(
+            "SELECT match_id, archived_at, event, date, teams FROM matches "
+            "ORDER BY archived_at DESC LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+        return [
+            {"match_id": match_id, "archived_at": archived_at, "event": event, "date": date, "teams": teams}
+            for match_id, archived_at, event, date, teams in rows
+        ]
+
+    def count(self) -> int:
+        rows = self._query("SELECT COUNT(*) FROM matches")
+        return rows[0][0] if rows else 0
+
+
+match_archive = MatchArchive()
@@ -0,0 +1,303 @@
+"""
+Local, indexed store of every match the scrapers have seen.
+
+Listing scrapers (results, upcoming, event and team match lists) and the
+match detail scraper upsert what they parse here, so questions like "all
+matches of team X in event Y" can be answered from SQLite indexes instead of
+paginating through VLR.GG. Fields a source does not know are left empty and
+never overwrite values another source already stored.
+
+``match_time`` is the scheduled start in UTC. Sources that only know when a
+match ended (the results page's "3h ago") report ``completed_at`` instead,
+and start times estimated from a countdown are flagged with
+``match_time_approximate``. Both are kept as an approximate ``match_time``
+until a source with the start day or the exact start time replaces it.
+"""
+import base64
+import binascii
+import json
+import re
+import time
+from datetime import UTC, datetime
+
+from utils.html_parsers import parse_eta_to_timedelta
+from utils.sqlite_store import SQLiteStore
+
+UPCOMING = "upcoming"
+LIVE = "live"
+COMPLETED = "completed"
+MATCH_STATES = (UPCOMING, LIVE, COMPLETED)
+
+SORT_COLUMNS = {"date": "match_time", "match_id": "match_num"}
+
+# How much a stored match_time can be trusted; higher values replace lower.
+TIME_UNKNOWN = 0
+TIME_APPROXIMATE = 1
+TIME_DAY = 2
+TIME_EXACT = 3
+
+_COLUMNS = (
+    "match_time", "state", "event", "event_id", "series",
+    "team1", "team2", "score1", "score2",
+)
+
+_MONTH_DAY_YEAR = re.compile(r"([A-Z][a-z]+) (\d{1,2}), (\d{4})")
+_YEAR_MONTH_DAY = re.compile(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})")
+
+
+def normalize_day(text: str) -> str:
+    """'Mon, February 9, 2026' / '2026/02/09' -> '2026-02-09' ('' if unparseable)."""
+    if not text:
+        return ""
+    match = _MONTH_DAY_YEAR.search(text)
+    if match:
+        try:
+            return datetime.strptime(" ".join(match.groups()), "%B %d %Y").strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    match = _YEAR_MONTH_DAY.search(text)
+    if match:
+        year, month, day = (int(part) for part in match.groups())
+        try:
+            return datetime(year, month, day).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    return ""
+
+
+def time_from_ago(text: str) -> str:
+    """'3h 5m ago' -> approximate UTC completion time ('' if unparseable)."""
+    delta = parse_eta_to_timedelta(text.replace("ago", ""))
+    if delta is None:
+        return ""
+    return datetime.fromtimestamp(time.time() - delta.total_seconds(), tz=UTC).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def state_from_status(status: str) -> str:
+    status = status.strip().lower()
+    if not status:
+        return ""
+    if "live" in status:
+        return LIVE
+    if status in {"final", "completed"}:
+        return COMPLETED
+    return UPCOMING
+
+
+def _match_time(record: dict) -> tuple[str, int]:
+    """The record's start time (or approximate completion time) and its precision."""
+    start = str(record.get("match_time") or "").strip()
+    if len(start) == 19:
+        return start, TIME_APPROXIMATE if record.get("match_time_approximate") else TIME_EXACT
+    if len(start) == 10:
+        return start, TIME_DAY
+    completed_at = str(record.get("completed_at") or "").strip()
+    if completed_at:
+        return completed_at, TIME_APPROXIMATE
+    return "", TIME_UNKNOWN
+
+
+def encode_cursor(value: str | int, match_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, match_id]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str | int, int]:
+    """Inverse of ``encode_cursor``; raises ValueError on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, match_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError) as exc:
+        raise ValueError("malformed cursor") from exc
+    if not isinstance(match_id, int) or not isinstance(value, (str, int)):
+        raise ValueError("malformed cursor")
+    return value, match_id
+
+
+class MatchStore(SQLiteStore):
+    """Matches keyed by id, with lower-cased lookup columns for the indexes."""
+
+    filename = "matches.sqlite3"
+    schema = """
+        CREATE TABLE IF NOT EXISTS matches (
+            match_id TEXT PRIMARY KEY,
+            match_num INTEGER NOT NULL,
+            match_time TEXT NOT NULL DEFAULT '',
+            state TEXT NOT NULL DEFAULT '',
+            event TEXT NOT NULL DEFAULT '',
+            event_key TEXT NOT NULL DEFAULT '',
+            event_id TEXT NOT NULL DEFAULT '',
+            series TEXT NOT NULL DEFAULT '',
+            team1 TEXT NOT NULL DEFAULT '',
+            team1_key TEXT NOT NULL DEFAULT '',
+            team2 TEXT NOT NULL DEFAULT '',
+            team2_key TEXT NOT NULL DEFAULT '',
+            score1 TEXT NOT NULL DEFAULT '',
+            score2 TEXT NOT NULL DEFAULT '',
+            time_precision INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS matches_time ON matches (match_time, match_num);
+        CREATE INDEX IF NOT EXISTS matches_team1 ON matches (team1_key, match_time);
+        CREATE INDEX IF NOT EXISTS matches_team2 ON matches (team2_key, match_time);
+        CREATE INDEX IF NOT EXISTS matches_event ON matches (event_key, match_time);
+        CREATE INDEX IF NOT EXISTS matches_event_id ON matches (event_id, match_time);
+        CREATE INDEX IF NOT EXISTS matches_state ON matches (state, match_time);
+        CREATE TABLE IF NOT EXISTS match_players (
+            match_id TEXT NOT NULL,
+            player_key TEXT NOT NULL,
+            player TEXT NOT NULL,
+            team TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (match_id, player_key)
+        );
+        CREATE INDEX IF NOT EXISTS match_players_player ON match_players (player_key);
+    """
+
+    def upsert(self, records: list[dict]) -> bool:
+        """Insert or merge match records (dicts with ``match_id`` plus any of
+        ``_COLUMNS``, ``completed_at`` and ``match_time_approximate``).
+
+        Empty values never overwrite stored ones, and a match time only
+        replaces a stored one of equal or lower precision: an exact start
+        time is never replaced by a start day or an approximate (completion
+        or countdown) time, and a start day never by an approximate one.
+        """
+        rows = []
+        now = time.time()
+        for record in records:
+            match_id = str(record.get("match_id", ""))
+            if not match_id.isdigit():
+                continue
+            values = {column: str(record.get(column) or "").strip() for column in _COLUMNS}
+            values["match_time"], precision = _match_time(record)
+            rows.append((
+                match_id, int(match_id), *(values[column] for column in _COLUMNS),
+                values["event"].lower(), values["team1"].lower(), values["team2"].lower(), precision, now,
+            ))
+        if not rows:
+            return True
+
+        merged = ", ".join(
+            f"{column} = CASE WHEN excluded.{column} != '' THEN excluded.{column} ELSE matches.{column} END"
+            for column in _COLUMNS
+            if column != "match_time"
+        )
+        return self._execute(
+            f"INSERT INTO matches (match_id, match_num, {', '.join(_COLUMNS)}, event_key, team1_key, team2_key, "
+            f"time_precision, updated_at) VALUES ({', '.join('?' * (len(_COLUMNS) + 7))}) "
+            "ON CONFLICT (match_id) DO UPDATE SET "
+            "match_time = CASE WHEN excluded.time_precision >= matches.time_precision "
+            "THEN excluded.match_time ELSE matches.match_time END, "
+            "time_precision = max(excluded.time_precision, matches.time_precision), "
+            f"{merged}, "
+            "event_key = CASE WHEN excluded.event != '' THEN excluded.event_key ELSE matches.event_key END, "
+            "team1_key = CASE WHEN excluded.team1 != '' THEN excluded.team1_key ELSE matches.team1_key END, "
+            "team2_key = CASE WHEN excluded.team2 != '' THEN excluded.team2_key ELSE matches.team2_key END, "
+            "updated_at = excluded.updated_at",
+            rows,
+            many=True,
+        )
+
+    def set_players(self, match_id: str, players: list[tuple[str, str]]) -> bool:
+        """Record ``(player, team)`` pairs seen in a match's stat tables."""
+        rows = {(match_id, player.lower(), player, team) for player, team in players if player}
+        if not rows:
+            return True
+        return self._execute(
+            "INSERT OR REPLACE INTO match_players (match_id, player_key, player, team) VALUES (?, ?, ?, ?)",
+            sorted(rows),
+            many=True,
+        )
+
+    def query(
+        self,
+        *,
+        team: str | None = None,
+        event: str | None = None,
+        event_id: str | None = None,
+        player: str | None = None,
+        state: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        sort: str = "date",
+        order: str = "desc",
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Filtered, keyset-paginated matches; returns ``(rows, next_cursor)``.
+
+        ``team``, ``event`` and ``player`` match case-insensitively on the
+        full name; ``date_from`` / ``date_to`` compare against the stored UTC
+        match time (``YYYY-MM-DD`` prefixes work). ``cursor`` is the
+        ``next_cursor`` of the previous page.
+        """
+        column = SORT_COLUMNS[sort]
+        descending = order == "desc"
+        where, params = [], []
+        if team:
+            where.append("(team1_key = ? OR team2_key = ?)")
+            params += [team.lower(), team.lower()]
+        if event:
+            where.append("event_key = ?")
+            params.append(event.lower())
+        if event_id:
+            where.append("event_id = ?")
+            params.append(event_id)
+        if player:
+            where.append("match_id IN (SELECT match_id FROM match_players WHERE player_key = ?)")
+            params.append(player.lower())
+        if state:
+            where.append("state = ?")
+            params.append(state)
+        if date_from:
+            where.append("match_time >= ?")
+            params.append(date_from)
+        if date_to:
+            # Inclusive of the whole day when only a date is given.
+            where.append("match_time != '' AND match_time <= ?")
+            params.append(date_to + "~" if len(date_to) == 10 else date_to)
+        if cursor:
+            value, last_num = decode_cursor(cursor)
+            comparison = "<" if descending else ">"
+            where.append(f"({column}, match_num) {comparison} (?, ?)")
+            params += [value, last_num]
+
+        direction = "DESC" if descending else "ASC"
+        sql = (
+            f"SELECT match_id, match_num, {', '.join(_COLUMNS)} FROM matches "
+            f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+            f"ORDER BY {column} {direction}, match_num {direction} LIMIT ?"
+        )
+        rows = self._query(sql, (*params, limit + 1))
+
+        matches = [
+            {"match_id": row[0], **dict(zip(_COLUMNS, row[2:]))}
+            for row in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            sort_value = last[1] if column == "match_num" else last[2]
+            next_cursor = encode_cursor(sort_value, last[1])
+        if matches:
+            self._attach_players(matches)
+        return matches, next_cursor
+
+    def _attach_players(self, matches: list[dict]) -> None:
+        ids = [match["match_id"] for match in matches]
+        rows = self._query(
+            f"SELECT match_id, player, team FROM match_players WHERE match_id IN ({', '.join('?' * len(ids))}) "
+            "ORDER BY team, player",
+            tuple(ids),
+        )
+        by_match: dict[str, list[dict]] = {}
+        for match_id, player, team in rows:
+            by_match.setdefault(match_id, []).append({"name": player, "team": team})
+        for match in matches:
+            match["players"] = by_match.get(match["match_id"], [])
+
+    def count(self) -> int:
+        rows = self._query("SELECT COUNT(*) FROM matches")
+        return rows[0][0] if rows else 0
+
+
+match_store = MatchStore()
@@ -0,0 +1,404 @@
+"""
+Low-overhead Prometheus-style metrics registry.
+
+Metrics are plain in-process counters, gauges, and fixed-bucket histograms
+rendered in the Prometheus text exposition format by GET /metrics.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+from utils import request_timing
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Sample lines for this metric (the registry adds ``header``)."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop every recorded value."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """Point-in-time value per label set."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose samples are produced on demand at render time.
+
+    ``callback`` returns ``{label_values_tuple: value}``; nothing is recorded
+    between scrapes, so the metric costs nothing on the request path.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str],
+        callback: Callable[[], dict[tuple[str, ...], float]],
+        kind: str = "gauge",
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.kind = kind
+        self._callback = callback
+
+    def render(self) -> list[str]:
+        samples = self._callback()
+        return [
+            f"{self.name}{_format_labels(self.labelnames, tuple(str(v) for v in key))} {_format_value(value)}"
+            for key, value in sorted(samples.items())
+        ]
+
+    def reset(self) -> None:
+        pass
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def count(self, **labels) -> int:
+        row = self._values.get(self._key(labels))
+        return int(sum(row[:-1])) if row else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(row)) for key, row in self._values.items())
+        lines = []
+        for key, row in items:
+            cumulative = 0.0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), row[:-1]):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(row[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str],
+        callback: Callable[[], dict[tuple[str, ...], float]],
+        kind: str = "gauge",
+    ) -> CallbackGauge:
+        return self._register(CallbackGauge(name, help_text, labelnames, callback, kind))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every recorded sample. Intended for use in tests."""
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+UPSTREAM_REQUEST_SECONDS = registry.histogram(
+    "vlrgg_upstream_request_seconds",
+    "Latency of individual upstream HTTP attempts.",
+    ("host", "path_class"),
+)
+UPSTREAM_RESPONSES = registry.counter(
+    "vlrgg_upstream_responses_total",
+    "Upstream HTTP attempts by status code ('error' for transport failures).",
+    ("host", "path_class", "status"),
+)
+UPSTREAM_RETRIES = registry.counter(
+    "vlrgg_upstream_retries_total",
+    "Upstream retries by reason (status code or request_error).",
+    ("host", "reason"),
+)
+UPSTREAM_BACKOFF_SECONDS = registry.counter(
+    "vlrgg_upstream_backoff_seconds_total",
+    "Time spent sleeping between upstream retries.",
+    ("host",),
+)
+UPSTREAM_BYTES = registry.counter(
+    "vlrgg_upstream_bytes_total",
+    "Bytes downloaded from upstream.",
+    ("host", "path_class"),
+)
+CIRCUIT_REJECTIONS = registry.counter(
+    "vlrgg_circuit_rejections_total",
+    "Upstream requests blocked by an open circuit.",
+    ("host",),
+)
+HTML_PARSE_SECONDS = registry.histogram(
+    "vlrgg_html_parse_seconds",
+    "Time spent stripping and parsing upstream HTML.",
+    ("scraper",),
+    FAST_BUCKETS,
+)
+SCRAPER_SECONDS = registry.histogram(
+    "vlrgg_scraper_seconds",
+    "Total time spent inside a scraper call, including cache hits.",
+    ("scraper",),
+)
+EXTRACTION_SECONDS = registry.histogram(
+    "vlrgg_extraction_seconds",
+    "Scraper time not spent on upstream fetches or HTML parsing (cache misses only).",
+    ("scraper",),
+    FAST_BUCKETS,
+)
+SCRAPER_ERRORS = registry.counter(
+    "vlrgg_scraper_errors_total",
+    "Scraper calls that ended in an HTTP error.",
+    ("scraper", "status"),
+)
+HTTP_REQUESTS = registry.counter(
+    "vlrgg_http_requests_total",
+    "API requests served, by route and status code.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "vlrgg_http_request_seconds",
+    "End-to-end API request handling time, by route.",
+    ("method", "route"),
+)
+SERIALIZATION_SECONDS = registry.histogram(
+    "vlrgg_response_serialization_seconds",
+    "Time from endpoint return to a rendered response body, by route.",
+    ("route",),
+    FAST_BUCKETS,
+)
+
+
+_SECOND_LEVEL_PATHS = {"matches", "results", "transactions"}
+
+
+def classify_url(url: str) -> tuple[str, str]:
+    """Return a bounded ``(host, path_class)`` label pair for an upstream URL."""
+    parsed = urlparse(url)
+    parts = [part for part in parsed.path.split("/") if part]
+    if not parts:
+        return parsed.netloc, "home"
+
+    head = parts[0]
+    if head.isdigit():
+        return parsed.netloc, "match_tab" if "tab=" in parsed.query else "match"
+    if not head.isalpha():
+        return parsed.netloc, "other"
+    if len(parts) > 1 and parts[1] in _SECOND_LEVEL_PATHS:
+        return parsed.netloc, f"{head}_{parts[1]}"
+    return parsed.netloc, head
+
+
+# ---------------------------------------------------------------------------
+# Per-scraper timing context
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ScraperTimer:
+    """Upstream and parse time accumulated during one scraper call."""
+    name: str
+    started: float = field(default_factory=time.perf_counter)
+    upstream_seconds: float = 0.0
+    parse_seconds: float = 0.0
+
+
+_current_scraper: ContextVar[ScraperTimer | None] = ContextVar("current_scraper", default=None)
+
+
+def start_scraper(name: str):
+    """Begin timing a scraper call. Returns a token for :func:`finish_scraper`."""
+    timer = ScraperTimer(name)
+    return _current_scraper.set(timer), timer
+
+
+def finish_scraper(token, timer: ScraperTimer, status: int | None = None) -> None:
+    """Stop timing a scraper call and record total and extraction time."""
+    _current_scraper.reset(token)
+    elapsed = time.perf_counter() - timer.started
+    SCRAPER_SECONDS.observe(elapsed, scraper=timer.name)
+    if timer.upstream_seconds or timer.parse_seconds:
+        extraction = elapsed - timer.upstream_seconds - timer.parse_seconds
+        EXTRACTION_SECONDS.observe(max(0.0, extraction), scraper=timer.name)
+    if status is not None:
+        SCRAPER_ERRORS.inc(scraper=timer.name, status=status)
+    request_timing.add("scraper", elapsed)
+
+
+def current_scraper_name() -> str:
+    timer = _current_scraper.get()
+    return timer.name if timer else ""
+
+
+def observe_upstream(url: str, status: int | str, seconds: float, num_bytes: int = 0) -> None:
+    """Record one upstream HTTP attempt."""
+    host, path_class = classify_url(url)
+    UPSTREAM_REQUEST_SECONDS.observe(seconds, host=host, path_class=path_class)
+    UPSTREAM_RESPONSES.inc(host=host, path_class=path_class, status=status)
+    if num_bytes:
+        UPSTREAM_BYTES.inc(num_bytes, host=host, path_class=path_class)
+    request_timing.add("upstream", seconds)
+    timer = _current_scraper.get()
+    if timer is not None:
+        timer.upstream_seconds += seconds
+
+
+def observe_retry(url: str, reason: int | str, backoff: float) -> None:
+    """Record a retry and the backoff sleep that precedes it."""
+    host = urlparse(url).netloc
+    UPSTREAM_RETRIES.inc(host=host, reason=reason)
+    UPSTREAM_BACKOFF_SECONDS.inc(backoff, host=host)
+    request_timing.add("backoff", backoff)
+    timer = _current_scraper.get()
+    if timer is not None:
+        timer.upstream_seconds += backoff
+
+
+def observe_parse(seconds: float) -> None:
+    """Record HTML parse time against the current scraper."""
+    timer = _current_scraper.get()
+    HTML_PARSE_SECONDS.observe(seconds, scraper=timer.name if timer else "")
+    request_timing.add("parse", seconds)
+    if timer is not None:
+        timer.parse_seconds += seconds
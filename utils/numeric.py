@@ -0,0 +1,44 @@
+"""
+Typed ("numeric=true") variants of scraped stat tables.
+
+Scrapers keep every value as the string shown on VLR.GG. The typed mode
+converts the numeric fields once, when the typed payload is cached, so
+clients receive ints and floats (``null`` for missing values) instead of
+re-parsing strings like ``"1.20"``, ``"75%"`` or ``"+5"`` on every response.
+"""
+import re
+from collections.abc import Iterable
+
+_NUMBER = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)$")
+
+
+def parse_number(value) -> int | float | None:
+    """'1.20' -> 1.2, '75%' -> 75, '+5' -> 5, '1,204' -> 1204; '' / 'N/A' -> None.
+
+    Percentages keep the number as displayed (not divided by 100). Values
+    that are already numbers pass through unchanged.
+    """
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    text = str(value).strip().rstrip("%").replace(",", "")
+    if not _NUMBER.match(text):
+        return None
+    if "." in text:
+        return float(text)
+    return int(text)
+
+
+def numeric_row(row: dict, fields: Iterable[str]) -> dict:
+    """Copy of ``row`` with ``fields`` parsed by ``parse_number``."""
+    typed = dict(row)
+    for field in fields:
+        if field in typed:
+            typed[field] = parse_number(typed[field])
+    return typed
+
+
+def numeric_rows(rows: list[dict], fields: Iterable[str]) -> list[dict]:
+    fields = tuple(fields)
+    return [numeric_row(row, fields) for row in rows]
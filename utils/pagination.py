@@ -58,6 +58,7 @@ async def scrape_multiple_pages(
     parse_func: Callable[[HTMLParser, int], list[dict]],
     config: PaginationConfig,
     page_url_func: Callable[[str, int], str] | None = None,
+    stop_at: Callable[[dict], bool] | None = None,
 ) -> dict:
     """
     Generic multi-page scraper with retry and exponential backoff.
@@ -68,6 +69,9 @@ async def scrape_multiple_pages(
         config: PaginationConfig with page range and retry settings.
         page_url_func: Optional callable(base_url, page) -> url. Defaults to
                        appending ?page=N for page > 1.
+        stop_at: Optional callable(item) -> bool for incremental scrapes of
+                 newest-first listings. The first matching item and everything
+                 after it are dropped and no further pages are fetched.
 
     Returns:
         dict in the standard response shape.
@@ -101,6 +105,7 @@ async def scrape_multiple_pages(
     client = get_http_client()
     result: list[dict] = []
     failed_pages: list[int] = []
+    stopped_early = False
 
     if page_url_func is None:
         def page_url_func(base: str, page: int) -> str:
@@ -135,11 +140,18 @@ async def scrape_multiple_pages(
 
                 html = HTMLParser(resp.text)
                 page_results = parse_func(html, page)
+                if stop_at is not None:
+                    stop_index = next(
+                        (index for index, item in enumerate(page_results) if stop_at(item)), None
+                    )
+                    if stop_index is not None:
+                        page_results = page_results[:stop_index]
+                        stopped_early = True
                 result.extend(page_results)
                 logger.info("Page %d: %d items", page, len(page_results))
                 page_success = True
 
-                if page < end_page:
+                if page < end_page and not stopped_early:
                     await asyncio.sleep(config.request_delay)
 
             except Exception as e:
@@ -155,7 +167,11 @@ async def scrape_multiple_pages(
             failed_pages.append(page)
             logger.error("Failed page %d after %d attempts", page, config.max_retries)
 
-    successful_pages = total_pages - len(failed_pages)
+        if stopped_early:
+            break
+
+    pages_fetched = (page - start_page + 1) if stopped_early else total_pages
+    successful_pages = pages_fetched - len(failed_pages)
     logger.info(
         "Scraping done: %d matches, %d/%d pages OK",
         len(result), successful_pages, total_pages,
@@ -181,6 +197,7 @@ async def scrape_multiple_pages(
                 "successful_pages": successful_pages,
                 "failed_pages": failed_pages,
                 "total_matches": len(result),
+                "stopped_early": stopped_early,
             },
         }
     }
@@ -0,0 +1,122 @@
+"""
+On-demand sampling profiler for live workers.
+
+Nothing is installed or running until ``SamplingProfiler.run`` is called: a
+worker thread then polls ``sys._current_frames()`` at a fixed interval for
+the requested duration, covering the event loop thread and any executor
+threads. Each sampled stack is attributed to the outermost ``api.scrapers``
+frame on it, so CPU time can be read per scraper function.
+"""
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+
+from utils.constants import PROFILER_MAX_DEPTH
+
+_SCRAPER_PACKAGE = "api.scrapers."
+NO_SCRAPER_GROUP = "(no scraper)"
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profiling run is requested while another is in progress."""
+
+
+def _frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def _scraper_group(frame) -> str | None:
+    """Return ``module.function`` for a frame inside api.scrapers, else None."""
+    module = frame.f_globals.get("__name__", "")
+    if not module.startswith(_SCRAPER_PACKAGE):
+        return None
+    function = frame.f_code.co_qualname.split(".<locals>", 1)[0]
+    return f"{module[len(_SCRAPER_PACKAGE):]}.{function}"
+
+
+def _collapse(frame, max_depth: int) -> tuple[str, str]:
+    """Return (group, root-first ``;``-joined stack) for one thread's frame."""
+    labels = []
+    group = None
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame))
+        group = _scraper_group(frame) or group
+        frame = frame.f_back
+    labels.reverse()
+    return group or NO_SCRAPER_GROUP, ";".join(labels)
+
+
+class SamplingProfiler:
+    """Periodic stack sampler; at most one run at a time per process."""
+
+    def __init__(self, max_depth: int = PROFILER_MAX_DEPTH):
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self._lock.locked()
+
+    def _sample(self, seconds: float, interval: float) -> dict:
+        own_thread = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks: Counter[tuple[str, str]] = Counter()
+        threads_seen: set[int] = set()
+        samples = 0
+
+        started = time.perf_counter()
+        deadline = started + seconds
+        while True:
+            for ident, frame in sys._current_frames().items():
+                if ident == own_thread:
+                    continue
+                threads_seen.add(ident)
+                stacks[_collapse(frame, self.max_depth)] += 1
+            samples += 1
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(interval, deadline - now))
+        elapsed = time.perf_counter() - started
+
+        groups: dict[str, dict] = {}
+        for (group, stack), count in stacks.most_common():
+            entry = groups.setdefault(group, {"samples": 0, "stacks": []})
+            entry["samples"] += count
+            entry["stacks"].append({"stack": stack, "count": count})
+
+        return {
+            "duration_seconds": round(elapsed, 3),
+            "interval_ms": round(interval * 1000, 3),
+            "samples": samples,
+            "threads": sorted(thread_names.get(ident, str(ident)) for ident in threads_seen),
+            "groups": dict(sorted(groups.items(), key=lambda item: -item[1]["samples"])),
+        }
+
+    async def run(self, seconds: float, interval: float) -> dict:
+        """Sample all threads for ``seconds`` off the event loop and aggregate stacks.
+
+        Raises:
+            ProfilerBusyError: if another run is already in progress.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profiling run is already in progress")
+        try:
+            return await asyncio.to_thread(self._sample, seconds, interval)
+        finally:
+            self._lock.release()
+
+
+def to_collapsed(report: dict) -> str:
+    """Render a profile report in collapsed-stack (flamegraph.pl) format."""
+    lines = []
+    for group, entry in report["groups"].items():
+        for item in entry["stacks"]:
+            lines.append(f"{group};{item['stack']} {item['count']}")
+    return "\n".join(lines) + "\n"
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,133 @@
+"""
+Timestamped rankings snapshots per region, for rank-movement deltas.
+
+Every rankings cache fill records the region's table here. Only the fields
+that describe standing (rank, team, country, record, earnings) are kept, so
+an unchanged table hashes the same and only extends the previous snapshot's
+``last_seen`` instead of adding a row. ``rank_deltas`` compares two stored
+tables without contacting VLR.GG.
+"""
+import hashlib
+import json
+import time
+
+from utils.constants import RANKINGS_HISTORY_RETENTION
+from utils.numeric import parse_number
+from utils.sqlite_store import SQLiteStore, pack_json, unpack_json
+
+_SNAPSHOT_FIELDS = ("rank", "team", "country", "record", "earnings")
+
+
+class RankingsHistory(SQLiteStore):
+    """(region, taken_at) -> compressed table, with a digest for de-duplication."""
+
+    filename = "rankings_history.sqlite3"
+    schema = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            region TEXT NOT NULL,
+            taken_at REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            digest TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            PRIMARY KEY (region, taken_at)
+        );
+    """
+
+    def record(self, region: str, rows: list[dict], now: float | None = None) -> bool:
+        """Store a region's table unless it matches the latest snapshot."""
+        now = time.time() if now is None else now
+        table = [[row.get(field, "") for field in _SNAPSHOT_FIELDS] for row in rows]
+        digest = hashlib.sha1(json.dumps(table, separators=(",", ":")).encode()).hexdigest()
+        latest = self._query(
+            "SELECT taken_at, digest FROM snapshots WHERE region = ? ORDER BY taken_at DESC LIMIT 1", (region,)
+        )
+        if latest and latest[0][1] == digest:
+            return self._execute(
+                "UPDATE snapshots SET last_seen = ? WHERE region = ? AND taken_at = ?", (now, region, latest[0][0])
+            )
+        stored = self._execute(
+            "INSERT OR REPLACE INTO snapshots (region, taken_at, last_seen, digest, payload) VALUES (?, ?, ?, ?, ?)",
+            (region, now, now, digest, pack_json(table)),
+        )
+        if stored:
+            self._execute(
+                "DELETE FROM snapshots WHERE region = ? AND last_seen < ?", (region, now - RANKINGS_HISTORY_RETENTION)
+            )
+        return stored
+
+    def latest(self, region: str) -> dict | None:
+        rows = self._query(
+            "SELECT taken_at, last_seen, payload FROM snapshots WHERE region = ? ORDER BY taken_at DESC LIMIT 1",
+            (region,),
+        )
+        return self._snapshot(rows[0]) if rows else None
+
+    def as_of(self, region: str, at: float) -> dict | None:
+        """The snapshot in effect at ``at``, or the oldest one if none is that old."""
+        rows = self._query(
+            "SELECT taken_at, last_seen, payload FROM snapshots WHERE region = ? AND taken_at <= ? "
+            "ORDER BY taken_at DESC LIMIT 1",
+            (region, at),
+        ) or self._query(
+            "SELECT taken_at, last_seen, payload FROM snapshots WHERE region = ? ORDER BY taken_at LIMIT 1",
+            (region,),
+        )
+        return self._snapshot(rows[0]) if rows else None
+
+    def count(self, region: str | None = None) -> int:
+        if region is None:
+            rows = self._query("SELECT COUNT(*) FROM snapshots")
+        else:
+            rows = self._query("SELECT COUNT(*) FROM snapshots WHERE region = ?", (region,))
+        return rows[0][0] if rows else 0
+
+    @staticmethod
+    def _snapshot(row: tuple) -> dict:
+        taken_at, last_seen, payload = row
+        return {
+            "taken_at": taken_at,
+            "last_seen": last_seen,
+            "rows": [dict(zip(_SNAPSHOT_FIELDS, values, strict=True)) for values in unpack_json(payload)],
+        }
+
+
+rankings_history = RankingsHistory()
+
+
+def rank_deltas(current: list[dict], baseline: list[dict] | None) -> tuple[list[dict], list[dict]]:
+    """Rank movement of each team in ``current`` relative to ``baseline``.
+
+    Returns ``(rows, dropped)``. ``change`` is positive when a team moved up;
+    teams absent from the baseline are ``new`` with ``previous_rank`` None,
+    and baseline teams missing from the current table are listed in
+    ``dropped``. Without a baseline every movement is ``unknown``.
+    """
+    previous = {row["team"]: parse_number(row["rank"]) for row in baseline or ()}
+    rows = []
+    for row in current:
+        rank = parse_number(row["rank"])
+        before = previous.get(row["team"])
+        if baseline is None:
+            movement, change = "unknown", None
+        elif row["team"] not in previous:
+            movement, change = "new", None
+        elif rank is None or before is None:
+            movement, change = "unknown", None
+        else:
+            change = before - rank
+            movement = "up" if change > 0 else "down" if change < 0 else "same"
+        rows.append({
+            "rank": rank,
+            "team": row["team"],
+            "country": row["country"],
+            "previous_rank": before,
+            "change": change,
+            "movement": movement,
+        })
+    seen = {row["team"] for row in current}
+    dropped = [
+        {"team": row["team"], "previous_rank": parse_number(row["rank"])}
+        for row in baseline or ()
+        if row["team"] not in seen
+    ]
+    return rows, dropped
@@ -0,0 +1,152 @@
+"""
+Per-request phase timings exposed as a Server-Timing response header.
+
+A ``RequestTimings`` object lives in a context variable for the duration of
+one API request. Instrumentation points (cache lookups, upstream fetches,
+retry backoff, HTML parsing, scraper calls, serialization) add to it, and
+``ServerTimingMiddleware`` renders it onto the response. Tasks spawned while
+handling a request inherit the same object, so work done by a coalesced
+producer is attributed to the request that started it.
+"""
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+DEBUG_TIMING_HEADER = "x-debug-timing"
+
+# Phases emitted in this order; anything else follows alphabetically.
+_PHASE_ORDER = ("coalesced", "upstream_queue", "upstream", "backoff", "parse", "scraper", "serialize")
+
+
+class RequestTimings:
+    """Accumulated durations and counters for a single request."""
+
+    __slots__ = ("started", "debug", "_durations", "_counts")
+
+    def __init__(self, debug: bool = False) -> None:
+        self.started = time.perf_counter()
+        self.debug = debug
+        self._durations: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self._durations[phase] = self._durations.get(phase, 0.0) + seconds
+        self._counts[phase] = self._counts.get(phase, 0) + 1
+
+    def count(self, phase: str, amount: int = 1) -> None:
+        self._counts[phase] = self._counts.get(phase, 0) + amount
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def _ordered_phases(self) -> list[str]:
+        names = (set(self._durations) | set(self._counts)) - {"cache_hit", "cache_miss"}
+        ordered = [name for name in _PHASE_ORDER if name in names]
+        ordered.extend(sorted(names - set(_PHASE_ORDER)))
+        return ordered
+
+    def _cache_counts(self) -> tuple[int, int]:
+        return self._counts.get("cache_hit", 0), self._counts.get("cache_miss", 0)
+
+    def as_dict(self) -> dict:
+        """Structured form used for debug output."""
+        hits, misses = self._cache_counts()
+        phases: dict[str, dict] = {}
+        if hits or misses:
+            phases["cache"] = {"hits": hits, "misses": misses}
+        for name in self._ordered_phases():
+            entry: dict = {"count": self._counts.get(name, 0)}
+            if name in self._durations:
+                entry["ms"] = round(self._durations[name] * 1000, 3)
+            phases[name] = entry
+        return {"total_ms": round(self.elapsed() * 1000, 3), "phases": phases}
+
+    def header_value(self) -> str:
+        """Render the Server-Timing header value."""
+        entries = []
+        hits, misses = self._cache_counts()
+        if hits or misses:
+            entries.append(f'cache;desc="hit={hits} miss={misses}"')
+        for name in self._ordered_phases():
+            parts = [name]
+            if name in self._durations:
+                parts.append(f"dur={self._durations[name] * 1000:.1f}")
+            occurrences = self._counts.get(name, 0)
+            if occurrences > 1 or name not in self._durations:
+                parts.append(f'desc="{occurrences}"')
+            entries.append(";".join(parts))
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def current() -> RequestTimings | None:
+    return _current.get()
+
+
+def add(phase: str, seconds: float) -> None:
+    """Add a duration to the current request, if any."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+def count(phase: str, amount: int = 1) -> None:
+    """Increment a counter on the current request, if any."""
+    timings = _current.get()
+    if timings is not None:
+        timings.count(phase, amount)
+
+
+def record_cache_lookup(hit: bool) -> None:
+    """Count one cache hit or miss against the current request, if any."""
+    timings = _current.get()
+    if timings is not None:
+        timings.count("cache_hit" if hit else "cache_miss")
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware that owns the per-request timings and emits the header.
+
+    Sending ``X-Debug-Timing: 1`` also logs the breakdown and lets V2
+    endpoints include it under ``meta.timing`` in the response body.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug = False
+        for name, value in scope.get("headers", ()):
+            if name == DEBUG_TIMING_HEADER.encode() and value.strip() not in (b"", b"0", b"false"):
+                debug = True
+                break
+
+        timings = RequestTimings(debug=debug)
+        token = _current.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.header_value().encode("latin-1")))
+                message = {**message, "headers": headers}
+                if timings.debug:
+                    logger.info(
+                        "timing %s %s %s",
+                        scope.get("method", ""), scope.get("path", ""), json.dumps(timings.as_dict()),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
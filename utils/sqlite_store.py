@@ -0,0 +1,127 @@
+"""
+Small SQLite-backed stores for data that should outlive the in-memory cache.
+
+Each store opens its database lazily under ``VLRGGAPI_DATA_DIR`` (default:
+``<tempdir>/vlrggapi``) and serializes access with a lock. Calls block on
+disk I/O, so async code runs them through ``asyncio.to_thread``. A locked
+database is retried a few times; any other storage error switches the store
+off for ``SQLITE_ERROR_BACKOFF`` seconds, so a read-only or full disk
+degrades to cache-only behaviour instead of failing requests.
+"""
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+from utils.constants import DATA_DIR_ENV, SQLITE_ERROR_BACKOFF, SQLITE_LOCK_RETRIES, SQLITE_LOCK_RETRY_DELAY
+
+logger = logging.getLogger(__name__)
+
+
+def data_dir() -> str:
+    """Directory holding the SQLite files."""
+    return os.environ.get(DATA_DIR_ENV) or os.path.join(tempfile.gettempdir(), "vlrggapi")
+
+
+def pack_json(value) -> bytes:
+    """Serialize a payload to zlib-compressed JSON."""
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode())
+
+
+def unpack_json(blob: bytes):
+    return json.loads(zlib.decompress(blob))
+
+
+class SQLiteStore:
+    """Base class: lazy connection, schema bootstrap, and fail-soft execution.
+
+    Subclasses set ``filename`` and ``schema`` (a script of CREATE ... IF NOT
+    EXISTS statements) and use ``_execute`` / ``_query``.
+    """
+
+    filename = ""
+    schema = ""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._disabled_until = 0.0
+
+    @property
+    def path(self) -> str:
+        return os.path.join(data_dir(), self.filename)
+
+    @property
+    def enabled(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(data_dir(), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.schema)
+            self._conn = conn
+        return self._conn
+
+    def _fail(self, exc: Exception) -> None:
+        logger.warning(
+            "Disabling %s for %ss after storage error: %s", type(self).__name__, SQLITE_ERROR_BACKOFF, exc
+        )
+        self._disabled_until = time.monotonic() + SQLITE_ERROR_BACKOFF
+        self.close()
+
+    def _run(self, operation: Callable[[sqlite3.Connection], Any], default: Any) -> Any:
+        """Apply ``operation`` to the connection, retrying while the database is locked."""
+        if not self.enabled:
+            return default
+        with self._lock:
+            for attempt in range(SQLITE_LOCK_RETRIES + 1):
+                try:
+                    return operation(self._connect())
+                except sqlite3.OperationalError as exc:
+                    locked = "locked" in str(exc) or "busy" in str(exc)
+                    if not locked or attempt == SQLITE_LOCK_RETRIES:
+                        self._fail(exc)
+                        return default
+                    time.sleep(SQLITE_LOCK_RETRY_DELAY * 2 ** attempt)
+                except (sqlite3.Error, OSError) as exc:
+                    self._fail(exc)
+                    return default
+
+    def _execute(self, sql: str, params: tuple = (), many: bool = False) -> bool:
+        """Run a write statement; return False if the store is unavailable."""
+        def write(conn: sqlite3.Connection) -> bool:
+            with conn:
+                if many:
+                    conn.executemany(sql, params)
+                else:
+                    conn.execute(sql, params)
+            return True
+
+        return self._run(write, False)
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        """Run a read statement; return no rows if the store is unavailable."""
+        return self._run(lambda conn: conn.execute(sql, params).fetchall(), [])
+
+    def close(self) -> None:
+        """Close the connection; the next call reopens it (and re-reads the data dir)."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def reset(self) -> None:
+        """Close and re-enable the store; used by tests and after config changes."""
+        self.close()
+        self._disabled_until = 0.0
@@ -0,0 +1,196 @@
+"""
+Pre-indexed player stats tables for server-side filtering and top-N.
+
+A ``StatsTable`` is built once per cached stats page. It keeps the scraped
+string rows, their typed copies (see ``utils.numeric``), and one pre-sorted
+row order per numeric column, so a request for the top ``k`` rows by some
+column walks an existing index instead of sorting the table again.
+
+``StatsAggregate`` summarises a table for ``/v2/stats/aggregate``: column
+distributions, per-player percentile ranks and z-scores, and pairwise
+correlations, computed once with ``array`` / ``statistics`` and then only
+sliced per request.
+"""
+import statistics
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+
+from utils.numeric import numeric_rows
+
+AGGREGATE_SECTIONS = ("distributions", "percentiles", "correlations")
+_QUANTILES = {"p10": 9, "p25": 24, "median": 49, "p75": 74, "p90": 89}
+
+
+class StatsTable:
+    """String rows, typed rows, and ascending/descending indexes per column.
+
+    Rows whose value is missing for a column sort after every other row in
+    both directions; ties keep the upstream table order. Slotted so the
+    cache's size estimate walks its contents.
+    """
+
+    __slots__ = ("status", "rows", "numeric_fields", "typed", "_indexes", "_aggregate")
+
+    def __init__(self, rows: list[dict], numeric_fields: Iterable[str], status: int = 200) -> None:
+        self.status = status
+        self.rows = rows
+        self.numeric_fields = tuple(numeric_fields)
+        self.typed = numeric_rows(rows, self.numeric_fields)
+        self._indexes: dict[tuple[str, str], tuple[int, ...]] = {}
+        for field in self.numeric_fields:
+            present = [index for index, row in enumerate(self.typed) if row[field] is not None]
+            missing = [index for index, row in enumerate(self.typed) if row[field] is None]
+            ascending = sorted(present, key=lambda index: self.typed[index][field])
+            descending = sorted(present, key=lambda index: -self.typed[index][field])
+            self._indexes[field, "asc"] = (*ascending, *missing)
+            self._indexes[field, "desc"] = (*descending, *missing)
+        self._aggregate: StatsAggregate | None = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def aggregate(self) -> "StatsAggregate":
+        """The table's ``StatsAggregate``, computed on first use and kept with the table."""
+        if self._aggregate is None:
+            self._aggregate = StatsAggregate(self)
+        return self._aggregate
+
+    def _order(self, sort: str | None, order: str) -> Iterable[int]:
+        if sort is None:
+            return range(len(self.rows))
+        return self._indexes[sort, order]
+
+    def select(
+        self,
+        *,
+        sort: str | None = None,
+        order: str = "desc",
+        limit: int | None = None,
+        min_rounds: int | None = None,
+        agent: str | None = None,
+        org: str | None = None,
+        numeric: bool = False,
+    ) -> list[dict]:
+        """Rows matching the filters in index order, stopping after ``limit``.
+
+        ``sort`` must be one of ``numeric_fields`` (None keeps the upstream
+        order). ``agent`` and ``org`` match case-insensitively; ``min_rounds``
+        compares against ``rounds_played``.
+        """
+        agent = agent.lower() if agent else None
+        org = org.lower() if org else None
+        selected = []
+        for index in self._order(sort, order):
+            if limit is not None and len(selected) >= limit:
+                break
+            typed = self.typed[index]
+            if min_rounds is not None and (typed.get("rounds_played") or 0) < min_rounds:
+                continue
+            if agent is not None and agent not in typed["agents"]:
+                continue
+            if org is not None and typed["org"].lower() != org:
+                continue
+            selected.append(typed if numeric else self.rows[index])
+        return selected
+
+
+def _round(value: float | None, digits: int = 4) -> float | None:
+    return None if value is None else round(value, digits)
+
+
+def _distribution(ordered: array, missing: int) -> dict:
+    if not ordered:
+        return {"count": 0, "missing": missing, "mean": None, "stdev": None, "min": None,
+                **dict.fromkeys(_QUANTILES), "max": None}
+    cuts = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else [ordered[0]] * 99
+    return {
+        "count": len(ordered),
+        "missing": missing,
+        "mean": _round(statistics.fmean(ordered)),
+        "stdev": _round(statistics.stdev(ordered)) if len(ordered) > 1 else None,
+        "min": ordered[0],
+        **{name: _round(cuts[index]) for name, index in _QUANTILES.items()},
+        "max": ordered[-1],
+    }
+
+
+def _correlation(xs: list, ys: list) -> float | None:
+    """Pearson r over rows where both columns have a value (None if undefined)."""
+    pairs = [(x, y) for x, y in zip(xs, ys, strict=True) if x is not None and y is not None]
+    if len(pairs) < 2:
+        return None
+    try:
+        return _round(statistics.correlation(*zip(*pairs, strict=True)))
+    except statistics.StatisticsError:
+        return None
+
+
+class StatsAggregate:
+    """Distributions, percentile ranks, z-scores and correlations of a StatsTable.
+
+    Built once per cached table. Each numeric column is held as a sorted
+    ``array('d')`` of its present values; percentile ranks are mid-ranks
+    (the share of values below, counting ties as half) from 0 to 100.
+    """
+
+    __slots__ = ("columns", "players", "distributions", "percentiles", "z_scores", "correlations")
+
+    def __init__(self, table: StatsTable) -> None:
+        self.columns = table.numeric_fields
+        self.players = [(row["player"], row["org"]) for row in table.typed]
+        columns = {column: [row[column] for row in table.typed] for column in self.columns}
+
+        self.distributions: dict[str, dict] = {}
+        self.percentiles: dict[str, list] = {}
+        self.z_scores: dict[str, list] = {}
+        for column, values in columns.items():
+            ordered = array("d", sorted(value for value in values if value is not None))
+            self.distributions[column] = _distribution(ordered, len(values) - len(ordered))
+            mean = statistics.fmean(ordered) if ordered else None
+            stdev = statistics.stdev(ordered) if len(ordered) > 1 else None
+            self.percentiles[column] = [
+                None if value is None
+                else _round(50 * (bisect_left(ordered, value) + bisect_right(ordered, value)) / len(ordered), 1)
+                for value in values
+            ]
+            self.z_scores[column] = [
+                None if value is None or not stdev else _round((value - mean) / stdev)
+                for value in values
+            ]
+
+        self.correlations = {
+            first: {second: _correlation(columns[first], columns[second]) for second in self.columns}
+            for first in self.columns
+        }
+
+    def select(
+        self,
+        columns: Iterable[str] | None = None,
+        sections: Iterable[str] = AGGREGATE_SECTIONS,
+        players: Iterable[str] | None = None,
+    ) -> dict:
+        """The requested ``sections`` restricted to ``columns`` and, for the
+        per-player section, to ``players`` (case-insensitive names)."""
+        columns = list(self.columns if columns is None else columns)
+        sections = set(sections)
+        result: dict = {"columns": columns}
+        if "distributions" in sections:
+            result["distributions"] = {column: self.distributions[column] for column in columns}
+        if "percentiles" in sections:
+            wanted = None if players is None else {name.lower() for name in players}
+            result["players"] = [
+                {
+                    "player": name,
+                    "org": org,
+                    "percentiles": {column: self.percentiles[column][index] for column in columns},
+                    "z_scores": {column: self.z_scores[column][index] for column in columns},
+                }
+                for index, (name, org) in enumerate(self.players)
+                if wanted is None or name.lower() in wanted
+            ]
+        if "correlations" in sections:
+            result["correlations"] = {
+                first: {second: self.correlations[first][second] for second in columns} for first in columns
+            }
+        return result
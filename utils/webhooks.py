@@ -0,0 +1,253 @@
+"""
+Webhook subscriptions, match event detection, and batched delivery.
+
+Subscriptions are stored in SQLite next to the match archive so they
+survive restarts. ``diff_match_events`` turns two successive match-state
+snapshots into events (``diff_match_state`` also carries the snapshot
+along for the notifier), and ``WebhookDelivery`` posts each subscription its
+share of a batch with retries and bounded concurrency.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from datetime import UTC, datetime
+
+import httpx
+
+from utils.batch import bounded_as_completed
+from utils.constants import (
+    WEBHOOK_DELIVERY_CONCURRENCY,
+    WEBHOOK_MAX_RETRIES,
+    WEBHOOK_RETRY_DELAY,
+    WEBHOOK_SIGNATURE_HEADER,
+    WEBHOOK_TIMEOUT,
+)
+from utils.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+MATCH_STARTED = "match_started"
+MAP_ENDED = "map_ended"
+MATCH_COMPLETED = "match_completed"
+WEBHOOK_EVENTS = (MATCH_STARTED, MAP_ENDED, MATCH_COMPLETED)
+
+
+class WebhookStore(SQLiteStore):
+    """Registered webhook targets and the event types each one wants."""
+
+    filename = "webhooks.sqlite3"
+    schema = """
+        CREATE TABLE IF NOT EXISTS subscriptions (
+            id TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            events TEXT NOT NULL,
+            secret TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL
+        );
+    """
+
+    def add(self, url: str, events: list[str], secret: str = "") -> dict | None:
+        subscription = {
+            "id": secrets.token_hex(8),
+            "url": url,
+            "events": sorted(set(events)),
+            "secret": secret,
+            "created_at": time.time(),
+        }
+        stored = self._execute(
+            "INSERT INTO subscriptions (id, url, events, secret, created_at) VALUES (?, ?, ?, ?, ?)",
+            (
+                subscription["id"],
+                url,
+                ",".join(subscription["events"]),
+                secret,
+                subscription["created_at"],
+            ),
+        )
+        return subscription if stored else None
+
+    def remove(self, subscription_id: str) -> bool:
+        if self.get(subscription_id) is None:
+            return False
+        return self._execute("DELETE FROM subscriptions WHERE id = ?", (subscription_id,))
+
+    def get(self, subscription_id: str) -> dict | None:
+        rows = self._query(
+            "SELECT id, url, events, secret, created_at FROM subscriptions WHERE id = ?",
+            (subscription_id,),
+        )
+        return self._row(rows[0]) if rows else None
+
+    def list(self) -> list[dict]:
+        rows = self._query("SELECT id, url, events, secret, created_at FROM subscriptions ORDER BY created_at")
+        return [self._row(row) for row in rows]
+
+    def count(self) -> int:
+        rows = self._query("SELECT COUNT(*) FROM subscriptions")
+        return rows[0][0] if rows else 0
+
+    @staticmethod
+    def _row(row: tuple) -> dict:
+        subscription_id, url, events, secret, created_at = row
+        return {
+            "id": subscription_id,
+            "url": url,
+            "events": events.split(",") if events else [],
+            "secret": secret,
+            "created_at": created_at,
+        }
+
+
+webhook_store = WebhookStore()
+
+
+def public_subscription(subscription: dict) -> dict:
+    """Subscription as returned by the admin API (the secret is never echoed)."""
+    return {
+        "id": subscription["id"],
+        "url": subscription["url"],
+        "events": subscription["events"],
+        "signed": bool(subscription["secret"]),
+        "created_at": subscription["created_at"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Event detection
+# ---------------------------------------------------------------------------
+
+def _series_total(score: list[str]) -> int:
+    return sum(int(value) for value in score if value.isdigit())
+
+
+def _event(event_type: str, match_id: str, match: dict, **extra) -> dict:
+    return {
+        "type": event_type,
+        "match_id": match_id,
+        "teams": match.get("teams", []),
+        "event": match.get("event", ""),
+        "score": match.get("score", []),
+        "detected_at": datetime.now(UTC).isoformat(),
+        **extra,
+    }
+
+
+def diff_match_events(previous: dict | None, current: dict) -> list[dict] | None:
+    """Events between two ``{"live": {...}, "results": {...}}`` snapshots.
+
+    Both sides map match ids to ``{"teams", "event", "score"}``. A match
+    appearing in ``live`` is ``match_started``; a live match whose series
+    score total rises is ``map_ended``; a match appearing in ``results`` is
+    ``match_completed``. The first snapshot is a baseline and emits nothing.
+    """
+    if previous is None:
+        return None
+    events = []
+    for match_id, match in current["live"].items():
+        before = previous["live"].get(match_id)
+        if before is None:
+            if match_id not in previous["results"]:
+                events.append(_event(MATCH_STARTED, match_id, match))
+        elif _series_total(match["score"]) > _series_total(before["score"]):
+            events.append(_event(MAP_ENDED, match_id, match, maps_played=_series_total(match["score"])))
+    for match_id, match in current["results"].items():
+        if match_id not in previous["results"]:
+            events.append(_event(MATCH_COMPLETED, match_id, match))
+    return events or None
+
+
+def diff_match_state(previous: dict | None, current: dict) -> tuple[list[dict], dict] | None:
+    """``(events, current)`` whenever the snapshot changed, for the notifier's feed.
+
+    Carrying the snapshot lets a consumer that is resynchronised with a full
+    snapshot diff it against the last state it actually processed.
+    """
+    if previous is None or previous == current:
+        return None
+    return diff_match_events(previous, current) or [], current
+
+
+# ---------------------------------------------------------------------------
+# Delivery
+# ---------------------------------------------------------------------------
+
+def sign_payload(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class WebhookDelivery:
+    """POSTs event batches to subscribers.
+
+    Each subscription receives one ``{"events": [...]}`` request per batch
+    containing only the event types it subscribed to. Failed deliveries
+    (network errors and non-2xx responses) are retried with exponential
+    backoff; at most ``concurrency`` targets are contacted at once. The
+    outcome of the last delivery per subscription is kept for the admin API.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        concurrency: int = WEBHOOK_DELIVERY_CONCURRENCY,
+        max_retries: int = WEBHOOK_MAX_RETRIES,
+        retry_delay: float = WEBHOOK_RETRY_DELAY,
+    ) -> None:
+        self._client = client
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.last_delivery: dict[str, dict] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT)
+        return self._client
+
+    async def _post(self, subscription: dict, events: list[dict]) -> dict:
+        body = json.dumps({"events": events}, separators=(",", ":")).encode()
+        headers = {"Content-Type": "application/json"}
+        if subscription["secret"]:
+            headers[WEBHOOK_SIGNATURE_HEADER] = sign_payload(subscription["secret"], body)
+
+        error = ""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                resp = await self._get_client().post(subscription["url"], content=body, headers=headers)
+                if 200 <= resp.status_code < 300:
+                    return {"ok": True, "attempts": attempt, "status_code": resp.status_code, "events": len(events)}
+                error = f"HTTP {resp.status_code}"
+            except httpx.HTTPError as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_delay * (2 ** (attempt - 1)))
+        logger.warning("Webhook %s delivery failed after %d attempts: %s", subscription["id"], self.max_retries, error)
+        return {"ok": False, "attempts": self.max_retries, "error": error, "events": len(events)}
+
+    async def deliver(self, subscriptions: list[dict], events: list[dict]) -> dict[str, dict]:
+        """Deliver one batch; returns the outcome per subscription id."""
+        targets = []
+        for subscription in subscriptions:
+            wanted = [event for event in events if event["type"] in subscription["events"]]
+            if wanted:
+                targets.append((subscription, wanted))
+
+        async def worker(target: tuple[dict, list[dict]]) -> dict:
+            return await self._post(*target)
+
+        outcomes = {}
+        async for (subscription, _), outcome, error in bounded_as_completed(targets, worker, self.concurrency):
+            if error is not None:
+                outcome = {"ok": False, "attempts": 0, "error": str(error)}
+            outcome["delivered_at"] = time.time()
+            outcomes[subscription["id"]] = outcome
+            self.last_delivery[subscription["id"]] = outcome
+        return outcomes
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None